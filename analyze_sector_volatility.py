@@ -1,7 +1,20 @@
-"""Analyze volatility of sectoral indices to determine appropriate alert thresholds."""
+"""
+Analyze volatility of sectoral indices to determine appropriate alert thresholds.
+
+Usage:
+    python analyze_sector_volatility.py
+    python analyze_sector_volatility.py --workers 7   # analyze sectors in parallel
+"""
+import argparse
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
 import yfinance as yf
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+from src.alert_triggers import PercentageDropTrigger
+from src.models import PriceSeries
 
 # 7 Core sectoral indices
 SECTORS = {
@@ -37,16 +50,13 @@ def analyze_volatility(symbol, name, period_days=180):
         max_drop = data['Daily_Return'].min()
         max_gain = data['Daily_Return'].max()
 
-        # Calculate 7-day rolling max change (similar to our alert logic)
-        rolling_max_change = []
-        for i in range(7, len(data)):
-            current_price = data['Close'].iloc[i]
-            lookback_prices = data['Close'].iloc[i-7:i]
-            max_change = max(abs((current_price - p) / p * 100) for p in lookback_prices)
-            rolling_max_change.append(max_change)
+        # Calculate 7-day rolling max change (the live alert rule)
+        series = PriceSeries(symbol, data.index.values, data['Close'].to_numpy())
+        change = PercentageDropTrigger(threshold_percentage=0).evaluate_series(series, lookback=7).change
+        rolling_max_change_pct = list(np.abs(change[7:]))
 
-        avg_7day_max_change = sum(rolling_max_change) / len(rolling_max_change) if rolling_max_change else 0
-        percentile_95_7day = sorted(rolling_max_change)[int(len(rolling_max_change) * 0.95)] if rolling_max_change else 0
+        avg_7day_max_change = sum(rolling_max_change_pct) / len(rolling_max_change_pct) if rolling_max_change_pct else 0
+        percentile_95_7day = sorted(rolling_max_change_pct)[int(len(rolling_max_change_pct) * 0.95)] if rolling_max_change_pct else 0
 
         return {
             'name': name,
@@ -82,20 +92,23 @@ def suggest_threshold(metrics):
 
     return suggested
 
-if __name__ == "__main__":
-    print("Analyzing Sectoral Index Volatility (Last 6 Months)")
-    print("=" * 90)
+def analyze_sector(name, symbol):
+    """
+    Analyze one sector and print its metrics.
 
-    results = []
+    Output is captured rather than printed so parallel workers don't
+    interleave; the caller prints it in SECTORS order.
 
-    for name, symbol in SECTORS.items():
+    Returns: (metrics or None, captured output)
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
         print(f"\nAnalyzing {name} ({symbol})...")
         metrics = analyze_volatility(symbol, name)
 
         if metrics:
             threshold = suggest_threshold(metrics)
             metrics['suggested_threshold'] = threshold
-            results.append(metrics)
 
             print(f"  Daily Volatility: {metrics['daily_volatility']:.2f}%")
             print(f"  Max Single Day Drop: {metrics['max_single_day_drop']:.2f}%")
@@ -103,6 +116,37 @@ if __name__ == "__main__":
             print(f"  95th Percentile 7-Day Change: {metrics['percentile_95_7day_change']:.2f}%")
             print(f"  → Suggested Threshold: {threshold:.1f}%")
 
+    return metrics, output.getvalue()
+
+def analyze_sectors(workers=1):
+    """Analyze every sector, optionally across a process pool, in SECTORS order."""
+    names = list(SECTORS)
+    symbols = [SECTORS[name] for name in names]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(names))) as executor:
+            analyses = list(executor.map(analyze_sector, names, symbols))
+    else:
+        analyses = map(analyze_sector, names, symbols)
+
+    results = []
+    for metrics, output in analyses:
+        print(output, end='')
+        if metrics:
+            results.append(metrics)
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggest alert thresholds from sectoral index volatility")
+    parser.add_argument('--workers', type=int, default=1, help="Analyze sectors in N parallel processes")
+    args = parser.parse_args()
+
+    print("Analyzing Sectoral Index Volatility (Last 6 Months)")
+    print("=" * 90)
+
+    results = analyze_sectors(workers=args.workers)
+
     # Sort by volatility
     results.sort(key=lambda x: x['daily_volatility'], reverse=True)
 
@@ -128,3 +172,6 @@ if __name__ == "__main__":
       - type: "percentage_drop"
         threshold: {r['suggested_threshold']:.1f}  # {r['daily_volatility']:.2f}% daily volatility
 """)
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,25 @@ Find optimal alert thresholds for each index to generate 5-10 buying opportunity
 
 This script:
 1. Fetches 5 years of historical data
-2. Simulates our alert logic (7-day lookback)
+2. Simulates the live alert rule (7-day lookback, same code as PercentageDropTrigger)
 3. Tests various threshold levels
 4. Finds thresholds that yield 5-10 alerts per year
+
+Usage:
+    python find_optimal_thresholds.py
+    python find_optimal_thresholds.py --workers 8   # analyze indices in parallel
 """
-import yfinance as yf
+import argparse
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import pandas as pd
+from src.alert_triggers import PercentageDropTrigger
+from src.backtest import alert_positions, simulate_triggers
+from src.data_fetchers import YahooFinanceDataFetcher, CachedDataFetcher, PriceStore
+from src.models import PriceSeries
 
 # All indices we're tracking
 INDICES = {
@@ -30,6 +42,9 @@ TARGET_MAX_ALERTS = 10
 # Test thresholds from 1.0% to 10.0% in 0.5% increments
 TEST_THRESHOLDS = [round(x * 0.5, 1) for x in range(2, 21)]  # [1.0, 1.5, 2.0, ..., 10.0]
 
+# Local price store shared with the alerter; re-runs only download new bars
+PRICE_STORE_PATH = os.getenv('PRICE_STORE_PATH', 'data/prices.db')
+
 
 def fetch_historical_data(symbol, name, years=5):
     """Fetch historical data for analysis."""
@@ -38,13 +53,15 @@ def fetch_historical_data(symbol, name, years=5):
         start_date = end_date - timedelta(days=years * 365)
 
         print(f"  Fetching {years} years of data for {name}...")
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(start=start_date, end=end_date)
+        fetcher = CachedDataFetcher(YahooFinanceDataFetcher(), PriceStore(PRICE_STORE_PATH))
+        bars = fetcher.fetch_historical_data(symbol, start_date, end_date)
 
-        if data.empty:
+        if not bars:
             print(f"  ❌ No data returned for {name}")
             return None
 
+        data = pd.DataFrame({'Close': bars.close}, index=pd.DatetimeIndex(bars.dates))
+
         print(f"  ✓ Got {len(data)} days of data ({data.index[0].date()} to {data.index[-1].date()})")
         return data
 
@@ -53,56 +70,34 @@ def fetch_historical_data(symbol, name, years=5):
         return None
 
 
-def simulate_alerts(data, threshold_pct):
+def simulate_threshold_alerts(data, thresholds):
     """
-    Simulate our alert logic with a given threshold.
+    Simulate our alert logic for several thresholds at once.
 
-    Returns: Number of alerts that would have been triggered.
-
-    Logic:
+    Logic (PercentageDropTrigger.evaluate_series, the live rule for every day):
     - For each day (starting from day 8 onwards)
-    - Check if today's close dropped more than threshold% from ANY of the previous 7 days
-    - If yes, count as an alert (and skip next 7 days to avoid duplicate alerts)
+    - Find the largest change (up or down) of today's close vs each of the previous 7 days
+    - If that change is a drop of at least threshold%, count as an alert
+      (and skip next 7 days to avoid duplicate alerts)
+
+    Returns: List of (alert count, alert details) tuples, one per threshold.
     """
-    if len(data) < 8:
-        return 0
-
-    alerts = []
-    i = 7  # Start from day 8 (index 7)
-
-    while i < len(data):
-        current_price = data['Close'].iloc[i]
-        current_date = data.index[i]
-
-        # Check against previous 7 days
-        max_drop_pct = 0
-        max_drop_date = None
-
-        for lookback in range(1, 8):
-            prev_price = data['Close'].iloc[i - lookback]
-            prev_date = data.index[i - lookback]
-
-            # Calculate percentage change (negative = drop)
-            pct_change = ((current_price - prev_price) / prev_price) * 100
-
-            # Track maximum drop
-            if pct_change < max_drop_pct:
-                max_drop_pct = pct_change
-                max_drop_date = prev_date
-
-        # If drop exceeds threshold (remember, it's negative)
-        if max_drop_pct <= -threshold_pct:
-            alerts.append({
-                'date': current_date,
-                'drop_pct': abs(max_drop_pct),
-                'from_date': max_drop_date
-            })
-            # Skip next 7 days to avoid duplicate alerts for same dip
-            i += 7
-        else:
-            i += 1
+    series = PriceSeries("", data.index.values, data['Close'].to_numpy())
+    triggers = [PercentageDropTrigger(threshold) for threshold in thresholds]
 
-    return len(alerts), alerts
+    results = []
+    for evaluation in simulate_triggers(series, triggers, lookback=7):
+        alerts = [
+            {
+                'date': data.index[i],
+                'drop_pct': abs(evaluation.change[i]),
+                'from_date': data.index[evaluation.reference[i]]
+            }
+            for i in alert_positions(evaluation.fired, cooldown=7)
+        ]
+        results.append((len(alerts), alerts))
+
+    return results
 
 
 def find_optimal_threshold(data, name):
@@ -122,9 +117,9 @@ def find_optimal_threshold(data, name):
     print(f"  {'-'*60}")
 
     results = []
+    simulations = simulate_threshold_alerts(data, TEST_THRESHOLDS)
 
-    for threshold in TEST_THRESHOLDS:
-        alert_count, alert_details = simulate_alerts(data, threshold)
+    for threshold, (alert_count, alert_details) in zip(TEST_THRESHOLDS, simulations):
         alerts_per_year = alert_count / years_of_data if years_of_data > 0 else 0
 
         status = ""
@@ -162,30 +157,74 @@ def find_optimal_threshold(data, name):
         return closest
 
 
-def main():
-    print("=" * 80)
-    print("FINDING OPTIMAL ALERT THRESHOLDS FOR BUYING OPPORTUNITIES")
-    print("=" * 80)
-    print(f"\nGoal: Find thresholds that generate {TARGET_MIN_ALERTS}-{TARGET_MAX_ALERTS} alerts per year")
-    print("Strategy: Buy on dips when index drops X% from any of last 7 days\n")
+def analyze_index(name, symbol, years=5):
+    """
+    Fetch and analyze one index.
 
-    all_results = {}
+    Output is captured rather than printed so parallel workers don't
+    interleave; the caller prints it in INDICES order.
 
-    for name, symbol in INDICES.items():
+    Returns: (name, result or None, captured output)
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
         print(f"\n{'='*80}")
         print(f"ANALYZING: {name} ({symbol})")
         print(f"{'='*80}")
 
-        data = fetch_historical_data(symbol, name, years=5)
+        data = fetch_historical_data(symbol, name, years=years)
 
+        result = None
         if data is not None:
-            optimal = find_optimal_threshold(data, name)
-            all_results[name] = {
+            result = {
                 'symbol': symbol,
-                'optimal': optimal,
+                'optimal': find_optimal_threshold(data, name),
                 'data_years': len(data) / 252
             }
 
+    return name, result, output.getvalue()
+
+
+def analyze_indices(workers=1, years=5):
+    """
+    Analyze every index, optionally across a process pool.
+
+    Results are merged in INDICES order regardless of which worker
+    finishes first, so the summary and generated config are deterministic.
+    """
+    names = list(INDICES)
+    symbols = [INDICES[name] for name in names]
+    year_args = [years] * len(names)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(names))) as executor:
+            analyses = list(executor.map(analyze_index, names, symbols, year_args))
+    else:
+        analyses = map(analyze_index, names, symbols, year_args)
+
+    all_results = {}
+    for name, result, output in analyses:
+        print(output, end='')
+        if result is not None:
+            all_results[name] = result
+
+    return all_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find drop thresholds yielding 5-10 alerts/year per index")
+    parser.add_argument('--workers', type=int, default=1, help="Analyze indices in N parallel processes")
+    parser.add_argument('--years', type=int, default=5, help="Years of history to test")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("FINDING OPTIMAL ALERT THRESHOLDS FOR BUYING OPPORTUNITIES")
+    print("=" * 80)
+    print(f"\nGoal: Find thresholds that generate {TARGET_MIN_ALERTS}-{TARGET_MAX_ALERTS} alerts per year")
+    print("Strategy: Buy on dips when the largest move vs the last 7 days is a drop of X% or more\n")
+
+    all_results = analyze_indices(workers=args.workers, years=args.years)
+
     # Print summary
     print("\n" + "=" * 80)
     print("SUMMARY - OPTIMAL THRESHOLDS")
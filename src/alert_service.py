@@ -1,10 +1,13 @@
 """Main alert service."""
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple, Optional
-from .models import Alert
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Set, Tuple, Optional
+import numpy as np
+from .models import Alert, PriceSeries
 from .data_fetchers import DataFetcher, YahooFinanceDataFetcher
-from .alert_triggers import AlertTrigger, PercentageDropTrigger
+from .alert_triggers import TriggerEngine, TriggerStateStore
 from .notifiers import Notifier, NtfyNotifier
 
 logger = logging.getLogger(__name__)
@@ -21,6 +24,7 @@ class IndexCheckResult:
         self.previous_price: Optional[float] = None
         self.percentage_change: Optional[float] = None
         self.has_data = False
+        self.data: Optional[PriceSeries] = None
 
 
 class AlertService:
@@ -29,7 +33,12 @@ class AlertService:
     def __init__(
         self,
         data_fetcher: DataFetcher,
-        notifier: Notifier
+        notifier: Notifier,
+        max_workers: int = 1,
+        index_timeout: Optional[float] = None,
+        trigger_state: Optional[TriggerStateStore] = None,
+        live_fetcher: Optional[Any] = None,
+        digest: bool = False
     ):
         """
         Initialize alert service.
@@ -37,23 +46,67 @@ class AlertService:
         Args:
             data_fetcher: Data fetcher instance
             notifier: Notifier instance
+            max_workers: Number of indices checked concurrently (1 = sequential)
+            index_timeout: Seconds to wait for a single index check, also when
+                checking sequentially (None = no limit)
+            trigger_state: Store for incremental trigger state kept between runs
+                (None = re-evaluate triggers from the fetched window each run)
+            live_fetcher: Source of live prices for intraday polling (an object
+                with fetch_live_prices(symbols), e.g. NSEIndiaDataFetcher)
+            digest: Send the alerts and errors of a run as one summary
+                notification instead of one notification each
         """
         self.data_fetcher = data_fetcher
         self.notifier = notifier
+        self.max_workers = max(1, max_workers)
+        self.index_timeout = index_timeout
+        self.trigger_engine = TriggerEngine(state_store=trigger_state)
+        self.live_fetcher = live_fetcher
+        self.digest = digest
+
+        # Closed bars before today, prefetched once per day (stale ones are
+        # reloaded on every prefetch until a data source answers again)
+        self._history_day: Optional[date] = None
+        self._history: Dict[str, PriceSeries] = {}
+
+        # Intraday alerts already sent today
+        self._intraday_day: Optional[date] = None
+        self._intraday_sent: Set[Tuple] = set()
 
     def check_index(
         self,
-        index_config: Dict[str, Any]
+        index_config: Dict[str, Any],
+        data: Optional[PriceSeries] = None
     ) -> IndexCheckResult:
         """
         Check a single index for alerts.
 
         Args:
             index_config: Index configuration dictionary
+            data: Already fetched data for the index (fetched here if None)
 
         Returns:
             IndexCheckResult containing alerts, errors, and status info
         """
+        result = self.load_index(index_config, data)
+        self.evaluate_triggers([index_config], [result])
+        return result
+
+    def load_index(
+        self,
+        index_config: Dict[str, Any],
+        data: Optional[PriceSeries] = None
+    ) -> IndexCheckResult:
+        """
+        Fetch and prepare the lookback window for an index (no trigger evaluation).
+
+        Args:
+            index_config: Index configuration dictionary
+            data: Already fetched data for the index (fetched here if None)
+
+        Returns:
+            IndexCheckResult with data, price info or error filled in
+        """
         symbol = index_config['symbol']
         name = index_config['name']
         lookback_days = index_config.get('lookback_days', 7)
@@ -68,11 +121,12 @@ class AlertService:
 
         # Fetch data
         try:
-            data = self.data_fetcher.fetch_historical_data(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date
-            )
+            if data is None:
+                data = self.data_fetcher.fetch_historical_data(
+                    symbol=symbol,
+                    start_date=start_date,
+                    end_date=end_date
+                )
 
             if not data:
                 logger.warning(f"No data fetched for {name}")
@@ -83,13 +137,16 @@ class AlertService:
             if len(data) > lookback_days + 1:
                 data = data[-(lookback_days + 1):]
 
+            if data.stale:
+                logger.warning(f"Using stale cached data for {name}")
             logger.info(f"Fetched {len(data)} days of data for {name}")
             result.has_data = True
+            result.data = data
 
             # Store current and previous price info
             if len(data) >= 2:
-                result.current_price = data[-1].close
-                result.previous_price = data[-2].close
+                result.current_price = float(data.close[-1])
+                result.previous_price = float(data.close[-2])
                 result.percentage_change = ((result.current_price - result.previous_price) / result.previous_price) * 100
 
         except Exception as e:
@@ -97,65 +154,244 @@ class AlertService:
             result.error = f"Error fetching data for {name}: {str(e)}"
             return result
 
-        # Check each trigger
-        for trigger_config in index_config.get('alert_triggers', []):
-            trigger_type = trigger_config['type']
+        return result
 
-            # Create appropriate trigger
-            if trigger_type == 'percentage_drop':
-                threshold = trigger_config.get('threshold', 2.0)
-                trigger = PercentageDropTrigger(threshold_percentage=threshold)
-            else:
-                logger.warning(f"Unknown trigger type: {trigger_type}")
-                continue
+    def evaluate_triggers(
+        self,
+        index_configs: List[Dict[str, Any]],
+        results: List[IndexCheckResult]
+    ) -> None:
+        """
+        Evaluate the triggers of all loaded indices in one engine pass.
+
+        Alerts are appended to each result; results without data are skipped.
+
+        Args:
+            index_configs: Index configuration dictionaries
+            results: Loaded results, one per index config
+        """
+        loaded = [
+            (index_config, result)
+            for index_config, result in zip(index_configs, results)
+            if result.data is not None
+        ]
+        if not loaded:
+            return
+
+        alerts = self.trigger_engine.evaluate([
+            (
+                result.index_name,
+                result.data,
+                index_config.get('alert_triggers', []),
+                index_config.get('lookback_days', 7)
+            )
+            for index_config, result in loaded
+        ])
+        for (_, result), index_alerts in zip(loaded, alerts):
+            if result.data.stale:
+                for alert in index_alerts:
+                    alert.stale = True
+            result.alerts.extend(index_alerts)
+
+    def prefetch_data(self, index_configs: List[Dict[str, Any]]) -> Dict[str, PriceSeries]:
+        """
+        Fetch data for all indices in one batch when the data fetcher supports it.
+
+        Args:
+            index_configs: Index configuration dictionaries
 
-            # Check trigger
-            alert = trigger.check_trigger(name, data)
-            if alert:
-                result.alerts.append(alert)
+        Returns:
+            Dictionary mapping symbol to fetched data (empty if batching is
+            unavailable or failed; indices missing here are fetched individually)
+        """
+        if not index_configs or not hasattr(self.data_fetcher, 'fetch_many'):
+            return {}
+
+        max_lookback = max(index_config.get('lookback_days', 7) for index_config in index_configs)
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=max_lookback + 5)  # Add buffer for weekends
+        symbols = [index_config['symbol'] for index_config in index_configs]
+
+        try:
+            return self.data_fetcher.fetch_many(
+                symbols=symbols,
+                start_date=start_date,
+                end_date=end_date
+            )
+        except Exception as e:
+            logger.warning(f"Batch fetch failed, fetching indices individually: {e}")
+            return {}
+
+    def check_indices(
+        self,
+        index_configs: List[Dict[str, Any]],
+        prefetched: Optional[Dict[str, PriceSeries]] = None
+    ) -> List[IndexCheckResult]:
+        """
+        Check several indices: fetch them (concurrently when max_workers > 1),
+        then evaluate all triggers in a single engine pass.
+
+        Results are returned in the same order as index_configs. In both
+        sequential and concurrent mode, an index whose check runs longer
+        than index_timeout (measured from when its worker picked it up) is
+        reported as an error; its thread is left to finish in the background.
+
+        Args:
+            index_configs: Index configuration dictionaries
+            prefetched: Already fetched data keyed by symbol
+
+        Returns:
+            List of IndexCheckResult, one per index config
+        """
+        results = self._load_indices(index_configs, prefetched or {})
+        self.evaluate_triggers(index_configs, results)
+        return results
+
+    def _load_indices(
+        self,
+        index_configs: List[Dict[str, Any]],
+        prefetched: Dict[str, PriceSeries]
+    ) -> List[IndexCheckResult]:
+        """Load all indices, concurrently when max_workers > 1."""
+        if self.max_workers == 1 or len(index_configs) <= 1:
+            return [
+                self._load_with_timeout(index_config, prefetched.get(index_config['symbol']) or None)
+                for index_config in index_configs
+            ]
+
+        logger.info(f"Checking {len(index_configs)} indices with {self.max_workers} workers")
+
+        start_times: Dict[int, float] = {}
+
+        def timed_load(position: int, index_config: Dict[str, Any]) -> IndexCheckResult:
+            start_times[position] = time.monotonic()
+            return self.load_index(index_config, prefetched.get(index_config['symbol']) or None)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="index-check")
+        try:
+            futures = [
+                executor.submit(timed_load, position, index_config)
+                for position, index_config in enumerate(index_configs)
+            ]
+
+            results = []
+            for position, (index_config, future) in enumerate(zip(index_configs, futures)):
+                try:
+                    results.append(self._wait_for_check(future, start_times, position))
+                except FutureTimeoutError:
+                    future.cancel()
+                    results.append(self._timed_out(index_config))
+
+            return results
+        finally:
+            # Don't block on timed-out checks still running in worker threads
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load_with_timeout(self, index_config: Dict[str, Any], data: Optional[PriceSeries]) -> IndexCheckResult:
+        """
+        Load one index, giving up after index_timeout seconds.
+
+        With a timeout the load runs in its own thread, which is left to
+        finish in the background if it overruns, so the next index starts
+        on time.
+        """
+        if self.index_timeout is None:
+            return self.load_index(index_config, data)
 
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-check")
+        try:
+            return executor.submit(self.load_index, index_config, data).result(timeout=self.index_timeout)
+        except FutureTimeoutError:
+            return self._timed_out(index_config)
+        finally:
+            executor.shutdown(wait=False)
+
+    def _timed_out(self, index_config: Dict[str, Any]) -> IndexCheckResult:
+        """Build the error result of an index check that exceeded index_timeout."""
+        name = index_config['name']
+        logger.error(f"Timed out checking {name} after {self.index_timeout}s")
+        result = IndexCheckResult(name, index_config['symbol'])
+        result.error = f"Timed out checking {name} after {self.index_timeout}s"
         return result
 
-    def run_check(self, config: Dict[str, Any]) -> None:
+    def _wait_for_check(self, future, start_times: Dict[int, float], position: int) -> IndexCheckResult:
+        """Wait for a check future, timing out index_timeout seconds after it started."""
+        if self.index_timeout is None:
+            return future.result()
+
+        while True:
+            started = start_times.get(position)
+            deadline = (started if started is not None else time.monotonic()) + self.index_timeout
+            try:
+                return future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                # Still queued when we started waiting: measure from its actual start
+                if started is None and start_times.get(position) is not None:
+                    continue
+                raise
+
+    def run_check(self, config: Dict[str, Any], now: Optional[datetime] = None) -> None:
         """
         Run alert check for all configured indices.
 
+        If history was prefetched today (see prefetch_history), only today's
+        bar is fetched, from one live snapshot; other indices are fetched in
+        full as before.
+
         Args:
             config: Application configuration
+            now: Current time in the market timezone (defaults to local time)
         """
         logger.info("=" * 60)
         logger.info("Starting alert check")
         logger.info("=" * 60)
 
-        results = []
         all_alerts = []
         errors = []
 
-        # Check all indices
-        for index_config in config.get('indices', []):
-            result = self.check_index(index_config)
-            results.append(result)
+        index_configs = config.get('indices', [])
+        today = (now or datetime.now()).date()
 
+        prefetched = self._with_live_bar(index_configs, today)
+        if prefetched:
+            logger.info(f"Using prefetched history and live close for {len(prefetched)} indices")
+
+        remaining = [index_config for index_config in index_configs if index_config['symbol'] not in prefetched]
+        if remaining:
+            prefetched.update(self.prefetch_data(remaining))
+
+        # Check all indices
+        results = self.check_indices(index_configs, prefetched)
+        for result in results:
             if result.error:
                 errors.append(result)
 
             all_alerts.extend(result.alerts)
 
-        # Send error notifications
         if errors:
             logger.warning(f"Found {len(errors)} error(s) during index checks")
+        if all_alerts:
+            logger.info(f"Found {len(all_alerts)} alert(s), sending notifications...")
+
+        if self.digest and (all_alerts or errors):
+            # One summary notification for the whole run
+            self.notifier.send_digest(
+                all_alerts,
+                [(f"Error: {error_result.index_name}", error_result.error) for error_result in errors]
+            )
+        else:
+            # Send error notifications
             for error_result in errors:
                 self.notifier.send_error(
                     title=f"Error: {error_result.index_name}",
                     message=error_result.error
                 )
 
-        # Send alerts
-        if all_alerts:
-            logger.info(f"Found {len(all_alerts)} alert(s), sending notifications...")
+            # Send alerts
             for alert in all_alerts:
                 self.notifier.send_alert(alert)
-        else:
+
+        if not all_alerts:
             # No alerts triggered - send status message
             logger.info("No alerts triggered")
 
@@ -168,6 +404,7 @@ class AlertService:
                     status_lines.append(
                         f"{result.index_name}: {direction} {result.percentage_change:+.2f}% "
                         f"(₹{result.current_price:.2f})"
+                        + (" [stale data]" if result.data.stale else "")
                     )
 
             if status_lines:
@@ -179,3 +416,132 @@ class AlertService:
         logger.info("=" * 60)
         logger.info("Alert check completed")
         logger.info("=" * 60)
+
+    def prefetch_history(self, config: Dict[str, Any], now: datetime) -> None:
+        """
+        Load the closed bars before today for all indices (once per day).
+
+        Indices whose history was served stale are reloaded on later calls
+        the same day, so polls pick up fresh data once a source recovers.
+
+        Run ahead of the close check and intraday polls so they only need
+        today's bar; with a cached data fetcher this also warms the local
+        price store.
+
+        Args:
+            config: Application configuration
+            now: Current time in the market timezone
+        """
+        today = now.date()
+        index_configs = config.get('indices', [])
+        if self._history_day == today:
+            index_configs = [
+                index_config for index_config in index_configs
+                if index_config['symbol'] in self._history and self._history[index_config['symbol']].stale
+            ]
+            if not index_configs:
+                return
+        else:
+            self._history = {}
+
+        results = self._load_indices(index_configs, self.prefetch_data(index_configs))
+
+        today_start = np.datetime64(today, 's')
+        for index_config, result in zip(index_configs, results):
+            if result.data is None:
+                logger.warning(f"No history prefetched for {index_config['name']}: {result.error}")
+                continue
+
+            history = result.data[:int(np.searchsorted(result.data.dates, today_start))]
+            lookback_days = index_config.get('lookback_days', 7)
+            self._history[index_config['symbol']] = history[-lookback_days:]
+
+        self._history_day = today
+        logger.info(f"Prefetched history for {len(self._history)} indices")
+
+    def _with_live_bar(self, index_configs: List[Dict[str, Any]], today: date) -> Dict[str, PriceSeries]:
+        """
+        Append today's live price to the prefetched history of each index.
+
+        Args:
+            index_configs: Index configuration dictionaries
+            today: Current date in the market timezone
+
+        Returns:
+            Dictionary mapping symbol to history plus today's bar (indices
+            without prefetched history or a live price are omitted)
+        """
+        if self.live_fetcher is None or self._history_day != today:
+            return {}
+
+        symbols = [index_config['symbol'] for index_config in index_configs if index_config['symbol'] in self._history]
+        try:
+            prices = self.live_fetcher.fetch_live_prices(symbols)
+        except Exception as e:
+            logger.warning(f"Failed to fetch live prices: {e}")
+            return {}
+
+        today_start = datetime.combine(today, datetime.min.time())
+        return {
+            symbol: self._history[symbol].merge(PriceSeries(symbol, [today_start], [prices[symbol]]))
+            for symbol in symbols
+            if symbol in prices
+        }
+
+    def run_intraday_poll(self, config: Dict[str, Any], now: datetime) -> List[Alert]:
+        """
+        Evaluate all triggers once against live prices.
+
+        Closed bars are loaded once per trading day; each poll then only
+        fetches one live snapshot and evaluates today's price as a pending bar
+        (incrementally when trigger state is enabled). Only alerts that cross
+        their threshold are sent, at most once per index, trigger and day.
+
+        Args:
+            config: Application configuration
+            now: Current time in the market timezone
+
+        Returns:
+            Alerts sent by this poll
+        """
+        if self.live_fetcher is None:
+            raise RuntimeError("Intraday polling requires a live_fetcher")
+
+        index_configs = config.get('indices', [])
+        today = now.date()
+
+        self.prefetch_history(config, now)
+        if self._intraday_day != today:
+            self._intraday_day = today
+            self._intraday_sent.clear()
+
+        live_data = self._with_live_bar(index_configs, today)
+
+        items = [
+            (
+                index_config['name'],
+                live_data[index_config['symbol']],
+                index_config.get('alert_triggers', []),
+                index_config.get('lookback_days', 7)
+            )
+            for index_config in index_configs
+            if index_config['symbol'] in live_data
+        ]
+
+        new_alerts = []
+        for index_alerts in self.trigger_engine.evaluate(items, triggered_only=True):
+            for alert in index_alerts:
+                key = (alert.symbol, alert.trigger_type, alert.threshold, today)
+                if key not in self._intraday_sent:
+                    logger.info(f"Intraday alert: {alert.message}")
+                    new_alerts.append((key, alert))
+
+        if self.digest and len(new_alerts) > 1:
+            if not self.notifier.send_digest([alert for _, alert in new_alerts], []):
+                return []
+            delivered = new_alerts
+        else:
+            delivered = [(key, alert) for key, alert in new_alerts if self.notifier.send_alert(alert)]
+
+        self._intraday_sent.update(key for key, _ in delivered)
+        return [alert for _, alert in delivered]
@@ -1,5 +1,7 @@
 """Alert triggers package."""
-from .base import AlertTrigger
+from .base import AlertTrigger, SeriesEvaluation
 from .percentage_drop import PercentageDropTrigger
+from .engine import TriggerEngine
+from .state import TriggerStateStore
 
-__all__ = ["AlertTrigger", "PercentageDropTrigger"]
+__all__ = ["AlertTrigger", "SeriesEvaluation", "PercentageDropTrigger", "TriggerEngine", "TriggerStateStore"]
@@ -1,7 +1,16 @@
 """Base class for alert triggers."""
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from ..models import IndexData, Alert
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+import numpy as np
+from ..models import IndexData, Alert, PriceSeries
+
+
+class SeriesEvaluation(NamedTuple):
+    """Per-bar result of evaluating a trigger on a whole series."""
+
+    change: np.ndarray  # Percentage change reported for each bar (NaN without a full window)
+    reference: np.ndarray  # Position of the bar each change is measured from (-1 without one)
+    fired: np.ndarray  # True where the trigger crosses its threshold
 
 
 class AlertTrigger(ABC):
@@ -11,16 +20,145 @@ class AlertTrigger(ABC):
     def check_trigger(
         self,
         index_name: str,
-        data: List[IndexData]
+        data: Union[PriceSeries, List[IndexData]]
     ) -> Optional[Alert]:
         """
         Check if alert should be triggered based on index data.
 
         Args:
             index_name: Name of the index
-            data: List of IndexData objects (sorted by date, oldest first)
+            data: PriceSeries (a list of IndexData objects is also accepted)
 
         Returns:
             Alert object if triggered, None otherwise
         """
         pass
+
+    @classmethod
+    def check_batch(
+        cls,
+        triggers: List["AlertTrigger"],
+        index_names: List[str],
+        data: List[PriceSeries]
+    ) -> List[Optional[Alert]]:
+        """
+        Check many triggers of this type, one per index, in a single call.
+
+        The default implementation calls check_trigger for each index;
+        trigger types override it with a vectorized implementation.
+
+        Args:
+            triggers: Trigger instances of this class
+            index_names: Name of the index for each trigger
+            data: PriceSeries for each trigger (sorted by date, oldest first)
+
+        Returns:
+            Alert (or None) for each trigger, in the same order
+        """
+        return [
+            trigger.check_trigger(index_name, series)
+            for trigger, index_name, series in zip(triggers, index_names, data)
+        ]
+
+    def is_triggered(self, alert: Alert) -> bool:
+        """
+        Whether an alert from this trigger crossed its threshold.
+
+        Triggers that also report informational alerts override this so
+        threshold-only consumers (e.g. intraday polling) can skip them.
+
+        Args:
+            alert: Alert returned by this trigger
+
+        Returns:
+            True if the alert crossed the trigger threshold
+        """
+        return True
+
+    def evaluate_series(
+        self,
+        series: PriceSeries,
+        lookback: int,
+        previous: Optional[SeriesEvaluation] = None
+    ) -> SeriesEvaluation:
+        """
+        Evaluate the trigger on every bar of a series (used by backtests).
+
+        Each bar is judged against its previous lookback bars exactly as
+        check_trigger judges the latest bar. The default implementation
+        calls check_trigger on the window ending at each bar; trigger types
+        override it with a vectorized implementation of the same rule.
+
+        Args:
+            series: PriceSeries (sorted by date, oldest first)
+            lookback: Number of previous days each bar is compared against
+            previous: Evaluation of the same series and lookback by another
+                trigger of this type (e.g. a different threshold), which
+                implementations may reuse instead of recomputing
+
+        Returns:
+            SeriesEvaluation of len(series) arrays; the first lookback bars
+            never fire
+        """
+        change = np.full(len(series), np.nan)
+        reference = np.full(len(series), -1, dtype=np.int64)
+        fired = np.zeros(len(series), dtype=bool)
+
+        for position in range(lookback, len(series)):
+            alert = self.check_trigger(series.symbol, series[position - lookback:position + 1])
+            if alert is None:
+                continue
+            change[position] = alert.percentage_change
+            reference[position] = np.searchsorted(series.dates, np.datetime64(alert.reference_date, 's'))
+            fired[position] = self.is_triggered(alert)
+
+        return SeriesEvaluation(change, reference, fired)
+
+    def create_state(self, lookback: int) -> Optional[Any]:
+        """
+        Create empty rolling state for incremental evaluation.
+
+        Stateless triggers return None and are always evaluated with
+        check_batch on the fetched window.
+
+        Args:
+            lookback: Number of previous days each bar is compared against
+
+        Returns:
+            State object with a to_dict() method, or None
+        """
+        return None
+
+    def restore_state(self, data: Dict[str, Any]) -> Any:
+        """
+        Restore state created by create_state from its to_dict() form.
+
+        Args:
+            data: Serialized state
+
+        Returns:
+            State object
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no incremental state")
+
+    def check_incremental(
+        self,
+        index_name: str,
+        series: PriceSeries,
+        state: Any
+    ) -> Optional[Alert]:
+        """
+        Check the latest bar of a series using (and updating) rolling state.
+
+        Only bars the state has not seen are consumed, so each new bar costs
+        O(1) instead of a re-scan of the lookback window.
+
+        Args:
+            index_name: Name of the index
+            series: PriceSeries (sorted by date, oldest first)
+            state: State from create_state or restore_state (updated in place)
+
+        Returns:
+            Alert object if triggered, None otherwise
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no incremental state")
@@ -0,0 +1,139 @@
+"""Batch evaluation of configured alert triggers."""
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from .base import AlertTrigger
+from .percentage_drop import PercentageDropTrigger
+from .state import TriggerStateStore
+from ..models import Alert, PriceSeries
+
+logger = logging.getLogger(__name__)
+
+
+class TriggerEngine:
+    """
+    Evaluate the triggers of many indices in one pass.
+
+    Trigger objects are created once per distinct trigger configuration and
+    reused across runs. Triggers of the same type are evaluated together
+    through their check_batch implementation.
+
+    With a state store, triggers that support incremental state keep a
+    rolling window per index between runs and only consume new bars.
+    """
+
+    def __init__(self, state_store: Optional[TriggerStateStore] = None):
+        """
+        Initialize trigger engine.
+
+        Args:
+            state_store: Where incremental trigger state is persisted
+                (None = evaluate every trigger from the fetched window)
+        """
+        self._triggers: Dict[Tuple, Optional[AlertTrigger]] = {}
+        self.state_store = state_store
+
+    def get_trigger(self, trigger_config: Dict[str, Any]) -> Optional[AlertTrigger]:
+        """
+        Get the (cached) trigger for a trigger configuration.
+
+        Args:
+            trigger_config: Trigger configuration dictionary
+
+        Returns:
+            AlertTrigger instance, or None for an unknown trigger type
+        """
+        key = tuple(sorted(trigger_config.items()))
+        if key not in self._triggers:
+            self._triggers[key] = self._create_trigger(trigger_config)
+        return self._triggers[key]
+
+    def _create_trigger(self, trigger_config: Dict[str, Any]) -> Optional[AlertTrigger]:
+        """Create the appropriate trigger for a configuration."""
+        trigger_type = trigger_config['type']
+
+        if trigger_type == 'percentage_drop':
+            threshold = trigger_config.get('threshold', 2.0)
+            return PercentageDropTrigger(threshold_percentage=threshold)
+
+        logger.warning(f"Unknown trigger type: {trigger_type}")
+        return None
+
+    def _check_incremental(
+        self,
+        trigger: AlertTrigger,
+        trigger_config: Dict[str, Any],
+        index_name: str,
+        series: PriceSeries,
+        lookback: int
+    ) -> Optional[Alert]:
+        """Check a stateful trigger, restoring and updating its stored state."""
+        key = f"{series.symbol}|{lookback}|{json.dumps(trigger_config, sort_keys=True)}"
+        data = self.state_store.get(key)
+
+        state = None
+        if data is not None:
+            try:
+                state = trigger.restore_state(data)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable trigger state for {index_name}: {e}")
+        if state is None:
+            state = trigger.create_state(lookback)
+
+        alert = trigger.check_incremental(index_name, series, state)
+        self.state_store.set(key, state.to_dict())
+        return alert
+
+    def evaluate(
+        self,
+        items: List[Tuple[str, PriceSeries, List[Dict[str, Any]], int]],
+        triggered_only: bool = False
+    ) -> List[List[Alert]]:
+        """
+        Evaluate all triggers for all indices.
+
+        Args:
+            items: (index name, price series, trigger configs, lookback days)
+                for each index
+            triggered_only: Drop informational alerts that did not cross
+                their trigger's threshold
+
+        Returns:
+            Alerts for each item, in the same order as items (triggers in
+            config order within an item)
+        """
+        # Group every stateless (index, trigger) pair by trigger class
+        batches = defaultdict(list)
+        hits = []
+        for item_position, (index_name, series, trigger_configs, lookback) in enumerate(items):
+            for trigger_position, trigger_config in enumerate(trigger_configs):
+                trigger = self.get_trigger(trigger_config)
+                if trigger is None:
+                    continue
+
+                if self.state_store is not None and trigger.create_state(lookback) is not None:
+                    alert = self._check_incremental(trigger, trigger_config, index_name, series, lookback)
+                    if alert and (not triggered_only or trigger.is_triggered(alert)):
+                        hits.append((item_position, trigger_position, alert))
+                else:
+                    batches[type(trigger)].append((item_position, trigger_position, trigger))
+
+        for trigger_class, entries in batches.items():
+            alerts = trigger_class.check_batch(
+                [trigger for _, _, trigger in entries],
+                [items[item_position][0] for item_position, _, _ in entries],
+                [items[item_position][1] for item_position, _, _ in entries]
+            )
+            for (item_position, trigger_position, trigger), alert in zip(entries, alerts):
+                if alert and (not triggered_only or trigger.is_triggered(alert)):
+                    hits.append((item_position, trigger_position, alert))
+
+        if self.state_store is not None:
+            self.state_store.save()
+
+        results: List[List[Alert]] = [[] for _ in items]
+        for item_position, _, alert in sorted(hits, key=lambda hit: hit[:2]):
+            results[item_position].append(alert)
+
+        return results
@@ -1,13 +1,85 @@
 """Percentage drop alert trigger."""
 import logging
 from datetime import datetime
-from typing import List, Optional
-from .base import AlertTrigger
-from ..models import IndexData, Alert
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from .base import AlertTrigger, SeriesEvaluation
+from .sliding_window import RollingWindow, SlidingExtrema, max_abs_change_in_window
+from ..models import IndexData, Alert, PriceSeries, stack_closes
 
 logger = logging.getLogger(__name__)
 
 
+def max_abs_change(today: np.ndarray, reference: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the maximum absolute percentage change of today vs a window of previous closes.
+
+    The largest change is always measured against the window's highest or
+    lowest close, so only those two are compared. This is the same rule
+    max_abs_change_in_window applies bar by bar, so the live trigger (latest
+    bar) and the backtests (every bar) always pick the same reference day.
+
+    Args:
+        today: Today's close per row, shape (rows, 1)
+        reference: Previous closes per row (oldest first, NaN where missing),
+            shape (rows, days)
+
+    Returns:
+        Tuple of (change, column): the signed percentage change with the
+        largest magnitude (negative = drop) and its column in reference.
+        The most recent day wins ties.
+    """
+    days = reference.shape[1]
+    rows = np.arange(len(reference))
+
+    # Last occurrence of the extrema, so that the most recent day wins ties
+    newest_first = reference[:, ::-1]
+    high_column = days - 1 - np.argmax(np.nan_to_num(newest_first, nan=-np.inf), axis=1)
+    low_column = days - 1 - np.argmin(np.nan_to_num(newest_first, nan=np.inf), axis=1)
+
+    today = today[:, 0]
+    high = reference[rows, high_column]
+    low = reference[rows, low_column]
+    drop = (today - high) / high * 100
+    gain = (today - low) / low * 100
+
+    use_high = (np.abs(drop) > np.abs(gain)) | (
+        (np.abs(drop) == np.abs(gain)) & (high_column > low_column)
+    )
+    return np.where(use_high, drop, gain), np.where(use_high, high_column, low_column)
+
+
+def rolling_max_change(closes: np.ndarray, lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply the max_abs_change rule to every bar of a close series.
+
+    A monotonic-deque window tracks the highest and lowest of the previous
+    lookback closes, so each bar costs O(1) amortized whatever the lookback
+    (instead of comparing against every bar in the window).
+
+    Args:
+        closes: Daily closes (oldest first)
+        lookback: Number of previous days each bar is compared against
+
+    Returns:
+        Tuple of (change, from_index) arrays of len(closes); NaN and -1 for
+        the first lookback bars, which have no complete window
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    change = np.full(len(closes), np.nan)
+    from_index = np.full(len(closes), -1, dtype=np.int64)
+
+    window = SlidingExtrema(lookback)
+    for position, close in enumerate(closes.tolist()):
+        if position >= lookback:
+            result = max_abs_change_in_window(close, window)
+            if result is not None:
+                change[position], from_index[position] = result
+        window.push(close)
+
+    return change, from_index
+
+
 class PercentageDropTrigger(AlertTrigger):
     """Trigger alert when price drops by a certain percentage from any previous day."""
 
@@ -23,7 +95,7 @@ class PercentageDropTrigger(AlertTrigger):
     def check_trigger(
         self,
         index_name: str,
-        data: List[IndexData]
+        data: Union[PriceSeries, List[IndexData]]
     ) -> Optional[Alert]:
         """
         ALWAYS send notification with the maximum percentage change over the lookback period.
@@ -33,7 +105,7 @@ class PercentageDropTrigger(AlertTrigger):
 
         Args:
             index_name: Name of the index
-            data: List of IndexData objects (sorted by date, oldest first)
+            data: PriceSeries (a list of IndexData objects is also accepted)
 
         Returns:
             Alert object with maximum percentage change (always returned if data available)
@@ -43,73 +115,228 @@ class PercentageDropTrigger(AlertTrigger):
             return None
 
         # Sort data by date (oldest first) to ensure correct order
-        sorted_data = sorted(data, key=lambda x: x.date)
+        if isinstance(data, PriceSeries):
+            series = data.sorted()
+        else:
+            series = PriceSeries.from_records(data[0].symbol, data)
 
-        # Today's data is the last element
-        today = sorted_data[-1]
-        today_close = today.close
+        return self.check_batch([self], [index_name], [series])[0]
 
-        # Find the maximum percentage change (most negative = largest drop)
-        max_change = None
-        max_change_day = None
-        max_change_days_ago = 0
+    def create_state(self, lookback: int) -> RollingWindow:
+        """Create an empty rolling window of lookback committed bars."""
+        return RollingWindow(lookback)
 
-        # Check against each previous day to find maximum change
-        for i in range(len(sorted_data) - 2, -1, -1):
-            reference_day = sorted_data[i]
-            reference_close = reference_day.close
+    def restore_state(self, data: Dict[str, Any]) -> RollingWindow:
+        """Restore a rolling window from its to_dict() form."""
+        return RollingWindow.from_dict(data)
 
-            # Calculate percentage change
-            # Negative value means drop, positive means gain
-            pct_change = ((today_close - reference_close) / reference_close) * 100
+    def check_incremental(
+        self,
+        index_name: str,
+        series: PriceSeries,
+        state: RollingWindow
+    ) -> Optional[Alert]:
+        """
+        Find the maximum percentage change of the latest bar using a rolling window.
 
-            days_ago = len(sorted_data) - 1 - i
+        New closed bars are committed to the window (O(1) each) and the latest
+        bar is compared against the window's extrema, giving the same alert as
+        check_trigger on the last lookback + 1 bars.
 
-            logger.info(
-                f"{index_name}: Today's close ({today_close:.2f}) vs "
-                f"{days_ago} day(s) ago ({reference_close:.2f}): "
-                f"{pct_change:+.2f}%"
-            )
+        Args:
+            index_name: Name of the index
+            series: PriceSeries (sorted by date, oldest first)
+            state: Rolling window for this index (updated in place)
 
-            # Track the maximum absolute change
-            if max_change is None or abs(pct_change) > abs(max_change):
-                max_change = pct_change
-                max_change_day = reference_day
-                max_change_days_ago = days_ago
-
-        # Always send notification with maximum change
-        if max_change is not None:
-            if max_change < 0:
-                # It's a drop
-                message = (
-                    f"{index_name}: Dropped {abs(max_change):.2f}% "
-                    f"(from {max_change_day.close:.2f} to {today_close:.2f}) "
-                    f"over {max_change_days_ago} day(s) "
-                    f"(since {max_change_day.date.strftime('%Y-%m-%d')})"
-                )
-            else:
-                # It's a gain
-                message = (
-                    f"{index_name}: Gained {abs(max_change):.2f}% "
-                    f"(from {max_change_day.close:.2f} to {today_close:.2f}) "
-                    f"over {max_change_days_ago} day(s) "
-                    f"(since {max_change_day.date.strftime('%Y-%m-%d')})"
-                )
-
-            logger.info(f"Maximum change: {message}")
-
-            return Alert(
-                index_name=index_name,
-                symbol=today.symbol,
-                current_price=today_close,
-                reference_price=max_change_day.close,
-                reference_date=max_change_day.date,
-                percentage_change=max_change,
-                message=message,
-                timestamp=datetime.now(),
-                trigger_type="percentage_drop",
-                threshold=self.threshold_percentage
+        Returns:
+            Alert object with maximum percentage change, or None if the
+            window holds no previous day
+        """
+        series = series.sorted()
+        state.sync(series)
+
+        result = max_abs_change_in_window(float(series.close[-1]), state.extrema) if len(series) else None
+        if result is None:
+            logger.warning(f"Not enough data for {index_name}, need at least 2 days")
+            return None
+
+        max_change, position = result
+        return self._make_alert(
+            index_name,
+            series.symbol,
+            today_close=float(series.close[-1]),
+            reference_close=state.close_at(position),
+            reference_date=state.date_at(position),
+            days_ago=state.days_ago(position),
+            max_change=max_change
+        )
+
+    def fires(self, change):
+        """
+        Whether a maximum change is a buying opportunity for this trigger.
+
+        The maximum change must be a drop of at least the threshold; this is
+        the rule that sends an alert to the critical topic.
+
+        Args:
+            change: Maximum percentage change (a float or an array of them)
+
+        Returns:
+            bool, or a boolean array for array input (False where NaN)
+        """
+        return change <= -self.threshold_percentage
+
+    def is_triggered(self, alert: Alert) -> bool:
+        """Whether the alert's maximum change is a drop of at least the threshold."""
+        return bool(self.fires(alert.percentage_change))
+
+    def evaluate_series(
+        self,
+        series: PriceSeries,
+        lookback: int,
+        previous: Optional[SeriesEvaluation] = None
+    ) -> SeriesEvaluation:
+        """
+        Evaluate the trigger on every bar of a series at once.
+
+        The maximum change of every bar comes from rolling_max_change, the
+        same rule check_trigger applies to the latest bar. It does not depend
+        on the threshold, so a previous evaluation (e.g. for another threshold
+        of a grid) is reused and only the threshold is applied again.
+
+        Args:
+            series: PriceSeries (sorted by date, oldest first)
+            lookback: Number of previous days each bar is compared against
+            previous: Evaluation of the same series and lookback by another
+                PercentageDropTrigger
+
+        Returns:
+            SeriesEvaluation with the maximum change, its reference bar and
+            whether the drop reaches the threshold, for every bar
+        """
+        if previous is None:
+            change, reference = rolling_max_change(series.close, lookback)
+        else:
+            change, reference = previous.change, previous.reference
+        return SeriesEvaluation(change, reference, self.fires(change))
+
+    @classmethod
+    def check_batch(
+        cls,
+        triggers: List["PercentageDropTrigger"],
+        index_names: List[str],
+        data: List[PriceSeries]
+    ) -> List[Optional[Alert]]:
+        """
+        Find the maximum percentage change for many indices at once.
+
+        Closes are stacked into an (indices x days) matrix right-aligned on
+        each index's latest bar, and today's close is compared against every
+        previous day with one set of array operations.
+
+        Args:
+            triggers: PercentageDropTrigger instances
+            index_names: Name of the index for each trigger
+            data: PriceSeries for each trigger (sorted by date, oldest first)
+
+        Returns:
+            Alert with the maximum change for each index, or None where
+            fewer than 2 days of data are available
+        """
+        if not data:
+            return []
+
+        depth = max(len(series) for series in data)
+        if depth < 2:
+            for index_name in index_names:
+                logger.warning(f"Not enough data for {index_name}, need at least 2 days")
+            return [None] * len(data)
+
+        closes = stack_closes(data, depth)
+
+        # Negative change means drop, positive means gain
+        changes, max_change_column = max_abs_change(closes[:, -1:], closes[:, :-1])
+
+        alerts = []
+        for row, (trigger, index_name, series) in enumerate(zip(triggers, index_names, data)):
+            if len(series) < 2:
+                logger.warning(f"Not enough data for {index_name}, need at least 2 days")
+                alerts.append(None)
+                continue
+
+            # Translate the matrix column back to a position in this series
+            days_ago = depth - 1 - int(max_change_column[row])
+            alerts.append(trigger._build_alert(
+                index_name,
+                series,
+                reference_position=len(series) - 1 - days_ago,
+                max_change=float(changes[row])
+            ))
+
+        return alerts
+
+    def _build_alert(
+        self,
+        index_name: str,
+        series: PriceSeries,
+        reference_position: int,
+        max_change: float
+    ) -> Alert:
+        """Build the alert for the latest bar compared against a reference bar."""
+        return self._make_alert(
+            index_name,
+            series.symbol,
+            today_close=float(series.close[-1]),
+            reference_close=float(series.close[reference_position]),
+            reference_date=series.date_at(reference_position),
+            days_ago=len(series) - 1 - reference_position,
+            max_change=max_change
+        )
+
+    def _make_alert(
+        self,
+        index_name: str,
+        symbol: str,
+        today_close: float,
+        reference_close: float,
+        reference_date: datetime,
+        days_ago: int,
+        max_change: float
+    ) -> Alert:
+        """Build the alert message for a maximum change vs a reference close."""
+        logger.debug(
+            f"{index_name}: Today's close ({today_close:.2f}) vs "
+            f"{days_ago} day(s) ago ({reference_close:.2f}): {max_change:+.2f}%"
+        )
+
+        if max_change < 0:
+            # It's a drop
+            message = (
+                f"{index_name}: Dropped {abs(max_change):.2f}% "
+                f"(from {reference_close:.2f} to {today_close:.2f}) "
+                f"over {days_ago} day(s) "
+                f"(since {reference_date.strftime('%Y-%m-%d')})"
             )
+        else:
+            # It's a gain
+            message = (
+                f"{index_name}: Gained {abs(max_change):.2f}% "
+                f"(from {reference_close:.2f} to {today_close:.2f}) "
+                f"over {days_ago} day(s) "
+                f"(since {reference_date.strftime('%Y-%m-%d')})"
+            )
+
+        logger.info(f"Maximum change: {message}")
 
-        logger.info(f"{index_name}: No data available for comparison")
-        return None
+        return Alert(
+            index_name=index_name,
+            symbol=symbol,
+            current_price=today_close,
+            reference_price=reference_close,
+            reference_date=reference_date,
+            percentage_change=max_change,
+            message=message,
+            timestamp=datetime.now(),
+            trigger_type="percentage_drop",
+            threshold=self.threshold_percentage
+        )
@@ -0,0 +1,209 @@
+"""Sliding-window extrema with monotonic deques."""
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+
+class SlidingExtrema:
+    """
+    Running maximum and minimum of the last `size` values pushed.
+
+    Each deque holds (position, value) pairs whose values are monotonic, so
+    the front is always the extremum of the window. Every value is appended
+    and removed at most once, making push O(1) amortized regardless of the
+    window size. Among equal values the most recent one is kept.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize an empty window.
+
+        Args:
+            size: Number of most recent values the window covers
+        """
+        self.size = size
+        self.count = 0
+        self._max: deque = deque()
+        self._min: deque = deque()
+
+    def push(self, value: float) -> None:
+        """
+        Add the next value to the window, dropping the one that falls out.
+
+        NaN values take up a position in the window but never become an
+        extremum.
+
+        Args:
+            value: Next value in the sequence
+        """
+        position = self.count
+        self.count += 1
+
+        if value == value:
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((position, value))
+
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((position, value))
+
+        oldest = self.count - self.size
+        while self._max and self._max[0][0] < oldest:
+            self._max.popleft()
+        while self._min and self._min[0][0] < oldest:
+            self._min.popleft()
+
+    @property
+    def max(self) -> Optional[Tuple[int, float]]:
+        """(position, value) of the window maximum, or None if the window is empty."""
+        return self._max[0] if self._max else None
+
+    @property
+    def min(self) -> Optional[Tuple[int, float]]:
+        """(position, value) of the window minimum, or None if the window is empty."""
+        return self._min[0] if self._min else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the window to a JSON-compatible dictionary."""
+        return {
+            "size": self.size,
+            "count": self.count,
+            "max": [list(entry) for entry in self._max],
+            "min": [list(entry) for entry in self._min],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SlidingExtrema":
+        """Restore a window serialized with to_dict."""
+        window = cls(data["size"])
+        window.count = data["count"]
+        window._max = deque((position, value) for position, value in data["max"])
+        window._min = deque((position, value) for position, value in data["min"])
+        return window
+
+
+class RollingWindow:
+    """
+    Compact rolling state of the last `size` committed daily bars.
+
+    A bar is committed once a later bar has been seen. The latest bar of a
+    series stays pending, so evaluating the same day again (or intraday with
+    a moving price) compares it against the same committed window. Each
+    committed bar costs O(1); the window never re-scans history.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize an empty window.
+
+        Args:
+            size: Number of committed bars kept (the trigger lookback)
+        """
+        self.extrema = SlidingExtrema(size)
+        self.dates: deque = deque(maxlen=size)
+        self.closes: deque = deque(maxlen=size)
+        self.last_date: Optional[np.datetime64] = None
+
+    @property
+    def size(self) -> int:
+        """Number of committed bars kept."""
+        return self.extrema.size
+
+    def commit(self, date: np.datetime64, close: float) -> None:
+        """Append a closed bar to the window."""
+        self.extrema.push(close)
+        self.dates.append(date)
+        self.closes.append(close)
+        self.last_date = date
+
+    def reset(self) -> None:
+        """Forget all committed bars."""
+        self.__init__(self.size)
+
+    def sync(self, series) -> None:
+        """
+        Commit the bars of a series that precede its latest bar and are new.
+
+        If the series does not overlap the committed window (a gap since the
+        last run) or goes back in time, the window is rebuilt from the series.
+
+        Args:
+            series: PriceSeries (sorted by date, oldest first)
+        """
+        if len(series) == 0:
+            return
+
+        if self.last_date is not None and not (series.dates[0] <= self.last_date < series.dates[-1]):
+            self.reset()
+
+        for date, close in zip(series.dates[:-1], series.close[:-1].tolist()):
+            if self.last_date is None or date > self.last_date:
+                self.commit(date, close)
+
+    def _offset(self, position: int) -> int:
+        """Index into dates/closes of an absolute window position."""
+        return position - (self.extrema.count - len(self.dates))
+
+    def date_at(self, position: int) -> datetime:
+        """Date of the committed bar at an absolute window position."""
+        return self.dates[self._offset(position)].astype(datetime)
+
+    def close_at(self, position: int) -> float:
+        """Close of the committed bar at an absolute window position."""
+        return self.closes[self._offset(position)]
+
+    def days_ago(self, position: int) -> int:
+        """Bars between the pending bar and a committed window position."""
+        return self.extrema.count - position
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the window to a JSON-compatible dictionary."""
+        return {
+            "extrema": self.extrema.to_dict(),
+            "dates": [str(date) for date in self.dates],
+            "closes": list(self.closes),
+            "last_date": None if self.last_date is None else str(self.last_date),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RollingWindow":
+        """Restore a window serialized with to_dict."""
+        extrema = SlidingExtrema.from_dict(data["extrema"])
+        window = cls(extrema.size)
+        window.extrema = extrema
+        window.dates.extend(np.datetime64(date, 's') for date in data["dates"])
+        window.closes.extend(data["closes"])
+        if data["last_date"] is not None:
+            window.last_date = np.datetime64(data["last_date"], 's')
+        return window
+
+
+def max_abs_change_in_window(value: float, window: SlidingExtrema) -> Optional[Tuple[float, int]]:
+    """
+    Find the largest percentage change of a value vs any value in a window.
+
+    |value / reference - 1| is largest at the window's maximum or minimum,
+    so only the two extrema need to be compared. The more recent one wins
+    ties, as in a full scan of the window.
+
+    Args:
+        value: Today's value
+        window: Window of previous values
+
+    Returns:
+        Tuple of (signed percentage change, position of the reference value),
+        or None if the window is empty
+    """
+    if window.max is None:
+        return None
+
+    high_position, high = window.max
+    low_position, low = window.min
+    drop = (value - high) / high * 100
+    gain = (value - low) / low * 100
+
+    if abs(drop) > abs(gain) or (abs(drop) == abs(gain) and high_position > low_position):
+        return drop, high_position
+    return gain, low_position
@@ -0,0 +1,74 @@
+"""Persistent storage of incremental trigger state."""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TriggerStateStore:
+    """
+    JSON file of trigger states, keyed by index, lookback and trigger config.
+
+    States are loaded on first use, updated in memory during a run and
+    written back with save(), so each run only pays for one read and one
+    write however many triggers are evaluated.
+    """
+
+    def __init__(self, path: str = "data/trigger_state.json"):
+        """
+        Initialize the state store.
+
+        Args:
+            path: Path of the JSON state file (parent directories are created)
+        """
+        self.path = Path(path)
+        self._states: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load states from disk, starting empty if the file is missing or unreadable."""
+        if self._states is None:
+            self._states = {}
+            if self.path.exists():
+                try:
+                    self._states = json.loads(self.path.read_text())
+                except Exception as e:
+                    logger.warning(f"Failed to load trigger state from {self.path}: {e}")
+        return self._states
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored state for a key.
+
+        Args:
+            key: State key
+
+        Returns:
+            Serialized state, or None if nothing is stored
+        """
+        return self._load().get(key)
+
+    def set(self, key: str, state: Dict[str, Any]) -> None:
+        """
+        Update the state for a key (in memory until save() is called).
+
+        Args:
+            key: State key
+            state: Serialized state
+        """
+        self._load()[key] = state
+
+    def save(self) -> None:
+        """Write all states to disk atomically."""
+        if self._states is None:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(self._states))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save trigger state to {self.path}: {e}")
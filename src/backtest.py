@@ -0,0 +1,118 @@
+"""
+Vectorized backtesting of alert triggers over historical closes.
+
+Every backtest goes through AlertTrigger.evaluate_series, the batch
+counterpart of check_trigger, so backtests and the live alerter always
+agree on which days alert.
+"""
+from typing import List, Sequence
+import numpy as np
+from .alert_triggers import AlertTrigger, PercentageDropTrigger, SeriesEvaluation
+from .models import PriceSeries
+
+
+def alert_positions(fired: np.ndarray, cooldown: int = 7) -> np.ndarray:
+    """
+    Find the days that would raise an alert, applying a cooldown.
+
+    After an alert the next cooldown - 1 days are skipped so one dip is
+    counted once.
+
+    Args:
+        fired: SeriesEvaluation.fired from evaluate_series, True on days
+            where the trigger fires
+        cooldown: Days from an alert until the next day that may alert
+
+    Returns:
+        Positions of alert days
+    """
+    candidates = np.flatnonzero(fired)
+
+    positions = []
+    next_candidate = 0
+    while next_candidate < len(candidates):
+        position = candidates[next_candidate]
+        positions.append(position)
+        # Jump straight to the first candidate after the cooldown
+        next_candidate = np.searchsorted(candidates, position + cooldown, side='left')
+
+    return np.asarray(positions, dtype=np.int64)
+
+
+def simulate_triggers(
+    series: PriceSeries,
+    triggers: Sequence[AlertTrigger],
+    lookback: int = 7
+) -> List[SeriesEvaluation]:
+    """
+    Evaluate several triggers of one type on a series.
+
+    The first trigger's evaluation is passed on to the others, so
+    threshold-independent work (e.g. the rolling maximum change) is done
+    once for the whole set.
+
+    Args:
+        series: PriceSeries (sorted by date, oldest first)
+        triggers: Triggers of the same type, e.g. one per threshold
+        lookback: Number of previous days to compare against
+
+    Returns:
+        SeriesEvaluation for each trigger, in the same order
+    """
+    evaluations = []
+    for trigger in triggers:
+        evaluations.append(trigger.evaluate_series(series, lookback, evaluations[0] if evaluations else None))
+    return evaluations
+
+
+def simulate_threshold_grid(
+    series: PriceSeries,
+    thresholds: Sequence[float],
+    lookback: int = 7,
+    cooldown: int = 7
+) -> List[np.ndarray]:
+    """
+    Simulate drop alerts for a whole grid of thresholds.
+
+    Args:
+        series: PriceSeries (sorted by date, oldest first)
+        thresholds: Drop thresholds in percent
+        lookback: Number of previous days to compare against
+        cooldown: Days from an alert until the next day that may alert
+
+    Returns:
+        Alert positions for each threshold, in the same order as thresholds
+    """
+    triggers = [PercentageDropTrigger(threshold) for threshold in thresholds]
+    return [
+        alert_positions(evaluation.fired, cooldown)
+        for evaluation in simulate_triggers(series, triggers, lookback)
+    ]
+
+
+def sweep_lookback_threshold(
+    series: PriceSeries,
+    lookbacks: Sequence[int],
+    thresholds: Sequence[float],
+    cooldown: int = 7
+) -> np.ndarray:
+    """
+    Count drop alerts for every (lookback, threshold) combination.
+
+    Each lookback evaluates the series once; its thresholds share that
+    evaluation (see simulate_triggers).
+
+    Args:
+        series: PriceSeries (sorted by date, oldest first)
+        lookbacks: Lookback windows in days (each >= 1)
+        thresholds: Drop thresholds in percent
+        cooldown: Days from an alert until the next day that may alert
+
+    Returns:
+        Integer matrix of alert counts with shape (len(lookbacks), len(thresholds))
+    """
+    counts = np.zeros((len(lookbacks), len(thresholds)), dtype=np.int64)
+    for row, lookback in enumerate(lookbacks):
+        for column, positions in enumerate(simulate_threshold_grid(series, thresholds, lookback, cooldown)):
+            counts[row, column] = len(positions)
+    return counts
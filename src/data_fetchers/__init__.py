@@ -3,10 +3,14 @@ from .base import DataFetcher
 from .yahoo_finance import YahooFinanceDataFetcher
 from .nse_india import NSEIndiaDataFetcher
 from .fallback_fetcher import FallbackDataFetcher
+from .price_store import PriceStore
+from .cached_fetcher import CachedDataFetcher
 
 __all__ = [
     "DataFetcher",
     "YahooFinanceDataFetcher",
     "NSEIndiaDataFetcher",
-    "FallbackDataFetcher"
+    "FallbackDataFetcher",
+    "PriceStore",
+    "CachedDataFetcher"
 ]
@@ -1,8 +1,7 @@
 """Base class for data fetchers."""
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List
-from ..models import IndexData
+from ..models import PriceSeries
 
 
 class DataFetcher(ABC):
@@ -14,7 +13,7 @@ class DataFetcher(ABC):
         symbol: str,
         start_date: datetime,
         end_date: datetime
-    ) -> List[IndexData]:
+    ) -> PriceSeries:
         """
         Fetch historical data for a given symbol.
 
@@ -24,6 +23,6 @@ class DataFetcher(ABC):
             end_date: End date for historical data
 
         Returns:
-            List of IndexData objects
+            PriceSeries sorted by date (oldest first)
         """
         pass
@@ -0,0 +1,186 @@
+"""Data fetcher that serves history from a local price store."""
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Tuple
+from .base import DataFetcher
+from .price_store import PriceStore
+from ..models import PriceSeries
+
+logger = logging.getLogger(__name__)
+
+
+class CachedDataFetcher(DataFetcher):
+    """
+    Wrap any DataFetcher with a persistent local price store.
+
+    History already on disk is served from the store; only bars after the
+    last stored date (and any range before the stored coverage) are
+    requested from the wrapped fetcher.
+
+    If the wrapped fetcher answers with stale data (cached history served
+    during a source outage), nothing is written to the store and the
+    result is marked stale. An empty answer is not recorded as coverage
+    either, so the range is requested again on the next call.
+    """
+
+    def __init__(self, fetcher: DataFetcher, store: PriceStore):
+        """
+        Initialize cached fetcher.
+
+        Args:
+            fetcher: Upstream data fetcher used for missing bars
+            store: Local price store
+        """
+        self.fetcher = fetcher
+        self.store = store
+
+    def _missing_ranges(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Work out which date ranges must be requested from the upstream fetcher.
+
+        The most recent stored bar is always re-fetched, since it may have
+        been captured before the market closed.
+        """
+        coverage = self.store.get_coverage(symbol)
+        if coverage is None:
+            return [(start_date, end_date)]
+
+        covered_start, covered_end = coverage
+        ranges = []
+
+        # Backfill history requested before the stored range
+        if start_date.date() < covered_start:
+            ranges.append((start_date, datetime.combine(covered_start, time()) + timedelta(days=1)))
+
+        # Refresh from the last stored bar up to the requested end
+        if end_date.date() >= covered_end:
+            last_bar = self.store.last_bar_date(symbol) or covered_end
+            ranges.append((datetime.combine(last_bar, time()), end_date))
+
+        return ranges
+
+    def fetch_historical_data(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> PriceSeries:
+        """
+        Fetch historical data, downloading only bars missing from the store.
+
+        Args:
+            symbol: Index symbol
+            start_date: Start date for historical data
+            end_date: End date for historical data
+
+        Returns:
+            PriceSeries (sorted by date, oldest first)
+        """
+        ranges = self._missing_ranges(symbol, start_date, end_date)
+        if not ranges:
+            logger.info(f"Serving {symbol} from local price store")
+
+        stale = False
+        for range_start, range_end in ranges:
+            logger.info(f"Fetching missing bars for {symbol} ({range_start.date()} to {range_end.date()})")
+            data = self.fetcher.fetch_historical_data(
+                symbol=symbol,
+                start_date=range_start,
+                end_date=range_end
+            )
+            if data.stale:
+                stale = True
+                continue
+            if not data:
+                # Don't record the range as covered, so it is requested again next time
+                logger.warning(f"No bars returned for {symbol} ({range_start.date()} to {range_end.date()})")
+                continue
+            self.store.save(symbol, data, range_start, range_end)
+
+        return self._load(symbol, start_date, end_date, stale)
+
+    def _load(self, symbol: str, start_date: datetime, end_date: datetime, stale: bool) -> PriceSeries:
+        data = self.store.load(symbol, start_date, end_date)
+        data.stale = stale
+        return data
+
+    def fetch_many(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, PriceSeries]:
+        """
+        Fetch historical data for several symbols, downloading only missing bars.
+
+        Symbols that need the same missing range are requested together
+        through the wrapped fetcher's batch API when it has one. A range the
+        upstream returns nothing for (e.g. only holidays) is skipped and the
+        stored history is served; if fetching a range failed, the result is
+        marked stale. Symbols with no bars at all are left out of the result.
+
+        Args:
+            symbols: Index symbols
+            start_date: Start date for historical data
+            end_date: End date for historical data
+
+        Returns:
+            Dictionary mapping symbol to PriceSeries
+        """
+        groups = defaultdict(list)
+        for symbol in symbols:
+            for missing_range in self._missing_ranges(symbol, start_date, end_date):
+                groups[missing_range].append(symbol)
+
+        stale = set()
+        for (range_start, range_end), group in groups.items():
+            logger.info(
+                f"Fetching missing bars for {len(group)} symbol(s) "
+                f"({range_start.date()} to {range_end.date()})"
+            )
+
+            batch = None
+            if hasattr(self.fetcher, 'fetch_many'):
+                try:
+                    batch = self.fetcher.fetch_many(group, range_start, range_end)
+                except Exception as e:
+                    logger.warning(f"Batch fetch failed, falling back to per-symbol requests: {e}")
+
+            for symbol in group:
+                if batch is not None:
+                    data = batch.get(symbol)
+                    if not data:
+                        logger.warning(f"No missing bars returned for {symbol}, serving stored history")
+                        continue
+                else:
+                    try:
+                        data = self.fetcher.fetch_historical_data(
+                            symbol=symbol,
+                            start_date=range_start,
+                            end_date=range_end
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch missing bars for {symbol}, serving stored history: {e}")
+                        stale.add(symbol)
+                        continue
+
+                if data.stale:
+                    stale.add(symbol)
+                    continue
+                if not data:
+                    logger.warning(f"No missing bars returned for {symbol}, serving stored history")
+                    continue
+                self.store.save(symbol, data, range_start, range_end)
+
+        results = {}
+        for symbol in symbols:
+            data = self._load(symbol, start_date, end_date, symbol in stale)
+            if data:
+                results[symbol] = data
+        return results
@@ -0,0 +1,115 @@
+"""Circuit breaker and health tracking for data sources."""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker with a decaying health score.
+
+    States:
+    - closed: requests flow normally
+    - open: requests are rejected until the cool-down has passed
+    - half_open: a single probe request is allowed; success closes the
+      circuit, failure opens it again
+
+    The health score is an exponentially weighted success rate in [0, 1].
+    Its penalty halves every cool-down period, so a source that has not
+    been tried for a while drifts back to healthy.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        cooldown: float = 300.0,
+        smoothing: float = 0.3
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Source name (for logging)
+            failure_threshold: Consecutive failures before the circuit opens
+            cooldown: Seconds to keep the circuit open before probing again
+            smoothing: Weight of the latest outcome in the health score
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._health = 1.0
+        self._health_updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def health(self) -> float:
+        """Current health score (1.0 = fully healthy)."""
+        elapsed = time.monotonic() - self._health_updated_at
+        return 1.0 - (1.0 - self._health) * 0.5 ** (elapsed / self.cooldown)
+
+    def _set_health(self, value: float) -> None:
+        self._health = value
+        self._health_updated_at = time.monotonic()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to this source.
+
+        Returns:
+            True if the circuit is closed, or if this call claims the
+            half-open probe slot; False otherwise
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                logger.info(f"Circuit for {self.name} half-open, sending probe request")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+            health = self.health
+            self._set_health(health + (1.0 - health) * self.smoothing)
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if needed."""
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            self._set_health(self.health * (1.0 - self.smoothing))
+
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"Circuit for {self.name} opened after {self.failures} failure(s), "
+                        f"skipping it for {self.cooldown:.0f}s"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
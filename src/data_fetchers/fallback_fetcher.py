@@ -1,11 +1,15 @@
 """Fallback data fetcher with multiple sources."""
 import logging
-from datetime import datetime
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from .base import DataFetcher
 from .yahoo_finance import YahooFinanceDataFetcher
 from .nse_india import NSEIndiaDataFetcher
-from ..models import IndexData
+from .circuit_breaker import CircuitBreaker
+from .price_store import PriceStore
+from ..models import PriceSeries
 
 logger = logging.getLogger(__name__)
 
@@ -17,22 +21,90 @@ class FallbackDataFetcher(DataFetcher):
     Tries sources in order:
     1. Yahoo Finance (best for historical data)
     2. NSE India (fallback for current data)
+
+    In hedged mode the next source is started if the current one has not
+    answered within hedge_delay seconds, and the first valid result wins.
+
+    Each source has a circuit breaker: after repeated failures it is skipped
+    for a cool-down period, and sources are reordered so that healthy ones
+    are tried first.
+
+    With a stale store, a symbol that no source can provide is served from
+    the last cached history (marked stale) as long as its latest bar is
+    recent enough, and a background refresh retries the sources and
+    updates the store once one answers.
     """
 
-    def __init__(self):
-        """Initialize fallback fetcher with multiple data sources."""
-        self.fetchers = [
+    # Sources whose health drops below this are moved behind healthy ones
+    UNHEALTHY_BELOW = 0.5
+
+    def __init__(
+        self,
+        hedge_delay: Optional[float] = None,
+        failure_threshold: int = 3,
+        cooldown: float = 300.0,
+        nse_cookie_path: Optional[str] = None,
+        stale_store: Optional[PriceStore] = None,
+        stale_max_age_days: int = 4,
+        sources: Optional[List[Tuple[str, DataFetcher]]] = None
+    ):
+        """
+        Initialize fallback fetcher with multiple data sources.
+
+        Args:
+            hedge_delay: Seconds to wait before racing the next source
+                (0 = query all sources at once, None = strictly sequential)
+            failure_threshold: Consecutive failures before a source's circuit opens
+            cooldown: Seconds an open circuit skips its source before probing again
+            nse_cookie_path: File to persist NSE India session cookies to
+            stale_store: Price store to serve cached history from when all
+                sources fail (None = raise instead)
+            stale_max_age_days: Maximum age in days of the latest cached bar
+                for stale history to be served
+            sources: (name, fetcher) pairs in priority order (None = Yahoo
+                Finance, then NSE India)
+        """
+        self.fetchers = list(sources) if sources is not None else [
             ('Yahoo Finance', YahooFinanceDataFetcher()),
-            ('NSE India', NSEIndiaDataFetcher()),
+            ('NSE India', NSEIndiaDataFetcher(cookie_path=nse_cookie_path)),
         ]
+        self.hedge_delay = hedge_delay
+        self.breakers = {
+            source_name: CircuitBreaker(source_name, failure_threshold, cooldown)
+            for source_name, _ in self.fetchers
+        }
+        self._priority = {source_name: position for position, (source_name, _) in enumerate(self.fetchers)}
+        self._order_lock = threading.Lock()
+        self.stale_store = stale_store
+        self.stale_max_age = timedelta(days=stale_max_age_days)
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
         logger.info(f"Initialized FallbackDataFetcher with {len(self.fetchers)} sources")
 
+    def _record(self, source_name: str, success: bool) -> None:
+        """Record a source outcome on its circuit breaker."""
+        breaker = self.breakers[source_name]
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def _sources(self) -> list:
+        """Reorder self.fetchers so healthy sources come first and return a snapshot."""
+        with self._order_lock:
+            self.fetchers.sort(key=lambda source: (
+                self.breakers[source[0]].state == CircuitBreaker.OPEN,
+                self.breakers[source[0]].health < self.UNHEALTHY_BELOW,
+                self._priority[source[0]]
+            ))
+            return list(self.fetchers)
+
     def fetch_historical_data(
         self,
         symbol: str,
         start_date: datetime,
         end_date: datetime
-    ) -> List[IndexData]:
+    ) -> PriceSeries:
         """
         Fetch historical data trying multiple sources.
 
@@ -42,14 +114,108 @@ class FallbackDataFetcher(DataFetcher):
             end_date: End date for historical data
 
         Returns:
-            List of IndexData objects
+            PriceSeries (marked stale if served from the cache)
 
         Raises:
-            Exception: If all data sources fail
+            Exception: If all data sources fail and no recent cached history exists
         """
+        try:
+            return self._fetch_from_sources(symbol, start_date, end_date, self._sources())
+        except Exception:
+            stale = self._serve_stale(symbol, start_date, end_date)
+            if stale is None:
+                raise
+            return stale
+
+    def _serve_stale(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[PriceSeries]:
+        """
+        Load cached history for a symbol no source could provide.
+
+        Starts a background refresh of the symbol when stale history is served.
+
+        Returns:
+            Stale PriceSeries, or None if there is no stale store or the
+            cached history is missing or older than stale_max_age_days
+        """
+        if self.stale_store is None:
+            return None
+
+        try:
+            data = self.stale_store.load(symbol, start_date, end_date)
+        except Exception as e:
+            logger.warning(f"Could not read cached history for {symbol}: {e}")
+            return None
+
+        if not data:
+            return None
+
+        age = datetime.now() - data.date_at(-1)
+        if age > self.stale_max_age:
+            logger.warning(f"Cached history for {symbol} is {age.days} days old, not serving it")
+            return None
+
+        logger.warning(f"Serving stale cached history for {symbol} (latest bar {data.date_at(-1).date()})")
+        data.stale = True
+        self._refresh_in_background(symbol, start_date, end_date)
+        return data
+
+    def refreshing(self) -> List[str]:
+        """Symbols whose background refresh is still running."""
+        with self._refresh_lock:
+            return sorted(self._refreshing)
+
+    def _refresh_in_background(self, symbol: str, start_date: datetime, end_date: datetime) -> None:
+        """Retry the sources for a symbol in a background thread (one refresh per symbol at a time)."""
+        with self._refresh_lock:
+            if symbol in self._refreshing:
+                return
+            self._refreshing.add(symbol)
+
+        def refresh():
+            try:
+                data = self._fetch_from_sources(symbol, start_date, end_date, self._sources())
+                self.stale_store.save(symbol, data, start_date, end_date)
+                logger.info(f"Background refresh of {symbol} stored {len(data)} bars")
+            except Exception as e:
+                logger.warning(f"Background refresh of {symbol} failed: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(symbol)
+
+        threading.Thread(target=refresh, name=f"refresh-{symbol}", daemon=True).start()
+
+    def _fetch_from_sources(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        sources: list
+    ) -> PriceSeries:
+        """Fetch a single symbol from the given (name, fetcher) sources."""
+        if self.hedge_delay is not None and len(sources) > 1:
+            return self._fetch_hedged(symbol, start_date, end_date, sources)
+        return self._fetch_sequential(symbol, start_date, end_date, sources)
+
+    def _fetch_sequential(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        sources: list
+    ) -> PriceSeries:
+        """Try the given (name, fetcher) sources in order for a single symbol."""
         errors = []
 
-        for source_name, fetcher in self.fetchers:
+        for source_name, fetcher in sources:
+            if not self.breakers[source_name].allow_request():
+                errors.append(f"{source_name} skipped (circuit open)")
+                continue
+
             try:
                 logger.info(f"Trying {source_name} for {symbol}...")
                 data = fetcher.fetch_historical_data(
@@ -59,14 +225,17 @@ class FallbackDataFetcher(DataFetcher):
                 )
 
                 if data:
+                    self._record(source_name, success=True)
                     logger.info(f"✓ Successfully fetched {len(data)} data points from {source_name}")
                     return data
                 else:
+                    self._record(source_name, success=False)
                     error_msg = f"{source_name} returned empty data"
                     logger.warning(error_msg)
                     errors.append(error_msg)
 
             except Exception as e:
+                self._record(source_name, success=False)
                 error_msg = f"{source_name} failed: {str(e)}"
                 logger.warning(error_msg)
                 errors.append(error_msg)
@@ -75,3 +244,227 @@ class FallbackDataFetcher(DataFetcher):
         error_summary = f"All data sources failed for {symbol}: " + "; ".join(errors)
         logger.error(error_summary)
         raise Exception(error_summary)
+
+    def _fetch_hedged(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        sources: list
+    ) -> PriceSeries:
+        """
+        Race the given sources for a single symbol.
+
+        Sources start in order, each one hedge_delay seconds after the
+        previous (or immediately when a running source fails). The first
+        non-empty result is returned; slower sources are ignored.
+        """
+        errors = []
+        pending = {}
+        remaining = list(sources)
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="hedged-fetch")
+
+        def record_outcome(source_name, future):
+            # Runs for losing requests too, so their outcome still feeds the breaker
+            if future.cancelled():
+                return
+            self._record(source_name, success=future.exception() is None and bool(future.result()))
+
+        def start_next():
+            while remaining:
+                source_name, fetcher = remaining.pop(0)
+                if not self.breakers[source_name].allow_request():
+                    errors.append(f"{source_name} skipped (circuit open)")
+                    continue
+
+                logger.info(f"Trying {source_name} for {symbol}...")
+                future = executor.submit(
+                    fetcher.fetch_historical_data,
+                    symbol=symbol,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+                future.add_done_callback(lambda f, name=source_name: record_outcome(name, f))
+                pending[future] = source_name
+                return
+
+        try:
+            start_next()
+            while pending:
+                done, _ = wait(
+                    pending,
+                    timeout=self.hedge_delay if remaining else None,
+                    return_when=FIRST_COMPLETED
+                )
+
+                if not done:
+                    logger.info(f"No response for {symbol} after {self.hedge_delay}s, hedging with next source")
+                    start_next()
+                    continue
+
+                for future in done:
+                    source_name = pending.pop(future)
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        error_msg = f"{source_name} failed: {str(e)}"
+                        logger.warning(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+                    if data:
+                        logger.info(f"✓ Successfully fetched {len(data)} data points from {source_name}")
+                        return data
+
+                    error_msg = f"{source_name} returned empty data"
+                    logger.warning(error_msg)
+                    errors.append(error_msg)
+
+                # A source finished without data: don't wait out the delay
+                if remaining:
+                    start_next()
+        finally:
+            # Losing requests keep running in the background; their results are ignored
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        error_summary = f"All data sources failed for {symbol}: " + "; ".join(errors)
+        logger.error(error_summary)
+        raise Exception(error_summary)
+
+    def fetch_many(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, PriceSeries]:
+        """
+        Fetch historical data for several symbols, batching where sources allow.
+
+        Sources with a batch API are tried first for all outstanding symbols;
+        anything still missing is fetched per symbol from the remaining sources.
+        In hedged mode, the per-symbol fetches also start if the batch has not
+        answered within hedge_delay seconds, and each symbol takes whichever
+        result arrives first. Symbols that no source could provide are served
+        stale from the cache when possible, otherwise left out of the result.
+
+        Args:
+            symbols: Index symbols
+            start_date: Start date for historical data
+            end_date: End date for historical data
+
+        Returns:
+            Dictionary mapping symbol to PriceSeries
+        """
+        sources = self._sources()
+        batch_sources = [source for source in sources if hasattr(source[1], 'fetch_many')]
+        single_sources = [source for source in sources if not hasattr(source[1], 'fetch_many')]
+
+        if self.hedge_delay is not None and batch_sources and single_sources:
+            results = self._fetch_many_hedged(symbols, start_date, end_date, batch_sources, single_sources)
+        else:
+            results = self._fetch_batches(symbols, start_date, end_date, batch_sources)
+            for symbol in symbols:
+                if symbol in results:
+                    continue
+                try:
+                    results[symbol] = self._fetch_from_sources(symbol, start_date, end_date, single_sources)
+                except Exception:
+                    pass
+
+        for symbol in symbols:
+            if symbol not in results:
+                stale = self._serve_stale(symbol, start_date, end_date)
+                if stale is not None:
+                    results[symbol] = stale
+
+        return results
+
+    def _fetch_batches(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        batch_sources: list
+    ) -> Dict[str, PriceSeries]:
+        """Try the batch-capable sources in order for the symbols still missing."""
+        results = {}
+        remaining = list(symbols)
+
+        for source_name, fetcher in batch_sources:
+            if not remaining or not self.breakers[source_name].allow_request():
+                continue
+
+            try:
+                logger.info(f"Trying {source_name} batch download for {len(remaining)} symbols...")
+                batch = fetcher.fetch_many(remaining, start_date, end_date)
+                fetched = [symbol for symbol, data in batch.items() if data]
+                for symbol in fetched:
+                    results[symbol] = batch[symbol]
+                remaining = [symbol for symbol in remaining if symbol not in results]
+                self._record(source_name, success=bool(fetched))
+            except Exception as e:
+                self._record(source_name, success=False)
+                logger.warning(f"{source_name} batch download failed: {str(e)}")
+
+        return results
+
+    def _fetch_many_hedged(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        batch_sources: list,
+        single_sources: list
+    ) -> Dict[str, PriceSeries]:
+        """
+        Race the batch download against per-symbol fetches.
+
+        Per-symbol fetches from the single-symbol sources start after
+        hedge_delay seconds (or as soon as the batch finishes) for every
+        symbol without a result yet; the first result per symbol wins.
+        """
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=1 + len(symbols), thread_name_prefix="hedged-batch")
+        batch_future = executor.submit(self._fetch_batches, symbols, start_date, end_date, batch_sources)
+        pending = {batch_future: None}
+        hedged = False
+
+        def start_single():
+            for symbol in symbols:
+                if symbol not in results:
+                    future = executor.submit(self._fetch_from_sources, symbol, start_date, end_date, single_sources)
+                    pending[future] = symbol
+
+        try:
+            while pending and len(results) < len(symbols):
+                done, _ = wait(
+                    pending,
+                    timeout=None if hedged else self.hedge_delay,
+                    return_when=FIRST_COMPLETED
+                )
+
+                if not done:
+                    logger.info(f"No batch response after {self.hedge_delay}s, hedging per symbol")
+                    hedged = True
+                    start_single()
+                    continue
+
+                for future in done:
+                    symbol = pending.pop(future)
+                    if symbol is None:
+                        for batch_symbol, data in future.result().items():
+                            results.setdefault(batch_symbol, data)
+                        if not hedged:
+                            hedged = True
+                            start_single()
+                        continue
+
+                    try:
+                        results.setdefault(symbol, future.result())
+                    except Exception:
+                        continue
+        finally:
+            # Slower requests keep running in the background; their results are ignored
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
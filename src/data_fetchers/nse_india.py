@@ -1,15 +1,22 @@
 """NSE India data fetcher implementation"""
+import json
 import logging
+import threading
 from curl_cffi import requests
 import time
 import urllib.parse
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from pathlib import Path
+from typing import List, Optional, Dict, Tuple
+from zoneinfo import ZoneInfo
 from .base import DataFetcher
-from ..models import IndexData
+from ..models import PriceSeries
 
 logger = logging.getLogger(__name__)
 
+# NSE reports times in IST
+NSE_TIMEZONE = ZoneInfo("Asia/Kolkata")
+
 
 class NSEIndiaDataFetcher(DataFetcher):
     """Fetch index data from NSE India using production-grade approach."""
@@ -19,11 +26,43 @@ class NSEIndiaDataFetcher(DataFetcher):
         '^NSEI': 'NIFTY 50',
         '^NSEBANK': 'NIFTY BANK',
         '^CNXIT': 'NIFTY IT',
+        '^CRSLDX': 'NIFTY 500',
+        '^CNXFMCG': 'NIFTY FMCG',
+        '^CNXPHARMA': 'NIFTY PHARMA',
+        '^CNXAUTO': 'NIFTY AUTO',
+        '^CNXENERGY': 'NIFTY ENERGY',
+        '^CNXMETAL': 'NIFTY METAL',
     }
 
-    def __init__(self):
-        """Initialize NSE India fetcher with production-grade headers."""
+    def __init__(
+        self,
+        snapshot_ttl: float = 60.0,
+        cookie_path: Optional[str] = None,
+        warmup_backoff: float = 300.0
+    ):
+        """
+        Initialize NSE India fetcher with production-grade headers.
+
+        No request is made here; the session is warmed up on first use and
+        then only re-warmed after NSE answers 401/403.
+
+        Args:
+            snapshot_ttl: Seconds an allIndices snapshot is reused before refreshing
+            cookie_path: File to persist session cookies to (None = memory only)
+            warmup_backoff: Seconds to wait after a failed warm-up before trying
+                again (requests in between go out without warming up)
+        """
         self.base_url = "https://www.nseindia.com"
+        self.cookie_path = Path(cookie_path) if cookie_path else None
+        self.warmup_backoff = warmup_backoff
+        self._session_ready = False
+        self._warmup_retry_at = 0.0
+        self._session_lock = threading.Lock()
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshot: Dict[str, Dict] = {}
+        self._snapshot_fetched_at = 0.0
+        self._snapshot_timestamp: Optional[datetime] = None
+        self._snapshot_lock = threading.Lock()
         self.session = requests.Session()
         self.headers = {
             "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
@@ -39,73 +78,247 @@ class NSEIndiaDataFetcher(DataFetcher):
             "upgrade-insecure-requests": "1",
             "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36",
         }
-        self._initialize_session()
+        self.session.headers.update(self.headers)
 
     def _initialize_session(self):
         """Initialize session with NSE India to get cookies - production approach."""
         try:
             # Visit homepage first to get cookies
-            self.session.headers.update(self.headers)
+            self.session.cookies.clear()
             self.session.get(self.base_url, timeout=20, impersonate="chrome120")
 
             # Sometimes visiting market data pages helps get all cookies
             time.sleep(1)
             self.session.get(f"{self.base_url}/market-data/live-equity-market", timeout=20, impersonate="chrome120")
 
+            self._session_ready = True
+            self._save_cookies()
             logger.info("NSE India session initialized with cookies")
         except Exception as e:
-            logger.warning(f"Failed to initialize NSE session: {e}")
+            self._session_ready = False
+            self._warmup_retry_at = time.monotonic() + self.warmup_backoff
+            logger.warning(f"Failed to initialize NSE session, next attempt in {self.warmup_backoff:.0f}s: {e}")
+
+    def _cookie_expiry(self) -> Optional[float]:
+        """Earliest expiry of any session cookie (epoch seconds), None if all are session cookies."""
+        expiries = [cookie.expires for cookie in self.session.cookies.jar if cookie.expires]
+        return min(expiries, default=None)
+
+    def _save_cookies(self) -> None:
+        """Persist session cookies and their expiry to cookie_path."""
+        if self.cookie_path is None:
+            return
+
+        try:
+            self.cookie_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "expires_at": self._cookie_expiry(),
+                "cookies": [
+                    {
+                        "name": cookie.name,
+                        "value": cookie.value,
+                        "domain": cookie.domain,
+                        "path": cookie.path,
+                    }
+                    for cookie in self.session.cookies.jar
+                ]
+            }
+            self.cookie_path.write_text(json.dumps(payload))
+        except Exception as e:
+            logger.warning(f"Failed to save NSE cookies: {e}")
+
+    def _load_cookies(self) -> bool:
+        """
+        Load persisted session cookies if none of them has expired.
+
+        Returns:
+            True if a still-valid cookie jar was loaded
+        """
+        if self.cookie_path is None or not self.cookie_path.exists():
+            return False
+
+        try:
+            payload = json.loads(self.cookie_path.read_text())
+            expires_at = payload.get("expires_at")
+            if expires_at is not None and expires_at <= time.time():
+                logger.info("Persisted NSE cookies have expired")
+                return False
+
+            for cookie in payload.get("cookies", []):
+                self.session.cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain", ""),
+                    path=cookie.get("path", "/")
+                )
+            logger.info("Loaded persisted NSE session cookies")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load NSE cookies: {e}")
+            return False
+
+    def _ensure_session(self, force: bool = False) -> None:
+        """
+        Make sure the session has cookies, warming it up only when needed.
+
+        A session is trusted until NSE rejects it; after a failed warm-up no
+        new attempt is made for warmup_backoff seconds, so an NSE outage
+        costs one request per call rather than a full warm-up each time.
+
+        Args:
+            force: Discard the current cookies and warm up again (e.g. after a 401/403)
+        """
+        with self._session_lock:
+            if force:
+                self._session_ready = False
+            elif self._session_ready:
+                return
+
+            if time.monotonic() < self._warmup_retry_at:
+                return
+
+            if not force and self._load_cookies():
+                self._session_ready = True
+                return
+
+            self._initialize_session()
+
+    def _get(self, url: str, **kwargs):
+        """
+        GET a URL with a warmed-up session, re-warming once on 401/403.
+
+        Args:
+            url: URL to fetch
+            **kwargs: Extra arguments for session.get
+
+        Returns:
+            Response object
+        """
+        self._ensure_session()
+        response = self.session.get(url, impersonate="chrome120", **kwargs)
+
+        if response.status_code in (401, 403):
+            logger.info(f"NSE returned {response.status_code}, refreshing session cookies")
+            self._ensure_session(force=True)
+            response = self.session.get(url, impersonate="chrome120", **kwargs)
+
+        return response
 
     def _get_index_name(self, symbol: str) -> str:
         """Convert symbol to NSE index name."""
         return self.SYMBOL_MAP.get(symbol, symbol)
 
-    def _fetch_current_data(self, index_name: str) -> Optional[Dict]:
+    def _download_all_indices(self) -> Optional[Tuple[Dict[str, Dict], datetime]]:
         """
-        Fetch current index data from NSE.
-
-        Args:
-            index_name: NSE index name (e.g., 'NIFTY 50')
+        Download the allIndices payload and index it by name and symbol.
 
         Returns:
-            Dictionary with current index data or None
+            Tuple of (snapshot, timestamp): a dictionary mapping both 'index'
+            and 'indexSymbol' to the index entry, and NSE's timestamp for the
+            payload in IST (the download time if NSE sent none), or None if
+            the download failed
         """
         try:
             # Use allIndices endpoint which gives cleaner index data
             url = f"{self.base_url}/api/allIndices"
 
-            response = self.session.get(
-                url,
-                headers=self.headers,
-                timeout=10,
-                impersonate="chrome120"
-            )
+            response = self._get(url, headers=self.headers, timeout=10)
 
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                except ValueError as e:
-                    logger.error(f"Failed to parse JSON from NSE: {e}")
-                    logger.debug(f"Response text: {response.text[:200]}")
-                    return None
-
-                # Find the specific index in the data
-                if 'data' in data:
-                    for item in data['data']:
-                        if item.get('index') == index_name or item.get('indexSymbol') == index_name:
-                            logger.info(f"Found NSE data for {index_name}")
-                            return item
-
-                logger.warning(f"Index {index_name} not found in NSE data")
-            else:
-                logger.warning(f"Failed to fetch NSE data for {index_name}: status {response.status_code}")
+            if response.status_code != 200:
+                logger.warning(f"Failed to fetch NSE allIndices: status {response.status_code}")
+                return None
 
-            return None
+            try:
+                data = response.json()
+            except ValueError as e:
+                logger.error(f"Failed to parse JSON from NSE: {e}")
+                logger.debug(f"Response text: {response.text[:200]}")
+                return None
+
+            snapshot = {}
+            for item in data.get('data', []):
+                for key in (item.get('index'), item.get('indexSymbol')):
+                    if key:
+                        snapshot[key] = item
+
+            try:
+                timestamp = datetime.strptime(data['timestamp'], "%d-%b-%Y %H:%M:%S")
+            except (KeyError, TypeError, ValueError):
+                timestamp = datetime.now(NSE_TIMEZONE).replace(tzinfo=None)
+
+            logger.info(f"Fetched NSE allIndices snapshot ({len(data.get('data', []))} indices, as of {timestamp})")
+            return snapshot, timestamp
 
         except Exception as e:
             logger.error(f"Error fetching NSE data: {e}", exc_info=True)
             return None
 
+    def get_all_indices_snapshot(self) -> Dict[str, Dict]:
+        """
+        Get the allIndices snapshot, refreshing it once snapshot_ttl has passed.
+
+        All lookups within the TTL share a single HTTP request. If a refresh
+        fails, the previous snapshot (if any) keeps being served; live prices
+        are not read from it once it is stale (see _snapshot_is_current).
+
+        Returns:
+            Dictionary mapping index name and index symbol to the index entry
+        """
+        with self._snapshot_lock:
+            if self._snapshot and time.monotonic() - self._snapshot_fetched_at < self.snapshot_ttl:
+                return self._snapshot
+
+            downloaded = self._download_all_indices()
+            if downloaded is not None:
+                self._snapshot, self._snapshot_timestamp = downloaded
+                self._snapshot_fetched_at = time.monotonic()
+
+            return self._snapshot
+
+    def _snapshot_is_current(self) -> bool:
+        """
+        Whether the last allIndices snapshot is recent enough to trade on.
+
+        After a failed refresh the previous snapshot is still served; it is
+        only current while it is within snapshot_ttl and from today (IST).
+        """
+        with self._snapshot_lock:
+            if self._snapshot_timestamp is None:
+                return False
+            if time.monotonic() - self._snapshot_fetched_at > self.snapshot_ttl:
+                return False
+            return self._snapshot_timestamp.date() == datetime.now(NSE_TIMEZONE).date()
+
+    def fetch_live_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get the latest traded value of several indices from one allIndices snapshot.
+
+        Args:
+            symbols: Index symbols (e.g., ^NSEI for NIFTY 50)
+
+        Returns:
+            Dictionary mapping symbol to last price (symbols not found are
+            omitted; empty if only a stale snapshot is available)
+        """
+        snapshot = self.get_all_indices_snapshot()
+        if snapshot and not self._snapshot_is_current():
+            logger.warning(f"NSE allIndices snapshot as of {self._snapshot_timestamp} is stale, ignoring live prices")
+            return {}
+
+        prices = {}
+        for symbol in symbols:
+            item = snapshot.get(self._get_index_name(symbol))
+            if item is None:
+                logger.warning(f"Index {symbol} not found in NSE data")
+                continue
+
+            try:
+                prices[symbol] = float(item['last'])
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Invalid NSE live price for {symbol}: {e}")
+
+        return prices
+
     def _fetch_historical_index_data(self, index_name: str, start_date: datetime, end_date: datetime) -> List[Dict]:
         """
         Fetch historical index OHLC data from NSE
@@ -134,7 +347,7 @@ class NSEIndiaDataFetcher(DataFetcher):
             # Small delay before request to avoid rate limiting
             time.sleep(0.5)
 
-            response = self.session.get(url, timeout=20, impersonate="chrome120")
+            response = self._get(url, timeout=20)
             response.raise_for_status()
 
             data = response.json()
@@ -159,7 +372,7 @@ class NSEIndiaDataFetcher(DataFetcher):
         symbol: str,
         start_date: datetime,
         end_date: datetime
-    ) -> List[IndexData]:
+    ) -> PriceSeries:
         """
         Fetch historical data from NSE India using production-grade API.
 
@@ -171,7 +384,7 @@ class NSEIndiaDataFetcher(DataFetcher):
             end_date: End date for historical data
 
         Returns:
-            List of IndexData objects
+            PriceSeries sorted by date (oldest first)
         """
         try:
             logger.info(f"Fetching NSE historical data for {symbol}")
@@ -181,32 +394,35 @@ class NSEIndiaDataFetcher(DataFetcher):
 
             if not historical_data:
                 logger.warning(f"No historical data available from NSE for {symbol}")
-                return []
+                return PriceSeries.empty(symbol)
 
-            # Convert NSE data format to IndexData objects
+            # Convert NSE data format to columns
             # NSE API format uses: EOD_TIMESTAMP, EOD_OPEN_INDEX_VAL, EOD_HIGH_INDEX_VAL, EOD_LOW_INDEX_VAL, EOD_CLOSE_INDEX_VAL
-            index_data_list = []
+            dates, opens, highs, lows, closes = [], [], [], [], []
             for item in historical_data:
                 try:
-                    index_data = IndexData(
-                        symbol=symbol,
-                        date=datetime.strptime(item['EOD_TIMESTAMP'], '%d-%b-%Y'),
-                        close=float(item['EOD_CLOSE_INDEX_VAL']),
-                        open=float(item['EOD_OPEN_INDEX_VAL']),
-                        high=float(item['EOD_HIGH_INDEX_VAL']),
-                        low=float(item['EOD_LOW_INDEX_VAL']),
-                        volume=None  # NSE historical indices API doesn't provide volume for indices
+                    row = (
+                        datetime.strptime(item['EOD_TIMESTAMP'], '%d-%b-%Y'),
+                        float(item['EOD_OPEN_INDEX_VAL']),
+                        float(item['EOD_HIGH_INDEX_VAL']),
+                        float(item['EOD_LOW_INDEX_VAL']),
+                        float(item['EOD_CLOSE_INDEX_VAL'])
                     )
-                    index_data_list.append(index_data)
                 except (KeyError, ValueError) as e:
                     logger.warning(f"Skipping invalid data point: {e}")
                     continue
 
-            # Sort by date (oldest first)
-            index_data_list.sort(key=lambda x: x.date)
+                dates.append(row[0])
+                opens.append(row[1])
+                highs.append(row[2])
+                lows.append(row[3])
+                closes.append(row[4])
+
+            # NSE historical indices API doesn't provide volume for indices
+            series = PriceSeries(symbol, dates, closes, open=opens, high=highs, low=lows).sorted()
 
-            logger.info(f"Fetched {len(index_data_list)} data points from NSE for {symbol}")
-            return index_data_list
+            logger.info(f"Fetched {len(series)} data points from NSE for {symbol}")
+            return series
 
         except Exception as e:
             logger.error(f"Error fetching NSE data for {symbol}: {e}")
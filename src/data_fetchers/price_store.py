@@ -0,0 +1,193 @@
+"""Local SQLite store for daily OHLC bars."""
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Tuple
+import numpy as np
+from ..models import PriceSeries
+
+logger = logging.getLogger(__name__)
+
+
+class PriceStore:
+    """
+    Persist daily index bars on disk, keyed by symbol and trading day.
+
+    Besides the bars themselves, the store tracks the date range that has
+    been requested from the upstream source for each symbol (its coverage),
+    so that weekends and holidays inside that range are not re-fetched.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bars (
+            symbol TEXT NOT NULL,
+            day TEXT NOT NULL,
+            ts TEXT NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL NOT NULL,
+            volume INTEGER,
+            PRIMARY KEY (symbol, day)
+        );
+        CREATE TABLE IF NOT EXISTS coverage (
+            symbol TEXT PRIMARY KEY,
+            start_day TEXT NOT NULL,
+            end_day TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = "data/prices.db"):
+        """
+        Initialize the price store.
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(self.SCHEMA)
+        logger.info(f"Price store ready at {self.path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection (one per operation keeps the store thread-safe)."""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_coverage(self, symbol: str) -> Optional[Tuple[date, date]]:
+        """
+        Get the date range already fetched for a symbol.
+
+        Args:
+            symbol: Index symbol
+
+        Returns:
+            Tuple of (start, end) dates, or None if nothing is stored
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT start_day, end_day FROM coverage WHERE symbol = ?",
+                (symbol,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return date.fromisoformat(row[0]), date.fromisoformat(row[1])
+
+    def last_bar_date(self, symbol: str) -> Optional[date]:
+        """
+        Get the date of the most recent stored bar for a symbol.
+
+        Args:
+            symbol: Index symbol
+
+        Returns:
+            Date of the latest bar, or None if no bars are stored
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT MAX(day) FROM bars WHERE symbol = ?",
+                (symbol,)
+            ).fetchone()
+
+        if row is None or row[0] is None:
+            return None
+        return date.fromisoformat(row[0])
+
+    def save(
+        self,
+        symbol: str,
+        data: PriceSeries,
+        start_date: datetime,
+        end_date: datetime
+    ) -> None:
+        """
+        Store bars and extend the symbol's coverage to include the fetched range.
+
+        Existing bars for the same day are replaced, so a partial intraday bar
+        is overwritten once the final close is available.
+
+        Args:
+            symbol: Index symbol
+            data: Bars returned by the upstream fetcher
+            start_date: Start of the range that was requested
+            end_date: End of the range that was requested
+        """
+        days = np.datetime_as_string(data.dates, unit='D').tolist()
+        timestamps = np.datetime_as_string(data.dates, unit='s').tolist()
+        rows = list(zip(
+            [symbol] * len(days),
+            days,
+            timestamps,
+            _nullable(data.open),
+            _nullable(data.high),
+            _nullable(data.low),
+            data.close.tolist(),
+            _nullable(data.volume)
+        ))
+
+        start_day = start_date.strftime('%Y-%m-%d')
+        end_day = end_date.strftime('%Y-%m-%d')
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars "
+                "(symbol, day, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute(
+                "INSERT INTO coverage (symbol, start_day, end_day) VALUES (?, ?, ?) "
+                "ON CONFLICT(symbol) DO UPDATE SET "
+                "start_day = MIN(start_day, excluded.start_day), "
+                "end_day = MAX(end_day, excluded.end_day)",
+                (symbol, start_day, end_day)
+            )
+
+        logger.debug(f"Stored {len(rows)} bars for {symbol} ({start_day} to {end_day})")
+
+    def load(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> PriceSeries:
+        """
+        Load stored bars for a symbol within a date range (inclusive).
+
+        Args:
+            symbol: Index symbol
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            PriceSeries sorted by date (oldest first)
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT ts, open, high, low, close, volume FROM bars "
+                "WHERE symbol = ? AND day >= ? AND day <= ? ORDER BY day",
+                (symbol, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+            ).fetchall()
+
+        if not rows:
+            return PriceSeries.empty(symbol)
+
+        ts, open_, high, low, close, volume = zip(*rows)
+        return PriceSeries(
+            symbol,
+            # Timestamps are naive local dates; drop any offset stored by older versions
+            np.array([value[:19] for value in ts], dtype='datetime64[s]'),
+            close,
+            open=open_,
+            high=high,
+            low=low,
+            volume=volume
+        )
+
+
+def _nullable(values: np.ndarray) -> list:
+    """Convert a float column to a list with None for NaN (stored as SQL NULL)."""
+    return [None if np.isnan(value) else value for value in values.tolist()]
@@ -1,10 +1,12 @@
 """Yahoo Finance data fetcher implementation."""
 import logging
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
 import yfinance as yf
 from .base import DataFetcher
-from ..models import IndexData
+from ..models import PriceSeries
 
 logger = logging.getLogger(__name__)
 
@@ -12,12 +14,55 @@ logger = logging.getLogger(__name__)
 class YahooFinanceDataFetcher(DataFetcher):
     """Fetch index data from Yahoo Finance."""
 
+    def _to_price_series(self, symbol: str, df: pd.DataFrame) -> PriceSeries:
+        """Convert a Yahoo Finance OHLCV frame to a PriceSeries."""
+        df = df.dropna(subset=['Close'])
+
+        # Keep exchange-local wall-clock dates
+        dates = df.index.tz_localize(None) if df.index.tz is not None else df.index
+
+        return PriceSeries(
+            symbol,
+            dates.values,
+            df['Close'].to_numpy(dtype=np.float64),
+            open=df['Open'].to_numpy(dtype=np.float64),
+            high=df['High'].to_numpy(dtype=np.float64),
+            low=df['Low'].to_numpy(dtype=np.float64),
+            volume=df['Volume'].to_numpy(dtype=np.float64) if 'Volume' in df else None
+        ).sorted()
+
+    @staticmethod
+    def _ticker_frame(df: pd.DataFrame, symbol: str, single: bool) -> Optional[pd.DataFrame]:
+        """
+        Select one ticker's OHLCV columns from a yf.download frame.
+
+        Depending on the yfinance version, a single-ticker download comes
+        back with plain OHLCV columns despite group_by='ticker', and the
+        ticker may be on either level of the column MultiIndex.
+
+        Args:
+            df: Frame returned by yf.download
+            symbol: Ticker to select
+            single: Whether the download was for this ticker alone
+
+        Returns:
+            Frame with Open/High/Low/Close(/Volume) columns, or None if the
+            ticker is missing from the download
+        """
+        if not isinstance(df.columns, pd.MultiIndex):
+            return df if single else None
+
+        for level in range(df.columns.nlevels):
+            if symbol in df.columns.get_level_values(level):
+                return df.xs(symbol, axis=1, level=level)
+        return None
+
     def fetch_historical_data(
         self,
         symbol: str,
         start_date: datetime,
         end_date: datetime
-    ) -> List[IndexData]:
+    ) -> PriceSeries:
         """
         Fetch historical data from Yahoo Finance.
 
@@ -27,7 +72,7 @@ class YahooFinanceDataFetcher(DataFetcher):
             end_date: End date for historical data
 
         Returns:
-            List of IndexData objects
+            PriceSeries sorted by date (oldest first)
         """
         try:
             logger.info(f"Fetching data for {symbol} from {start_date} to {end_date}")
@@ -37,24 +82,66 @@ class YahooFinanceDataFetcher(DataFetcher):
 
             if df.empty:
                 logger.warning(f"No data found for {symbol}")
-                return []
-
-            index_data_list = []
-            for date, row in df.iterrows():
-                index_data = IndexData(
-                    symbol=symbol,
-                    date=date.to_pydatetime(),
-                    close=float(row['Close']),
-                    open=float(row['Open']),
-                    high=float(row['High']),
-                    low=float(row['Low']),
-                    volume=int(row['Volume']) if 'Volume' in row else None
-                )
-                index_data_list.append(index_data)
-
-            logger.info(f"Fetched {len(index_data_list)} data points for {symbol}")
-            return index_data_list
+                return PriceSeries.empty(symbol)
+
+            series = self._to_price_series(symbol, df)
+
+            logger.info(f"Fetched {len(series)} data points for {symbol}")
+            return series
 
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {e}")
             raise
+
+    def fetch_many(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, PriceSeries]:
+        """
+        Fetch historical data for several symbols with a single download.
+
+        Args:
+            symbols: Index symbols to fetch
+            start_date: Start date for historical data
+            end_date: End date for historical data
+
+        Returns:
+            Dictionary mapping each symbol to its PriceSeries
+            (empty if Yahoo Finance returned nothing for that symbol)
+        """
+        try:
+            logger.info(f"Fetching data for {len(symbols)} symbols from {start_date} to {end_date}")
+
+            df = yf.download(
+                tickers=list(symbols),
+                start=start_date,
+                end=end_date,
+                group_by='ticker',
+                auto_adjust=True,
+                ignore_tz=False,
+                progress=False,
+                threads=True
+            )
+
+            results = {}
+            for symbol in symbols:
+                frame = None
+                if df is not None and not df.empty:
+                    frame = self._ticker_frame(df, symbol, single=len(symbols) == 1)
+
+                if frame is None or frame.dropna(how='all').empty:
+                    logger.warning(f"No data found for {symbol}")
+                    results[symbol] = PriceSeries.empty(symbol)
+                    continue
+
+                results[symbol] = self._to_price_series(symbol, frame)
+
+            fetched = sum(1 for data in results.values() if data)
+            logger.info(f"Fetched data for {fetched}/{len(symbols)} symbols in one request")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error fetching batch data for {symbols}: {e}")
+            raise
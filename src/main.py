@@ -1,13 +1,24 @@
 """Main application entry point."""
 import os
 import logging
-import schedule
+import signal
+import threading
 import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from .config import Settings, load_config
 from .alert_service import AlertService
-from .data_fetchers import FallbackDataFetcher
-from .notifiers import NtfyNotifier
+from .alert_triggers import TriggerStateStore
+from .data_fetchers import FallbackDataFetcher, CachedDataFetcher, PriceStore, NSEIndiaDataFetcher
+from .notifiers import (
+    CompositeNotifier,
+    EmailNotifier,
+    NtfyNotifier,
+    NotificationOutbox,
+    QueuedNotifier,
+    WebhookNotifier
+)
+from .scheduler import EventScheduler, MarketCalendar
 
 # Configure logging
 logging.basicConfig(
@@ -32,25 +43,131 @@ def main():
     config = load_config(config_path)
 
     # Initialize components with fallback data fetcher
-    data_fetcher = FallbackDataFetcher()
-    notifier = NtfyNotifier(
+    data_sources_config = config.get('data_sources', {})
+    breaker_config = data_sources_config.get('circuit_breaker', {})
+    cache_config = data_sources_config.get('cache', {})
+    price_store = None
+    if cache_config.get('enabled', False):
+        price_store = PriceStore(cache_config.get('path', 'data/prices.db'))
+
+    # With the cache enabled, history is served stale from it while all sources are down
+    data_fetcher = FallbackDataFetcher(
+        hedge_delay=data_sources_config.get('hedge_delay'),
+        failure_threshold=breaker_config.get('failure_threshold', 3),
+        cooldown=breaker_config.get('cooldown', 300),
+        nse_cookie_path=data_sources_config.get('nse_cookie_path'),
+        stale_store=price_store,
+        stale_max_age_days=data_sources_config.get('stale_max_age_days', 4)
+    )
+
+    # Serve history from the local price store, fetching only missing bars
+    if price_store is not None:
+        data_fetcher = CachedDataFetcher(fetcher=data_fetcher, store=price_store)
+    ntfy_config = config.get('ntfy', {})
+
+    # Record notifications on disk so undelivered ones survive a restart
+    outbox_config = ntfy_config.get('outbox', {})
+    outbox = None
+    if outbox_config.get('enabled', False):
+        outbox = NotificationOutbox(
+            path=outbox_config.get('path', 'data/outbox.db'),
+            retention_days=outbox_config.get('retention_days', 7),
+            pending_max_age_days=outbox_config.get('pending_max_age_days', 1)
+        )
+
+    ntfy_notifier = NtfyNotifier(
         ntfy_url=settings.ntfy_url,
         topic=settings.ntfy_topic,
-        priority=config.get('ntfy', {}).get('priority', 'high'),
-        critical_topic=config.get('ntfy', {}).get('critical_topic')
+        priority=ntfy_config.get('priority', 'high'),
+        critical_topic=ntfy_config.get('critical_topic'),
+        pool_size=ntfy_config.get('pool_size', 4),
+        retries=ntfy_config.get('retries', 2),
+        outbox=outbox
     )
+    # Deliver notifications in the background so checks don't wait on any channel
+    queue_config = ntfy_config.get('queue', {})
+    queued_notifiers = {}
+
+    def queued(name, channel):
+        """Wrap a channel in its own delivery queue when queueing is enabled."""
+        if not queue_config.get('enabled', False):
+            return channel
+        queued_notifiers[name] = QueuedNotifier(
+            channel,
+            workers=queue_config.get('workers', 2),
+            max_size=queue_config.get('max_size', 100),
+            max_attempts=queue_config.get('max_attempts', 5),
+            backoff_base=queue_config.get('backoff_base', 1.0),
+            backoff_max=queue_config.get('backoff_max', 60.0)
+        )
+        return queued_notifiers[name]
+
+    # Additional channels receive every notification alongside ntfy; each
+    # has its own queue, so a failing channel is retried without re-sending
+    # to the others
+    notifications_config = config.get('notifications', {})
+    channels = {'ntfy': queued('ntfy', ntfy_notifier)}
+
+    webhook_notifier = None
+    webhook_config = notifications_config.get('webhook', {})
+    if webhook_config.get('enabled', False):
+        webhook_notifier = WebhookNotifier(
+            url=webhook_config['url'],
+            headers=webhook_config.get('headers'),
+            timeout=webhook_config.get('timeout', 10)
+        )
+        channels['webhook'] = queued('webhook', webhook_notifier)
+
+    email_config = notifications_config.get('email', {})
+    if email_config.get('enabled', False):
+        channels['email'] = queued('email', EmailNotifier(
+            host=email_config.get('host', 'localhost'),
+            port=email_config.get('port', 25),
+            sender=email_config['sender'],
+            recipients=email_config['recipients'],
+            username=email_config.get('username'),
+            password=os.getenv(email_config.get('password_env', 'SMTP_PASSWORD')),
+            starttls=email_config.get('starttls', False),
+            timeout=email_config.get('timeout', 10)
+        ))
+
+    notifier = channels['ntfy']
+    if len(channels) > 1:
+        notifier = CompositeNotifier(channels, channel_timeout=notifications_config.get('channel_timeout', 15))
 
     # Create service
+    service_config = config.get('alert_service', {})
+    intraday_config = service_config.get('intraday', {})
+    intraday_interval = intraday_config.get('interval_seconds', 60)
+    prefetch_minutes = service_config.get('prefetch_minutes')
+
+    # Intraday polls and the prefetched close check read live prices from
+    # one NSE allIndices snapshot
+    live_fetcher = None
+    if intraday_config.get('enabled', False) or prefetch_minutes:
+        live_fetcher = NSEIndiaDataFetcher(
+            snapshot_ttl=min(60.0, intraday_interval),
+            cookie_path=data_sources_config.get('nse_cookie_path')
+        )
+
     alert_service = AlertService(
         data_fetcher=data_fetcher,
-        notifier=notifier
+        notifier=notifier,
+        max_workers=service_config.get('max_workers', 1),
+        index_timeout=service_config.get('index_timeout'),
+        trigger_state=(
+            TriggerStateStore(service_config['trigger_state_path'])
+            if service_config.get('trigger_state_path') else None
+        ),
+        live_fetcher=live_fetcher,
+        digest=service_config.get('digest', False)
     )
 
     # Define the job
     def job():
         """Job to run alert check."""
         try:
-            alert_service.run_check(config)
+            alert_service.run_check(config, scheduler.now())
         except Exception as e:
             logger.error(f"Error during alert check: {e}", exc_info=True)
             # Send error notification
@@ -62,24 +179,72 @@ def main():
             except Exception as notify_error:
                 logger.error(f"Failed to send error notification: {notify_error}")
 
-    # Schedule the job
-    check_time = config.get('alert_service', {}).get('check_time', settings.alert_check_time)
-    schedule.every().day.at(check_time).do(job)
+    # Schedule jobs on NSE trading days in the configured timezone
+    scheduler = EventScheduler(
+        timezone=service_config.get('timezone', settings.timezone),
+        calendar=MarketCalendar.from_yaml(service_config.get('holiday_calendar', 'config/nse_holidays.yaml'))
+    )
+
+    check_time = service_config.get('check_time', settings.alert_check_time)
+    scheduler.every_day_at("daily check", check_time, job)
+
+    # Warm history ahead of the check so it only fetches today's bar
+    if prefetch_minutes:
+        prefetch_time = datetime.strptime(check_time, '%H:%M') - timedelta(minutes=prefetch_minutes)
+        scheduler.every_day_at(
+            "history prefetch",
+            prefetch_time.strftime('%H:%M'),
+            lambda: alert_service.prefetch_history(config, scheduler.now())
+        )
+
+    if intraday_config.get('enabled', False):
+        def intraday_job():
+            """Job to poll live prices during market hours."""
+            alert_service.run_intraday_poll(config, scheduler.now())
+
+        scheduler.every(
+            "intraday poll",
+            intraday_interval,
+            intraday_job,
+            start=intraday_config.get('market_open', '09:15'),
+            end=intraday_config.get('market_close', '15:30')
+        )
 
-    logger.info(f"Scheduled daily check at {check_time}")
     logger.info("Service is running. Press Ctrl+C to stop.")
 
-    # Run immediately on startup for testing
-    logger.info("Running initial check on startup...")
-    job()
+    # Send what a previous run left undelivered, without holding up startup
+    if outbox is not None:
+        threading.Thread(target=ntfy_notifier.replay_outbox, name="outbox-replay", daemon=True).start()
+
+    # Stop on SIGTERM (e.g. docker stop) as on Ctrl+C, so queued notifications are drained below
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+
+    # Run immediately on startup for testing, but not on weekends or holidays
+    if scheduler.calendar.is_trading_day(scheduler.now().date()):
+        logger.info("Running initial check on startup...")
+        job()
+    else:
+        logger.info("Market closed today, skipping initial check on startup")
 
     # Keep the service running
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        scheduler.run_forever()
     except KeyboardInterrupt:
         logger.info("Service stopped by user")
+    else:
+        logger.info("Service stopped")
+    finally:
+        # Drain the queues before closing the channels they deliver to
+        deadline = time.monotonic() + queue_config.get('shutdown_timeout', 30)
+        for name, queued_notifier in queued_notifiers.items():
+            logger.info(f"Waiting for queued {name} notifications...")
+            queued_notifier.close(timeout=max(0.0, deadline - time.monotonic()))
+            logger.info(f"{name} delivery stats: {queued_notifier.stats()}")
+        if isinstance(notifier, CompositeNotifier):
+            notifier.close()
+        ntfy_notifier.close()
+        if webhook_notifier is not None:
+            webhook_notifier.close()
 
 
 if __name__ == "__main__":
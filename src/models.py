@@ -1,6 +1,7 @@
 """Data models for the alerting service."""
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, List, Optional
+import numpy as np
 from pydantic import BaseModel
 
 
@@ -27,3 +28,211 @@ class Alert(BaseModel):
     timestamp: datetime
     trigger_type: str
     threshold: Optional[float] = None  # Threshold that triggered this alert
+    stale: bool = False  # Evaluated on cached history while data sources were down
+
+
+class PriceSeries:
+    """
+    Columnar daily price history for a single symbol.
+
+    Dates are stored as naive local exchange timestamps (datetime64[s]) and
+    OHLC values as float64 arrays (NaN where a source does not provide a
+    field). Indexing with an integer returns an IndexData view of that bar;
+    slicing returns a new PriceSeries, so code written against
+    List[IndexData] keeps working.
+
+    A series served from the local cache because no data source answered
+    is marked stale; the flag is kept by slicing and merging.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        dates,
+        close,
+        open=None,
+        high=None,
+        low=None,
+        volume=None
+    ):
+        """
+        Initialize price series.
+
+        Args:
+            symbol: Index symbol
+            dates: Bar dates (datetime-like, naive or tz-aware)
+            close: Closing prices
+            open: Opening prices (optional)
+            high: High prices (optional)
+            low: Low prices (optional)
+            volume: Volumes (optional)
+        """
+        self.symbol = symbol
+        self.dates = _to_datetime64(dates)
+        self.close = np.asarray(close, dtype=np.float64)
+
+        size = len(self.dates)
+        self.open = _optional_column(open, size)
+        self.high = _optional_column(high, size)
+        self.low = _optional_column(low, size)
+        self.volume = _optional_column(volume, size)
+        self.stale = False
+
+    @classmethod
+    def empty(cls, symbol: str) -> "PriceSeries":
+        """Create a series with no bars."""
+        return cls(symbol, [], [])
+
+    @classmethod
+    def from_records(cls, symbol: str, records: List[IndexData]) -> "PriceSeries":
+        """
+        Build a series from IndexData objects.
+
+        Args:
+            symbol: Index symbol
+            records: IndexData objects (any order)
+
+        Returns:
+            PriceSeries sorted by date (oldest first)
+        """
+        return cls(
+            symbol,
+            [record.date for record in records],
+            [record.close for record in records],
+            open=[record.open for record in records],
+            high=[record.high for record in records],
+            low=[record.low for record in records],
+            volume=[record.volume for record in records]
+        ).sorted()
+
+    def to_records(self) -> List[IndexData]:
+        """Materialize every bar as an IndexData object."""
+        return [self[i] for i in range(len(self))]
+
+    def sorted(self) -> "PriceSeries":
+        """Return the series ordered by date (oldest first), keeping the last bar per date."""
+        if len(self.dates) < 2 or np.all(self.dates[1:] > self.dates[:-1]):
+            return self
+
+        order = np.argsort(self.dates, kind='stable')
+        dates = self.dates[order]
+        # Keep the last occurrence of duplicate dates
+        keep = np.append(dates[1:] != dates[:-1], True)
+        return self._take(order[keep])
+
+    def merge(self, other: "PriceSeries") -> "PriceSeries":
+        """
+        Combine two series; bars in other replace bars on the same date.
+
+        Args:
+            other: Series with newer or additional bars
+
+        Returns:
+            Merged PriceSeries sorted by date
+        """
+        merged = PriceSeries(
+            self.symbol,
+            np.concatenate([self.dates, other.dates]),
+            np.concatenate([self.close, other.close]),
+            open=np.concatenate([self.open, other.open]),
+            high=np.concatenate([self.high, other.high]),
+            low=np.concatenate([self.low, other.low]),
+            volume=np.concatenate([self.volume, other.volume])
+        ).sorted()
+        merged.stale = self.stale or other.stale
+        return merged
+
+    def _take(self, index) -> "PriceSeries":
+        taken = PriceSeries(
+            self.symbol,
+            self.dates[index],
+            self.close[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            volume=self.volume[index]
+        )
+        taken.stale = self.stale
+        return taken
+
+    def date_at(self, position: int) -> datetime:
+        """Get the date of a bar as a datetime."""
+        return self.dates[position].item()
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __iter__(self) -> Iterator[IndexData]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._take(key)
+
+        return IndexData(
+            symbol=self.symbol,
+            date=self.date_at(key),
+            close=float(self.close[key]),
+            open=_optional_float(self.open[key]),
+            high=_optional_float(self.high[key]),
+            low=_optional_float(self.low[key]),
+            volume=None if np.isnan(self.volume[key]) else int(self.volume[key])
+        )
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"PriceSeries({self.symbol!r}, empty)"
+        return (
+            f"PriceSeries({self.symbol!r}, {len(self)} bars, "
+            f"{self.dates[0].astype('datetime64[D]')} to {self.dates[-1].astype('datetime64[D]')})"
+        )
+
+
+def stack_closes(series_list: List[PriceSeries], depth: int) -> np.ndarray:
+    """
+    Stack the latest closes of several series into a (series x depth) matrix.
+
+    Rows are right-aligned on each series' own latest bar, so column -1 is
+    "today" for every row; rows shorter than depth are NaN-padded on the left.
+
+    Args:
+        series_list: Price series (sorted by date)
+        depth: Number of most recent bars to keep per series
+
+    Returns:
+        float64 matrix of closes
+    """
+    matrix = np.full((len(series_list), depth), np.nan)
+    for row, series in enumerate(series_list):
+        closes = series.close[-depth:]
+        if len(closes):
+            matrix[row, depth - len(closes):] = closes
+    return matrix
+
+
+def _to_datetime64(dates) -> np.ndarray:
+    """Convert dates to naive datetime64[s], keeping local wall-clock time for tz-aware values."""
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+        return dates.astype('datetime64[s]')
+
+    return np.array(
+        [
+            np.datetime64(d.replace(tzinfo=None) if getattr(d, 'tzinfo', None) else d, 's')
+            for d in dates
+        ],
+        dtype='datetime64[s]'
+    )
+
+
+def _optional_column(values, size: int) -> np.ndarray:
+    """Convert an optional column to float64, using NaN for missing values."""
+    if values is None:
+        return np.full(size, np.nan)
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64)
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _optional_float(value) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
@@ -1,5 +1,18 @@
 """Notifiers package."""
 from .base import Notifier
 from .ntfy_notifier import NtfyNotifier
+from .webhook_notifier import WebhookNotifier
+from .email_notifier import EmailNotifier
+from .composite_notifier import CompositeNotifier
+from .outbox import NotificationOutbox
+from .queued_notifier import QueuedNotifier
 
-__all__ = ["Notifier", "NtfyNotifier"]
+__all__ = [
+    "Notifier",
+    "NtfyNotifier",
+    "WebhookNotifier",
+    "EmailNotifier",
+    "CompositeNotifier",
+    "NotificationOutbox",
+    "QueuedNotifier",
+]
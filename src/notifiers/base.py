@@ -1,5 +1,6 @@
 """Base class for notifiers."""
 from abc import ABC, abstractmethod
+from typing import List, Tuple
 from ..models import Alert
 
 
@@ -18,3 +19,24 @@ class Notifier(ABC):
             True if notification sent successfully, False otherwise
         """
         pass
+
+    def send_digest(self, alerts: List[Alert], errors: List[Tuple[str, str]]) -> bool:
+        """
+        Send all alerts and errors of a run.
+
+        Notifiers that can coalesce messages override this; the default
+        sends every error and alert on its own.
+
+        Args:
+            alerts: Alerts of the run
+            errors: (title, message) pairs of the run's errors
+
+        Returns:
+            True if every notification was sent successfully, False otherwise
+        """
+        success = True
+        for title, message in errors:
+            success = self.send_error(title, message) and success
+        for alert in alerts:
+            success = self.send_alert(alert) and success
+        return success
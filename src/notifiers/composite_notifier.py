@@ -0,0 +1,95 @@
+"""Notifier that delivers to several channels at once."""
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Tuple
+from .base import Notifier
+from ..models import Alert
+
+logger = logging.getLogger(__name__)
+
+
+class CompositeNotifier(Notifier):
+    """
+    Dispatch every notification to all channels concurrently.
+
+    Each call waits at most channel_timeout seconds; a channel that has not
+    finished by then is reported as failed and left to finish in the
+    background, so one slow channel cannot hold up the others.
+    """
+
+    def __init__(self, channels: Dict[str, Notifier], channel_timeout: float = 15.0):
+        """
+        Initialize composite notifier.
+
+        Args:
+            channels: Notifiers keyed by channel name (e.g. "ntfy", "email")
+            channel_timeout: Seconds to wait for each channel per notification
+        """
+        self.channels = dict(channels)
+        self.channel_timeout = channel_timeout
+        # Headroom for channels still stuck in earlier, timed-out calls
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, 2 * len(self.channels)),
+            thread_name_prefix="channel"
+        )
+        logger.info(f"Initialized CompositeNotifier with channels: {', '.join(self.channels)}")
+
+    def dispatch(self, method: str, *args) -> Dict[str, bool]:
+        """
+        Call a send method on every channel concurrently.
+
+        Args:
+            method: Name of the send method (e.g. "send_alert")
+            *args: Arguments for the send method
+
+        Returns:
+            Dictionary mapping channel name to whether it succeeded in time
+        """
+        futures = {
+            self._executor.submit(getattr(channel, method), *args): name
+            for name, channel in self.channels.items()
+        }
+        done, _ = wait(futures, timeout=self.channel_timeout)
+
+        results = {}
+        for future, name in futures.items():
+            if future not in done:
+                logger.error(f"{name} {method} timed out after {self.channel_timeout}s")
+                results[name] = False
+                continue
+
+            try:
+                results[name] = bool(future.result())
+            except Exception as e:
+                logger.error(f"{name} {method} failed: {e}")
+                results[name] = False
+
+        return results
+
+    def send_alert(self, alert: Alert) -> bool:
+        """
+        Send an alert to all channels.
+
+        Args:
+            alert: Alert object to send
+
+        Returns:
+            True if every channel sent it successfully, False otherwise
+        """
+        return all(self.dispatch('send_alert', alert).values())
+
+    def send_status(self, title: str, message: str) -> bool:
+        """Send a status/info message to all channels."""
+        return all(self.dispatch('send_status', title, message).values())
+
+    def send_error(self, title: str, message: str) -> bool:
+        """Send an error notification to all channels."""
+        return all(self.dispatch('send_error', title, message).values())
+
+    def send_digest(self, alerts: List[Alert], errors: List[Tuple[str, str]]) -> bool:
+        """Send a digest of a run's alerts and errors to all channels."""
+        return all(self.dispatch('send_digest', alerts, errors).values())
+
+    def close(self) -> None:
+        """Stop dispatching; channels are closed by their owner."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,104 @@
+"""SMTP email notifier implementation."""
+import logging
+import smtplib
+from email.message import EmailMessage
+from typing import List, Optional, Tuple
+from .base import Notifier
+from ..models import Alert
+
+logger = logging.getLogger(__name__)
+
+
+class EmailNotifier(Notifier):
+    """Send notifications as plain-text emails over SMTP."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        recipients: List[str],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = 10
+    ):
+        """
+        Initialize email notifier.
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            sender: From address
+            recipients: To addresses
+            username: SMTP login user (None = no login)
+            password: SMTP login password
+            starttls: Upgrade the connection with STARTTLS before logging in
+            timeout: Seconds to wait for the SMTP server
+        """
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _send(self, subject: str, body: str) -> bool:
+        """Send one email, logging the outcome instead of raising."""
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content(body)
+
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                if self.starttls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password or "")
+                smtp.send_message(message)
+            logger.info(f"Email '{subject}' sent to {len(self.recipients)} recipient(s)")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email '{subject}': {e}")
+            return False
+
+    def send_alert(self, alert: Alert) -> bool:
+        """
+        Send an alert by email.
+
+        Args:
+            alert: Alert object to send
+
+        Returns:
+            True if notification sent successfully, False otherwise
+        """
+        prefix = "BUYING OPPORTUNITY" if alert.percentage_change < 0 else "Price Gain"
+        body = alert.message
+        if alert.threshold:
+            body += f"\n\nAlert Threshold: {alert.threshold}%"
+        if alert.stale:
+            body += "\n\nNote: data sources unavailable, evaluated on cached prices"
+        return self._send(f"{prefix}: {alert.index_name}", body)
+
+    def send_status(self, title: str, message: str) -> bool:
+        """Send a status/info message by email."""
+        return self._send(title, message)
+
+    def send_error(self, title: str, message: str) -> bool:
+        """Send an error notification by email."""
+        return self._send(title, message)
+
+    def send_digest(self, alerts: List[Alert], errors: List[Tuple[str, str]]) -> bool:
+        """Send all alerts and errors of a run as one email."""
+        lines = [f"ERROR {title}: {message}" for title, message in errors]
+        lines += [
+            f"{'↓' if alert.percentage_change < 0 else '↑'} {alert.message}"
+            + (" [stale data]" if alert.stale else "")
+            for alert in alerts
+        ]
+        subject = f"NIFTY Alerter - {len(alerts)} alert(s)" + (f", {len(errors)} error(s)" if errors else "")
+        return self._send(subject, "\n".join(lines))
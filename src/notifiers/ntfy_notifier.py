@@ -1,16 +1,60 @@
 """Ntfy notifier implementation."""
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 from .base import Notifier
+from .outbox import NotificationOutbox, idempotency_key
 from ..models import Alert
 
 logger = logging.getLogger(__name__)
 
 
 class NtfyNotifier(Notifier):
-    """Send notifications using ntfy."""
-
-    def __init__(self, ntfy_url: str, topic: str, priority: str = "high", critical_topic: str = None):
+    """
+    Send notifications using ntfy.
+
+    All messages go through one pooled keep-alive session, so consecutive
+    notifications reuse the connection (and TLS session) to the server.
+    A message for several topics (an alert for the main and critical
+    topics, a digest) is posted to all of them concurrently.
+
+    With an outbox, every message is recorded before it is posted and
+    marked once the server accepts it. A message is identified by its
+    topic, title, body and day (the alert's date), so re-sending it (a retry, or the same
+    alert from a re-run check) posts only what was not delivered yet;
+    replay_outbox() sends what a previous process left undelivered.
+
+    A post that reached the server but got no reply within timeout may have
+    been published, so it is counted as sent (and logged) rather than
+    posted again. publish_alert() and publish_digest() report success per
+    topic (digest part) and can re-send just the ones that failed.
+    """
+
+    # Response statuses that are retried: the server turned the request away
+    # without processing it, so re-posting cannot publish a message twice
+    RETRY_STATUSES = (429, 503)
+
+    # ntfy turns longer message bodies into attachments
+    MAX_MESSAGE_BYTES = 4096
+
+    def __init__(
+        self,
+        ntfy_url: str,
+        topic: str,
+        priority: str = "high",
+        critical_topic: str = None,
+        pool_size: int = 4,
+        retries: int = 2,
+        timeout: float = 10,
+        max_message_bytes: int = MAX_MESSAGE_BYTES,
+        outbox: Optional[NotificationOutbox] = None
+    ):
         """
         Initialize ntfy notifier.
 
@@ -19,11 +63,138 @@ class NtfyNotifier(Notifier):
             topic: Topic to publish all alerts to
             priority: Priority level (default: high)
             critical_topic: Topic for critical drop alerts only (optional)
+            pool_size: Keep-alive connections kept open to the server
+            retries: Retries for failed connections and retryable statuses
+                (a request that was sent but not answered is never retried)
+            timeout: Seconds to wait for the server per request
+            max_message_bytes: Size cap of a digest message; longer digests
+                are split into several messages
+            outbox: Durable record of sent messages (None = send without one)
         """
         self.ntfy_url = ntfy_url.rstrip('/')
         self.topic = topic
         self.critical_topic = critical_topic
         self.priority = priority
+        self.timeout = timeout
+        self.max_message_bytes = max_message_bytes
+        self.outbox = outbox
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            other=0,
+            backoff_factor=0.5,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, pool_size), thread_name_prefix="ntfy")
+
+    def _post(self, topic: str, message: str, headers: dict, day: Optional[date] = None) -> str:
+        """
+        Publish a message to a topic over the pooled session.
+
+        With an outbox, a message already delivered for the same day (or
+        being sent by another thread) is not posted again.
+
+        Args:
+            topic: Topic to publish to
+            message: Message body
+            headers: ntfy headers (Title, Priority, Tags)
+            day: Day the message is about, e.g. the alert's date (None = today)
+
+        Returns:
+            URL the message was published to
+
+        Raises:
+            requests.RequestException: If the request fails after retries
+        """
+        if self.outbox is None:
+            return self._request(topic, message, headers)
+
+        key = idempotency_key(topic, headers.get("Title"), message, day or date.today())
+        return self._deliver(key, topic, message, headers)
+
+    def _deliver(self, key: str, topic: str, message: str, headers: dict) -> str:
+        """Post a message recorded in the outbox under key, marking it on success."""
+        if not self.outbox.claim(key, topic, message, headers):
+            logger.info(f"Skipping '{headers.get('Title')}' to {topic}: already sent")
+            return f"{self.ntfy_url}/{topic}"
+
+        try:
+            url = self._request(topic, message, headers)
+        except Exception:
+            self.outbox.release(key)
+            raise
+
+        self.outbox.ack(key)
+        return url
+
+    def _request(self, topic: str, message: str, headers: dict) -> str:
+        url = f"{self.ntfy_url}/{topic}"
+        try:
+            response = self.session.post(
+                url,
+                data=message.encode('utf-8'),
+                headers=headers,
+                timeout=self.timeout
+            )
+        except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError) as e:
+            if not self._no_reply(e):
+                raise
+            # The server has the message and may have published it, so it is
+            # not posted again (by a caller or the queue) to avoid a duplicate
+            logger.warning(f"No reply from {url} within {self.timeout}s, counting '{headers.get('Title')}' as sent")
+            return url
+        response.raise_for_status()
+        return url
+
+    @staticmethod
+    def _no_reply(error: requests.RequestException) -> bool:
+        """Whether a request was sent but timed out waiting for the response."""
+        if isinstance(error, requests.exceptions.ReadTimeout):
+            return True
+        # With read retries disabled, urllib3 reports a read timeout as
+        # MaxRetryError, which requests wraps in a ConnectionError
+        cause = error.args[0] if error.args else None
+        return isinstance(getattr(cause, 'reason', None), ReadTimeoutError)
+
+    def replay_outbox(self) -> int:
+        """
+        Send the outbox messages that were never delivered.
+
+        Returns:
+            Number of messages delivered
+        """
+        if self.outbox is None:
+            return 0
+
+        pending = self.outbox.pending()
+        if pending:
+            logger.info(f"Replaying {len(pending)} undelivered notification(s)")
+
+        delivered = 0
+        for key, topic, message, headers in pending:
+            try:
+                self._deliver(key, topic, message, headers)
+                delivered += 1
+            except Exception as e:
+                logger.error(f"Failed to replay '{headers.get('Title')}' to {topic}: {e}")
+        return delivered
+
+    def close(self) -> None:
+        """Close the pooled connections and the outbox."""
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        if self.outbox is not None:
+            self.outbox.close()
 
     def send_alert(self, alert: Alert) -> bool:
         """
@@ -37,9 +208,40 @@ class NtfyNotifier(Notifier):
             alert: Alert object to send
 
         Returns:
-            True if notification sent successfully, False otherwise
+            True if notification sent successfully to every topic, False otherwise
+        """
+        return all(self.publish_alert(alert).values())
+
+    def publish_alert(self, alert: Alert, only: Optional[Collection[str]] = None) -> Dict[str, bool]:
+        """
+        Post an alert to all of its topics concurrently.
+
+        Args:
+            alert: Alert object to send
+            only: Topics to post to, e.g. the ones that failed on a previous
+                attempt (None = all of the alert's topics)
+
+        Returns:
+            Dictionary mapping each topic posted to to whether it succeeded
+        """
+        posts = self._alert_posts(alert)
+        day = alert.timestamp.date()
+        return self._fan_out({
+            topic: partial(self._publish, topic, message, headers, day)
+            for topic, (message, headers) in posts.items()
+            if only is None or topic in only
+        })
+
+    def _alert_posts(self, alert: Alert) -> Dict[str, Tuple[str, dict]]:
+        """
+        Build the message of an alert for each topic it goes to.
+
+        Args:
+            alert: Alert object to send
+
+        Returns:
+            Dictionary mapping topic to (message body, headers)
         """
-        success = True
         is_drop = alert.percentage_change < 0
 
         # Determine tags and priority based on whether it's a drop or gain
@@ -54,80 +256,192 @@ class NtfyNotifier(Notifier):
         message_body = alert.message
         if alert.threshold:
             message_body += f"\n\nAlert Threshold: {alert.threshold}%"
+        if alert.stale:
+            message_body += "\n\nNote: data sources unavailable, evaluated on cached prices"
 
         # Always send to main topic
-        try:
-            url = f"{self.ntfy_url}/{self.topic}"
-
-            headers = {
+        posts = {
+            self.topic: (message_body, {
                 "Title": f"{title_prefix}: {alert.index_name}",
                 "Priority": self.priority if is_drop else "default",
                 "Tags": tags
-            }
-
-            response = requests.post(
-                url,
-                data=message_body.encode('utf-8'),
-                headers=headers,
-                timeout=10
-            )
-
-            response.raise_for_status()
-            logger.info(f"Alert sent successfully to {url} (main topic)")
-
-        except Exception as e:
-            logger.error(f"Failed to send alert to main topic via ntfy: {e}")
-            success = False
+            })
+        }
 
         # Send to critical topic only if it's a drop AND
         # the drop magnitude meets/exceeds the alert threshold.
         # This ensures 'niftyyy' only gets true buying opportunities.
         if is_drop and self.critical_topic:
-            meets_threshold = False
-            try:
-                if alert.threshold is not None:
-                    meets_threshold = abs(alert.percentage_change) >= float(alert.threshold)
-            except Exception:
-                meets_threshold = False
-
-            if not meets_threshold:
+            if not self._is_critical(alert):
                 logger.info(
                     "Skipping critical topic: drop %.2f%% below threshold %.2f%%",
                     abs(alert.percentage_change),
                     alert.threshold if alert.threshold is not None else float('nan')
                 )
-                return success
+                return posts
 
-            try:
-                critical_url = f"{self.ntfy_url}/{self.critical_topic}"
+            logger.info(
+                "Sending to critical topic: drop %.2f%% >= threshold %.2f%%",
+                abs(alert.percentage_change),
+                alert.threshold if alert.threshold is not None else float('nan')
+            )
+            posts[self.critical_topic] = (message_body, {
+                "Title": f"CRITICAL: {alert.index_name} Buying Opportunity",  # Removed emoji from header
+                "Priority": "urgent",  # Higher priority for critical drops
+                "Tags": "rotating_light,money_with_wings,chart_with_downwards_trend"
+            })
 
-                headers = {
-                    "Title": f"CRITICAL: {alert.index_name} Buying Opportunity",  # Removed emoji from header
-                    "Priority": "urgent",  # Higher priority for critical drops
-                    "Tags": "rotating_light,money_with_wings,chart_with_downwards_trend"
-                }
+        return posts
 
-                logger.info(
-                    "Sending to critical topic: drop %.2f%% >= threshold %.2f%%",
-                    abs(alert.percentage_change),
-                    alert.threshold if alert.threshold is not None else float('nan')
-                )
+    def _publish(self, topic: str, message: str, headers: dict, day: Optional[date] = None) -> bool:
+        """Post one message, logging the outcome instead of raising."""
+        try:
+            url = self._post(topic, message, headers, day)
+            logger.info(f"'{headers.get('Title')}' sent successfully to {url}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send '{headers.get('Title')}' to {topic} via ntfy: {e}")
+            return False
 
-                response = requests.post(
-                    critical_url,
-                    data=message_body.encode('utf-8'),  # Use message_body with threshold
-                    headers=headers,
-                    timeout=10
-                )
+    def _fan_out(self, posts: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Run the posts of several topics concurrently.
+
+        Args:
+            posts: Dictionary mapping topic to a function posting to it
+
+        Returns:
+            Dictionary mapping topic to the post's result
+        """
+        if len(posts) <= 1:
+            return {topic: post() for topic, post in posts.items()}
+
+        futures = {topic: self._executor.submit(post) for topic, post in posts.items()}
+        return {topic: future.result() for topic, future in futures.items()}
+
+    @staticmethod
+    def _is_critical(alert: Alert) -> bool:
+        """Check whether an alert is a drop that meets or exceeds its threshold."""
+        if alert.percentage_change >= 0 or alert.threshold is None:
+            return False
+        try:
+            return abs(alert.percentage_change) >= float(alert.threshold)
+        except (TypeError, ValueError):
+            return False
+
+    def send_digest(self, alerts: List[Alert], errors: List[Tuple[str, str]]) -> bool:
+        """
+        Send all alerts and errors of a run as one summary per topic.
+
+        The main topic gets every error and alert; the critical topic (if
+        configured) gets the drops that meet their threshold. Topics are
+        posted to concurrently; a summary longer than max_message_bytes is
+        split into numbered parts, posted in order.
+
+        Args:
+            alerts: Alerts of the run
+            errors: (title, message) pairs of the run's errors
+
+        Returns:
+            True if every message was sent successfully, False otherwise
+        """
+        return all(self.publish_digest(alerts, errors).values())
+
+    def publish_digest(
+        self,
+        alerts: List[Alert],
+        errors: List[Tuple[str, str]],
+        only: Optional[Collection[Tuple[str, int]]] = None
+    ) -> Dict[Tuple[str, int], bool]:
+        """
+        Post the digest of a run to its topics concurrently (see send_digest).
 
-                response.raise_for_status()
-                logger.info(f"Critical alert sent successfully to {critical_url}")
+        Args:
+            alerts: Alerts of the run
+            errors: (title, message) pairs of the run's errors
+            only: (topic, part number) pairs to post, e.g. the ones that
+                failed on a previous attempt (None = every part)
+
+        Returns:
+            Dictionary mapping each (topic, part number) posted to whether
+            it succeeded
+        """
+        critical = [alert for alert in alerts if self._is_critical(alert)]
+        drops = sum(1 for alert in alerts if alert.percentage_change < 0)
+        day = max((alert.timestamp.date() for alert in alerts), default=None)
+
+        counts = [f"{len(alerts)} alert(s)"]
+        if errors:
+            counts.append(f"{len(errors)} error(s)")
+        lines = [f"ERROR {title}: {message}" for title, message in errors]
+        lines += [self._digest_line(alert) for alert in alerts]
+
+        digests = {
+            self.topic: (
+                f"NIFTY Alerter - {', '.join(counts)}",
+                lines,
+                {
+                    "Priority": self.priority if drops or errors else "default",
+                    "Tags": "chart_with_downwards_trend,warning" if drops else "chart_with_upwards_trend,white_check_mark"
+                }
+            )
+        }
+
+        if critical and self.critical_topic:
+            digests[self.critical_topic] = (
+                f"CRITICAL: {len(critical)} Buying Opportunit{'y' if len(critical) == 1 else 'ies'}",
+                [self._digest_line(alert) for alert in critical],
+                {
+                    "Priority": "urgent",
+                    "Tags": "rotating_light,money_with_wings,chart_with_downwards_trend"
+                }
+            )
 
+        posts = {
+            topic: partial(self._post_digest, topic, title, topic_lines, headers, day, only)
+            for topic, (title, topic_lines, headers) in digests.items()
+            if only is None or any(part_topic == topic for part_topic, _ in only)
+        }
+        results = {}
+        for topic_results in self._fan_out(posts).values():
+            results.update(topic_results)
+        return results
+
+    def _digest_line(self, alert: Alert) -> str:
+        """Render an alert as a single digest line."""
+        line = f"{'↓' if alert.percentage_change < 0 else '↑'} {alert.message}"
+        if self._is_critical(alert):
+            line += f" [threshold {alert.threshold}%]"
+        if alert.stale:
+            line += " [stale data]"
+        return line
+
+    def _post_digest(
+        self,
+        topic: str,
+        title: str,
+        lines: List[str],
+        headers: dict,
+        day: Optional[date] = None,
+        only: Optional[Collection[Tuple[str, int]]] = None
+    ) -> Dict[Tuple[str, int], bool]:
+        """Post digest lines to a topic, split into parts of at most max_message_bytes."""
+        parts = _split_lines(lines, self.max_message_bytes)
+        results = {}
+
+        for number, part in enumerate(parts, start=1):
+            if only is not None and (topic, number) not in only:
+                continue
+            part_title = title if len(parts) == 1 else f"{title} ({number}/{len(parts)})"
+            try:
+                url = self._post(topic, part, dict(headers, Title=part_title), day)
+                logger.info(f"Digest part {number}/{len(parts)} sent successfully to {url}")
+                results[(topic, number)] = True
             except Exception as e:
-                logger.error(f"Failed to send critical alert via ntfy: {e}")
-                success = False
+                logger.error(f"Failed to send digest part {number}/{len(parts)} via ntfy: {e}")
+                results[(topic, number)] = False
 
-        return success
+        return results
 
     def send_status(self, title: str, message: str) -> bool:
         """
@@ -141,22 +455,13 @@ class NtfyNotifier(Notifier):
             True if notification sent successfully, False otherwise
         """
         try:
-            url = f"{self.ntfy_url}/{self.topic}"
-
             headers = {
                 "Title": title,
                 "Priority": "default",
                 "Tags": "white_check_mark,information_source"
             }
 
-            response = requests.post(
-                url,
-                data=message.encode('utf-8'),
-                headers=headers,
-                timeout=10
-            )
-
-            response.raise_for_status()
+            url = self._post(self.topic, message, headers)
             logger.info(f"Status message sent successfully to {url}")
             return True
 
@@ -176,25 +481,54 @@ class NtfyNotifier(Notifier):
             True if notification sent successfully, False otherwise
         """
         try:
-            url = f"{self.ntfy_url}/{self.topic}"
-
             headers = {
                 "Title": title,
                 "Priority": "high",
                 "Tags": "x,rotating_light"
             }
 
-            response = requests.post(
-                url,
-                data=message.encode('utf-8'),
-                headers=headers,
-                timeout=10
-            )
-
-            response.raise_for_status()
+            url = self._post(self.topic, message, headers)
             logger.info(f"Error notification sent successfully to {url}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to send error notification via ntfy: {e}")
             return False
+
+
+def _split_lines(lines: List[str], max_bytes: int) -> List[str]:
+    """
+    Join lines into messages of at most max_bytes (UTF-8), never splitting a line.
+
+    A single line longer than max_bytes is truncated.
+
+    Args:
+        lines: Lines to join
+        max_bytes: Size cap of each message
+
+    Returns:
+        Messages, in order (at least one)
+    """
+    messages = []
+    current = []
+    size = 0
+
+    for line in lines:
+        encoded = line.encode('utf-8')
+        if len(encoded) > max_bytes:
+            line = encoded[:max_bytes - 3].decode('utf-8', errors='ignore') + "..."
+            encoded = line.encode('utf-8')
+
+        # Lines after the first in a message are preceded by a newline
+        needed = len(encoded) + (1 if current else 0)
+        if current and size + needed > max_bytes:
+            messages.append("\n".join(current))
+            current = []
+            size = 0
+            needed = len(encoded)
+
+        current.append(line)
+        size += needed
+
+    messages.append("\n".join(current))
+    return messages
@@ -0,0 +1,275 @@
+"""Durable SQLite outbox for notifications."""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def idempotency_key(*parts) -> str:
+    """Derive a stable key identifying one message from its parts."""
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+
+class NotificationOutbox:
+    """
+    Record every message before it is sent and mark it once acknowledged.
+
+    Messages are keyed by an idempotency key: a key that was already
+    delivered (or is being delivered by another thread) is not claimed
+    again, so retries and replays do not push duplicates. Messages left
+    undelivered, e.g. by a restart while the server was unreachable, are
+    returned by pending() for replay until they are pending_max_age_days
+    old; older ones are expired instead of being sent late.
+
+    All writes go through one writer thread that commits everything queued
+    since its last commit in a single transaction (SQLite WAL mode), so
+    concurrent senders share commits. claim() waits for its record to be
+    committed and raises if the commit failed (or the writer thread has
+    stopped); acknowledgements are written asynchronously. Every
+    prune_interval seconds the writer also deletes delivered messages past
+    retention_days and expired pending ones.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            key TEXT PRIMARY KEY,
+            topic TEXT NOT NULL,
+            message TEXT NOT NULL,
+            headers TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            delivered_at REAL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str = "data/outbox.db",
+        retention_days: float = 7,
+        pending_max_age_days: float = 1,
+        prune_interval: float = 3600
+    ):
+        """
+        Initialize the outbox and start its writer thread.
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+            retention_days: Days delivered messages (and their keys) are kept
+            pending_max_age_days: Days an undelivered message may still be
+                replayed before it expires
+            prune_interval: Seconds between prunes of old messages
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+        self.pending_max_age_days = pending_max_age_days
+        self.prune_interval = prune_interval
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            with conn:
+                for sql, params in self._prune_statements():
+                    conn.execute(sql, params)
+            # Key -> delivery time, so pruned keys can be forgotten too
+            self._delivered: Dict[str, float] = dict(
+                conn.execute("SELECT key, delivered_at FROM outbox WHERE delivered_at IS NOT NULL")
+            )
+
+        self._claimed = set()
+        # (sql, params, result): result collects the error of a failed
+        # commit for writers waiting on it, None for asynchronous writes
+        self._writes: List[Tuple[str, tuple, Optional[dict]]] = []
+        self._next_batch = 1
+        self._committed = 0
+        self._closing = False
+        self._condition = threading.Condition()
+        self._writer = threading.Thread(target=self._run_writer, name="outbox-writer", daemon=True)
+        self._writer.start()
+        logger.info(f"Notification outbox ready at {self.path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection."""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def claim(self, key: str, topic: str, message: str, headers: dict) -> bool:
+        """
+        Record a message as about to be sent.
+
+        Args:
+            key: Idempotency key of the message
+            topic: Topic the message is published to
+            message: Message body
+            headers: Request headers
+
+        Returns:
+            True if the caller should send it, False if it was already
+            delivered or is being sent by another thread
+
+        Raises:
+            sqlite3.Error: If the record could not be committed (the claim
+                is given up, so the message is not sent unrecorded)
+            RuntimeError: If the outbox is closed or its writer has stopped
+        """
+        with self._condition:
+            if key in self._delivered or key in self._claimed:
+                return False
+            self._claimed.add(key)
+
+        try:
+            self._write(
+                "INSERT OR IGNORE INTO outbox (key, topic, message, headers, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, topic, message, json.dumps(headers), time.time()),
+                wait=True
+            )
+        except Exception:
+            self.release(key)
+            raise
+        return True
+
+    def ack(self, key: str) -> None:
+        """Mark a claimed message as delivered."""
+        with self._condition:
+            self._claimed.discard(key)
+            self._delivered[key] = time.time()
+        self._write("UPDATE outbox SET delivered_at = ? WHERE key = ?", (time.time(), key), wait=False)
+
+    def release(self, key: str) -> None:
+        """Give up a claim after a failed send; the message stays pending."""
+        with self._condition:
+            self._claimed.discard(key)
+
+    def pending(self) -> List[Tuple[str, str, str, dict]]:
+        """
+        List undelivered messages that no thread is currently sending.
+
+        Messages older than pending_max_age_days are left out; the next
+        prune deletes them.
+
+        Returns:
+            (key, topic, message, headers) tuples, oldest first
+        """
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT key, topic, message, headers FROM outbox"
+                " WHERE delivered_at IS NULL AND created_at >= ? ORDER BY created_at",
+                (time.time() - self.pending_max_age_days * 86400,)
+            ).fetchall()
+
+        with self._condition:
+            return [
+                (key, topic, message, json.loads(headers))
+                for key, topic, message, headers in rows
+                if key not in self._claimed and key not in self._delivered
+            ]
+
+    def _write(self, sql: str, params: tuple, wait: bool) -> None:
+        """
+        Queue a write for the writer thread; with wait, block until committed and raise if that failed.
+
+        Raises:
+            RuntimeError: If the outbox is closed, or with wait if the writer
+                thread has stopped
+        """
+        result = {} if wait else None
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("Notification outbox is closed")
+            self._writes.append((sql, params, result))
+            batch = self._next_batch
+            self._condition.notify_all()
+            while wait and self._committed < batch:
+                if not self._writer.is_alive():
+                    raise RuntimeError("Notification outbox writer has stopped")
+                self._condition.wait(1.0)
+
+        if wait and 'error' in result:
+            raise result['error']
+
+    def _prune_statements(self) -> List[Tuple[str, tuple]]:
+        """Statements deleting delivered messages past retention and expired pending ones."""
+        now = time.time()
+        return [
+            ("DELETE FROM outbox WHERE delivered_at < ?", (now - self.retention_days * 86400,)),
+            (
+                "DELETE FROM outbox WHERE delivered_at IS NULL AND created_at < ?",
+                (now - self.pending_max_age_days * 86400,)
+            ),
+        ]
+
+    def _prune(self) -> List[Tuple[str, tuple, Optional[dict]]]:
+        """Forget delivered keys past retention and return the writes pruning the table."""
+        cutoff = time.time() - self.retention_days * 86400
+        with self._condition:
+            self._delivered = {
+                key: delivered_at for key, delivered_at in self._delivered.items() if delivered_at >= cutoff
+            }
+        return [(sql, params, None) for sql, params in self._prune_statements()]
+
+    def _run_writer(self) -> None:
+        """Commit queued writes in batches, and prune periodically, until closed."""
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._commit_batches(conn)
+        except Exception as e:
+            logger.error(f"Notification outbox writer stopped: {e}", exc_info=True)
+        finally:
+            # Wake writers waiting on a batch that will now never commit
+            with self._condition:
+                self._condition.notify_all()
+
+    def _commit_batches(self, conn: sqlite3.Connection) -> None:
+        """Writer loop: take everything queued, commit it in one transaction and repeat."""
+        next_prune = time.monotonic() + self.prune_interval
+        while True:
+            with self._condition:
+                while not self._writes and not self._closing:
+                    remaining = next_prune - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if not self._writes and self._closing:
+                    return
+                writes, self._writes = self._writes, []
+                batch = self._next_batch
+                self._next_batch += 1
+
+            if time.monotonic() >= next_prune:
+                writes += self._prune()
+                next_prune = time.monotonic() + self.prune_interval
+
+            try:
+                with conn:
+                    for sql, params, _ in writes:
+                        conn.execute(sql, params)
+            except Exception as e:
+                logger.error(f"Failed to write {len(writes)} outbox record(s): {e}")
+                for _, _, result in writes:
+                    if result is not None:
+                        result['error'] = e
+
+            with self._condition:
+                self._committed = batch
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Wait until every write queued so far is committed."""
+        with self._condition:
+            batch = self._next_batch - 1 if not self._writes else self._next_batch
+            while self._committed < batch and self._writer.is_alive():
+                self._condition.wait(1.0)
+
+    def close(self) -> None:
+        """Commit outstanding writes and stop the writer thread."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._writer.join()
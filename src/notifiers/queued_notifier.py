@@ -0,0 +1,242 @@
+"""Background notification queue with retries."""
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+from .base import Notifier
+from ..models import Alert
+
+logger = logging.getLogger(__name__)
+
+
+class _Delivery:
+    """A queued call to one of the wrapped notifier's send methods."""
+
+    def __init__(self, method: str, args: tuple):
+        self.method = method
+        self.args = args
+        # Topics (or digest parts) that failed on the last attempt; None
+        # until a per-topic attempt was made
+        self.pending = None
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+
+class QueuedNotifier(Notifier):
+    """
+    Deliver notifications from a bounded queue in background worker threads.
+
+    The send methods only enqueue and return immediately: True if the
+    message was accepted, False if the queue was full and it was dropped.
+    Workers call the wrapped notifier; a send that fails (returns False or
+    raises) is retried with exponential backoff and full jitter until
+    max_attempts is reached. If the notifier reports success per topic
+    (see PUBLISH_METHODS), a retry only re-sends the topics that failed.
+    Delivery latency and final failures are logged and counted in stats().
+    """
+
+    # Send methods and the notifier method, if it has one, that sends the
+    # same message but returns {topic: success} and takes only=<topics>
+    PUBLISH_METHODS = {'send_alert': 'publish_alert', 'send_digest': 'publish_digest'}
+
+    def __init__(
+        self,
+        notifier: Notifier,
+        workers: int = 2,
+        max_size: int = 100,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0
+    ):
+        """
+        Initialize queued notifier and start its workers.
+
+        Args:
+            notifier: Notifier that performs the actual delivery
+            workers: Number of concurrent delivery threads
+            max_size: Maximum number of messages waiting for delivery
+            max_attempts: Delivery attempts per message before giving up
+            backoff_base: Backoff in seconds before the first retry (doubles per retry)
+            backoff_max: Upper bound on a single backoff in seconds
+        """
+        self.notifier = notifier
+        self.max_size = max_size
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # Heap of (ready_at, sequence, delivery); retries wait in the heap until
+        # due. Waiters are workers and flush(), so every change notifies all.
+        self._heap: List[Tuple[float, int, _Delivery]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._closing = False
+        self._stats = {'delivered': 0, 'failed': 0, 'dropped': 0, 'retried': 0}
+        self._latency_total = 0.0
+        self._latency_max = None
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"notify-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def send_alert(self, alert: Alert) -> bool:
+        """Queue an alert for delivery."""
+        return self._enqueue('send_alert', alert)
+
+    def send_status(self, title: str, message: str) -> bool:
+        """Queue a status message for delivery."""
+        return self._enqueue('send_status', title, message)
+
+    def send_error(self, title: str, message: str) -> bool:
+        """Queue an error notification for delivery."""
+        return self._enqueue('send_error', title, message)
+
+    def send_digest(self, alerts: List[Alert], errors: List[Tuple[str, str]]) -> bool:
+        """Queue a digest of a run's alerts and errors for delivery."""
+        return self._enqueue('send_digest', list(alerts), list(errors))
+
+    def _enqueue(self, method: str, *args) -> bool:
+        with self._condition:
+            if self._closing:
+                logger.error(f"Notifier queue closed, dropping {method}")
+                self._stats['dropped'] += 1
+                return False
+            if len(self._heap) >= self.max_size:
+                logger.error(f"Notifier queue full ({self.max_size}), dropping {method}")
+                self._stats['dropped'] += 1
+                return False
+
+            heapq.heappush(self._heap, (time.monotonic(), next(self._sequence), _Delivery(method, args)))
+            self._condition.notify_all()
+            return True
+
+    def _next_delivery(self):
+        """Block until a delivery is due; None once the queue is closed and drained."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    self._in_flight += 1
+                    return heapq.heappop(self._heap)[2]
+                if self._closing and not self._heap:
+                    return None
+                self._condition.wait(self._heap[0][0] - now if self._heap else None)
+
+    def _work(self) -> None:
+        while True:
+            delivery = self._next_delivery()
+            if delivery is None:
+                return
+
+            try:
+                self._attempt(delivery)
+            finally:
+                with self._condition:
+                    self._in_flight -= 1
+                    self._condition.notify_all()
+
+    def _attempt(self, delivery: _Delivery) -> None:
+        """Make one delivery attempt, scheduling a retry if it fails."""
+        delivery.attempts += 1
+        try:
+            success = self._send(delivery)
+        except Exception as e:
+            logger.warning(f"{delivery.method} attempt {delivery.attempts} raised: {e}")
+            success = False
+
+        if success:
+            latency = time.monotonic() - delivery.enqueued_at
+            logger.info(f"Delivered {delivery.method} in {latency:.2f}s ({delivery.attempts} attempt(s))")
+            with self._condition:
+                self._stats['delivered'] += 1
+                self._latency_total += latency
+                self._latency_max = max(latency, self._latency_max or 0.0)
+            return
+
+        if delivery.attempts >= self.max_attempts:
+            logger.error(f"Giving up on {delivery.method} after {delivery.attempts} attempt(s)")
+            with self._condition:
+                self._stats['failed'] += 1
+            return
+
+        delay = self._backoff(delivery.attempts)
+        logger.info(f"Retrying {delivery.method} in {delay:.1f}s")
+        with self._condition:
+            self._stats['retried'] += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), delivery))
+            self._condition.notify_all()
+
+    def _send(self, delivery: _Delivery) -> bool:
+        """Call the wrapped notifier, limited to the topics still pending if it reports them."""
+        publish = getattr(self.notifier, self.PUBLISH_METHODS.get(delivery.method, ''), None)
+        if publish is None:
+            return getattr(self.notifier, delivery.method)(*delivery.args)
+
+        results = publish(*delivery.args, only=delivery.pending)
+        delivery.pending = [topic for topic, sent in results.items() if not sent]
+        return not delivery.pending
+
+    def _backoff(self, attempts: int) -> float:
+        """Full-jitter exponential backoff after a number of failed attempts."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1)))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued message is delivered or given up on.
+
+        Args:
+            timeout: Seconds to wait at most (None = no limit)
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._heap or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Notified whenever a delivery finishes or a message is queued
+                self._condition.wait(remaining)
+            return True
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Stop accepting messages and wait for queued ones to be delivered.
+
+        Args:
+            timeout: Seconds to wait at most (None = no limit)
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(worker.is_alive() for worker in self._workers)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Delivery counters and latency since startup.
+
+        Returns:
+            Dictionary with queued, delivered, failed, dropped and retried
+            counts and the average and maximum delivery latency in seconds
+        """
+        with self._condition:
+            stats = dict(self._stats, queued=len(self._heap) + self._in_flight)
+            delivered = self._stats['delivered']
+            stats['avg_latency'] = self._latency_total / delivered if delivered else None
+            stats['max_latency'] = self._latency_max
+            return stats
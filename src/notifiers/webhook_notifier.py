@@ -0,0 +1,73 @@
+"""Generic JSON webhook notifier implementation."""
+import logging
+from typing import Dict, List, Optional, Tuple
+import requests
+from .base import Notifier
+from ..models import Alert
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookNotifier(Notifier):
+    """
+    Send notifications as JSON POSTs to a webhook URL.
+
+    Every payload has a "type" field ("alert", "status", "error" or
+    "digest"); alerts are sent with all Alert fields.
+    """
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10):
+        """
+        Initialize webhook notifier.
+
+        Args:
+            url: Webhook URL to POST to
+            headers: Extra request headers (e.g. an Authorization token)
+            timeout: Seconds to wait for the webhook per request
+        """
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+
+    def _post(self, payload: dict) -> bool:
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            logger.info(f"Webhook {payload['type']} sent successfully to {self.url}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send webhook {payload['type']}: {e}")
+            return False
+
+    def send_alert(self, alert: Alert) -> bool:
+        """
+        Send an alert to the webhook.
+
+        Args:
+            alert: Alert object to send
+
+        Returns:
+            True if notification sent successfully, False otherwise
+        """
+        return self._post({"type": "alert", "alert": alert.model_dump(mode='json')})
+
+    def send_status(self, title: str, message: str) -> bool:
+        """Send a status/info message to the webhook."""
+        return self._post({"type": "status", "title": title, "message": message})
+
+    def send_error(self, title: str, message: str) -> bool:
+        """Send an error notification to the webhook."""
+        return self._post({"type": "error", "title": title, "message": message})
+
+    def send_digest(self, alerts: List[Alert], errors: List[Tuple[str, str]]) -> bool:
+        """Send all alerts and errors of a run in one payload."""
+        return self._post({
+            "type": "digest",
+            "alerts": [alert.model_dump(mode='json') for alert in alerts],
+            "errors": [{"title": title, "message": message} for title, message in errors]
+        })
+
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
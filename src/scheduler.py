@@ -0,0 +1,271 @@
+"""Market-calendar-aware job scheduling."""
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+import yaml
+
+logger = logging.getLogger(__name__)
+
+
+class MarketCalendar:
+    """Trading days of an exchange: weekdays that are not listed holidays."""
+
+    def __init__(self, holidays: Iterable[date] = (), years: Iterable[int] = ()):
+        """
+        Initialize market calendar.
+
+        Args:
+            holidays: Trading holidays
+            years: Years the holiday list is complete for (other years are
+                treated as trading on every weekday, with a warning)
+        """
+        self.holidays = set(holidays)
+        self.years = set(years)
+        self._warned_years = set()
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "MarketCalendar":
+        """
+        Load a calendar from a YAML file with 'years' and 'holidays' lists.
+
+        Args:
+            path: Path to the holiday file
+
+        Returns:
+            MarketCalendar (weekends only if the file does not exist)
+        """
+        holiday_file = Path(path)
+        if not holiday_file.exists():
+            logger.warning(f"Holiday calendar not found: {path}, only weekends are skipped")
+            return cls()
+
+        with open(holiday_file, 'r') as f:
+            data = yaml.safe_load(f) or {}
+
+        holidays = [
+            day if isinstance(day, date) else date.fromisoformat(str(day))
+            for day in data.get('holidays', [])
+        ]
+        return cls(holidays, data.get('years', []))
+
+    def is_trading_day(self, day: date) -> bool:
+        """
+        Check whether the market is open on a day.
+
+        Args:
+            day: Calendar date in the exchange timezone
+
+        Returns:
+            True for weekdays that are not holidays
+        """
+        if day.weekday() >= 5:
+            return False
+
+        if self.years and day.year not in self.years and day.year not in self._warned_years:
+            logger.warning(f"No holiday calendar for {day.year}, treating all weekdays as trading days")
+            self._warned_years.add(day.year)
+
+        return day not in self.holidays
+
+
+class Job:
+    """A scheduled job and the rule computing its next run."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], None],
+        next_after: Callable[[datetime], datetime],
+        deadline: Optional[Callable[[datetime], datetime]] = None
+    ):
+        """
+        Initialize job.
+
+        Args:
+            name: Job name used in logs
+            func: Function to run
+            next_after: Returns the first run time strictly after a given time
+            deadline: Returns the latest time a given run may still start
+                (None = a late run always runs)
+        """
+        self.name = name
+        self.func = func
+        self.next_after = next_after
+        self.deadline = deadline
+        self.next_run: Optional[datetime] = None
+
+
+class EventScheduler:
+    """
+    Run jobs at their due times in a timezone, sleeping until the next one.
+
+    Instead of waking up periodically to poll for pending jobs, the
+    scheduler computes the next due time of every job and sleeps exactly
+    until the earliest. Jobs can be limited to trading days of a
+    MarketCalendar. Jobs run one at a time in the scheduler thread; a job
+    that fails is logged and rescheduled as usual.
+    """
+
+    # Upper bound on a single sleep, so wall-clock jumps (NTP, suspend) are
+    # noticed within this many seconds
+    MAX_SLEEP = 3600.0
+
+    def __init__(self, timezone: str = "Asia/Kolkata", calendar: Optional[MarketCalendar] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            timezone: Timezone job times are given in
+            calendar: Market calendar for trading-day-only jobs (None = weekdays)
+        """
+        self.tz = ZoneInfo(timezone)
+        self.calendar = calendar or MarketCalendar()
+        self.jobs: List[Job] = []
+        self._stop = threading.Event()
+
+    def now(self) -> datetime:
+        """Current time in the scheduler timezone."""
+        return datetime.now(self.tz)
+
+    def _at(self, day: date, at: time) -> datetime:
+        return datetime.combine(day, at, tzinfo=self.tz)
+
+    def _is_run_day(self, day: date, trading_days_only: bool) -> bool:
+        return self.calendar.is_trading_day(day) if trading_days_only else True
+
+    def every_day_at(
+        self,
+        name: str,
+        at: str,
+        func: Callable[[], None],
+        trading_days_only: bool = True
+    ) -> Job:
+        """
+        Schedule a job once a day.
+
+        Args:
+            name: Job name used in logs
+            at: Time of day as HH:MM
+            func: Function to run
+            trading_days_only: Skip weekends and market holidays
+
+        Returns:
+            The scheduled Job
+        """
+        at_time = datetime.strptime(at, '%H:%M').time()
+
+        def next_after(moment: datetime) -> datetime:
+            day = moment.date()
+            while self._at(day, at_time) <= moment or not self._is_run_day(day, trading_days_only):
+                day += timedelta(days=1)
+            return self._at(day, at_time)
+
+        return self._add(Job(name, func, next_after))
+
+    def every(
+        self,
+        name: str,
+        seconds: float,
+        func: Callable[[], None],
+        start: str = "00:00",
+        end: str = "23:59",
+        trading_days_only: bool = True
+    ) -> Job:
+        """
+        Schedule a job every few seconds within a daily time window.
+
+        A run that comes due late (e.g. after a long previous job or a
+        suspend) is skipped if the window has closed in the meantime.
+
+        Args:
+            name: Job name used in logs
+            seconds: Interval between runs
+            func: Function to run
+            start: Start of the daily window as HH:MM (first run)
+            end: End of the daily window as HH:MM (inclusive)
+            trading_days_only: Skip weekends and market holidays
+
+        Returns:
+            The scheduled Job
+        """
+        start_time = datetime.strptime(start, '%H:%M').time()
+        end_time = datetime.strptime(end, '%H:%M').time()
+        interval = timedelta(seconds=seconds)
+
+        def next_after(moment: datetime) -> datetime:
+            candidate = moment + interval
+            day = candidate.date()
+            if self._is_run_day(day, trading_days_only):
+                if candidate < self._at(day, start_time):
+                    return self._at(day, start_time)
+                if candidate <= self._at(day, end_time):
+                    return candidate
+
+            day += timedelta(days=1)
+            while not self._is_run_day(day, trading_days_only):
+                day += timedelta(days=1)
+            return self._at(day, start_time)
+
+        def deadline(run: datetime) -> datetime:
+            return self._at(run.date(), end_time)
+
+        return self._add(Job(name, func, next_after, deadline))
+
+    def _add(self, job: Job) -> Job:
+        job.next_run = job.next_after(self.now())
+        self.jobs.append(job)
+        logger.info(f"Scheduled {job.name}: next run at {job.next_run:%Y-%m-%d %H:%M:%S %Z}")
+        return job
+
+    def next_job(self) -> Optional[Job]:
+        """The job that is due next, or None if nothing is scheduled."""
+        return min(self.jobs, key=lambda job: job.next_run, default=None)
+
+    def run_pending(self) -> None:
+        """
+        Run every job that is due, then schedule its next run.
+
+        A due job whose deadline has passed is not run, only rescheduled.
+        """
+        for job in sorted(self.jobs, key=lambda job: job.next_run):
+            if job.next_run > self.now():
+                continue
+
+            if job.deadline is not None and self.now() > job.deadline(job.next_run):
+                job.next_run = job.next_after(self.now())
+                logger.info(f"Skipped late {job.name}, its window has closed; next run at {job.next_run:%Y-%m-%d %H:%M:%S %Z}")
+                continue
+
+            try:
+                job.func()
+            except Exception as e:
+                logger.error(f"Error running {job.name}: {e}", exc_info=True)
+
+            # Keep the cadence, but skip runs missed while this one was running
+            next_run = job.next_after(job.next_run)
+            if next_run <= self.now():
+                next_run = job.next_after(self.now())
+            job.next_run = next_run
+            logger.debug(f"Next {job.name} at {job.next_run:%Y-%m-%d %H:%M:%S %Z}")
+
+    def run_forever(self) -> None:
+        """Run jobs until stop() is called, sleeping until each next due time."""
+        while not self._stop.is_set():
+            job = self.next_job()
+            if job is None:
+                self._stop.wait(self.MAX_SLEEP)
+                continue
+
+            delay = (job.next_run - self.now()).total_seconds()
+            if delay > 0:
+                self._stop.wait(min(delay, self.MAX_SLEEP))
+                continue
+
+            self.run_pending()
+
+    def stop(self) -> None:
+        """Stop run_forever (safe to call from another thread or a signal handler)."""
+        self._stop.set()
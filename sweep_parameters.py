@@ -0,0 +1,126 @@
+"""
+Sweep lookback window x drop threshold for every index in config/config.yaml.
+
+This script:
+1. Fetches historical data for each configured index (via the local price store)
+2. Counts drop alerts for every lookback (2-60 days) and threshold combination
+3. Writes an alerts-per-year heatmap per index as CSV or JSON
+
+Usage:
+    python sweep_parameters.py --output sweep.csv
+    python sweep_parameters.py --output sweep.json --years 10 --max-lookback 30
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from src.backtest import sweep_lookback_threshold
+from src.config import load_config
+from src.data_fetchers import YahooFinanceDataFetcher, CachedDataFetcher, PriceStore
+
+# Test thresholds from 1.0% to 10.0% in 0.5% increments
+TEST_THRESHOLDS = [round(x * 0.5, 1) for x in range(2, 21)]
+
+PRICE_STORE_PATH = os.getenv('PRICE_STORE_PATH', 'data/prices.db')
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def sweep_index(fetcher, symbol, name, years, lookbacks, thresholds, cooldown):
+    """Fetch history for one index and return its alerts-per-year heatmap."""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=years * 365)
+
+    try:
+        series = fetcher.fetch_historical_data(symbol, start_date, end_date)
+    except Exception as e:
+        print(f"  ❌ Error fetching {name}: {e}")
+        return None
+
+    if len(series) < max(lookbacks) + 1:
+        print(f"  ❌ Not enough data for {name} ({len(series)} days)")
+        return None
+
+    data_years = len(series) / TRADING_DAYS_PER_YEAR
+    counts = sweep_lookback_threshold(series, lookbacks, thresholds, cooldown)
+
+    return {
+        'symbol': symbol,
+        'data_years': round(data_years, 2),
+        'lookbacks': list(lookbacks),
+        'thresholds': list(thresholds),
+        'alerts': counts.tolist(),
+        'alerts_per_year': (counts / data_years).round(2).tolist(),
+    }
+
+
+def write_csv(path, results):
+    """Write results in long format: one row per index, lookback and threshold."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['index', 'symbol', 'lookback_days', 'threshold', 'alerts', 'alerts_per_year'])
+        for name, result in results.items():
+            for row, lookback in enumerate(result['lookbacks']):
+                for column, threshold in enumerate(result['thresholds']):
+                    writer.writerow([
+                        name,
+                        result['symbol'],
+                        lookback,
+                        threshold,
+                        result['alerts'][row][column],
+                        result['alerts_per_year'][row][column],
+                    ])
+
+
+def write_json(path, results):
+    """Write results as one lookback x threshold matrix per index."""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep lookback x threshold alert frequency per index")
+    parser.add_argument('--config', default=os.getenv('CONFIG_PATH', 'config/config.yaml'))
+    parser.add_argument('--output', default='sweep.csv', help="Output file (.csv or .json)")
+    parser.add_argument('--years', type=int, default=5, help="Years of history to test")
+    parser.add_argument('--min-lookback', type=int, default=2)
+    parser.add_argument('--max-lookback', type=int, default=60)
+    parser.add_argument('--cooldown', type=int, default=7, help="Days skipped after an alert")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    lookbacks = list(range(args.min_lookback, args.max_lookback + 1))
+    fetcher = CachedDataFetcher(YahooFinanceDataFetcher(), PriceStore(PRICE_STORE_PATH))
+
+    print("=" * 80)
+    print(f"SWEEPING LOOKBACK {lookbacks[0]}-{lookbacks[-1]} DAYS x "
+          f"THRESHOLD {TEST_THRESHOLDS[0]}-{TEST_THRESHOLDS[-1]}%")
+    print("=" * 80)
+
+    results = {}
+    for index_config in config.get('indices', []):
+        name = index_config['name']
+        symbol = index_config['symbol']
+        print(f"\n{name} ({symbol})")
+
+        start = time.perf_counter()
+        result = sweep_index(fetcher, symbol, name, args.years, lookbacks, TEST_THRESHOLDS, args.cooldown)
+        if result is None:
+            continue
+
+        results[name] = result
+        print(f"  ✓ {len(lookbacks) * len(TEST_THRESHOLDS)} combinations over "
+              f"{result['data_years']:.1f} years in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if args.output.endswith('.json'):
+        write_json(args.output, results)
+    else:
+        write_csv(args.output, results)
+
+    print(f"\nWrote heatmap for {len(results)} indices to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
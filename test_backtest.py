@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Test script to verify the vectorized backtest matches the live alert rule."""
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import PriceSeries
+from src.alert_triggers import AlertTrigger, PercentageDropTrigger
+from src.backtest import alert_positions, simulate_threshold_grid, sweep_lookback_threshold
+
+THRESHOLDS = [round(x * 0.5, 1) for x in range(2, 21)]
+
+
+def reference_alerts(closes, threshold_pct, lookback=7, cooldown=7):
+    """Day-by-day loop of the live rule: largest move vs the lookback window is a big enough drop."""
+    alerts = []
+    i = lookback
+    while i < len(closes):
+        max_change = 0
+        max_change_index = None
+        for back in range(1, lookback + 1):
+            pct_change = ((closes[i] - closes[i - back]) / closes[i - back]) * 100
+            if max_change_index is None or abs(pct_change) > abs(max_change):
+                max_change = pct_change
+                max_change_index = i - back
+
+        if max_change <= -threshold_pct:
+            alerts.append((i, max_change_index, max_change))
+            i += cooldown
+        else:
+            i += 1
+    return alerts
+
+
+def random_walk(days, seed):
+    rng = np.random.default_rng(seed)
+    return 10000 * np.cumprod(1 + rng.normal(0, 0.015, days))
+
+
+def as_series(closes):
+    dates = np.datetime64('2000-01-01') + np.arange(len(closes)).astype('timedelta64[D]')
+    return PriceSeries("^TEST", dates, closes)
+
+
+def test_matches_reference_loop():
+    """Alert days, reference days and drop sizes match the day-by-day loop."""
+    series = as_series(random_walk(1500, seed=7))
+    grid = simulate_threshold_grid(series, THRESHOLDS)
+
+    for threshold, grid_positions in zip(THRESHOLDS, grid):
+        expected = reference_alerts(series.close, threshold)
+        evaluation = PercentageDropTrigger(threshold).evaluate_series(series, lookback=7)
+        positions = alert_positions(evaluation.fired, cooldown=7)
+
+        assert [i for i, _, _ in expected] == positions.tolist() == grid_positions.tolist()
+        assert [j for _, j, _ in expected] == evaluation.reference[positions].tolist()
+        assert np.allclose([d for _, _, d in expected], evaluation.change[positions])
+
+    print("✓ Vectorized backtest matches reference loop")
+
+
+def test_matches_live_trigger():
+    """evaluate_series agrees bar by bar with check_trigger, check_batch and the generic implementation."""
+    series = as_series(random_walk(300, seed=3))
+    trigger = PercentageDropTrigger(2.0)
+    evaluation = trigger.evaluate_series(series, lookback=7)
+
+    # The live batch path, fed the 8-bar window ending at every bar
+    windows = [series[i - 7:i + 1] for i in range(7, len(series))]
+    alerts = PercentageDropTrigger.check_batch([trigger] * len(windows), ["TEST"] * len(windows), windows)
+    assert not evaluation.fired[:7].any()
+    for i, alert in enumerate(alerts, start=7):
+        assert alert.percentage_change == evaluation.change[i]
+        assert trigger.is_triggered(alert) == evaluation.fired[i]
+        single = trigger.check_trigger("TEST", series[i - 7:i + 1])
+        assert alert.model_dump(exclude={'timestamp'}) == single.model_dump(exclude={'timestamp'})
+
+    # The base class loops check_trigger; the vectorized override must give the same result
+    generic = AlertTrigger.evaluate_series(trigger, series, lookback=7)
+    assert np.array_equal(generic.fired, evaluation.fired)
+    assert np.array_equal(generic.reference, evaluation.reference)
+    assert np.allclose(generic.change, evaluation.change, equal_nan=True)
+
+    assert evaluation.fired.any()
+    print(f"✓ evaluate_series matches check_batch and check_trigger on {len(series)} bars")
+
+
+def test_long_lookbacks():
+    """The sliding-window extrema match a full scan for long lookbacks."""
+    series = as_series(random_walk(1200, seed=5))
+
+    for lookback in (50, 200):
+        for threshold in (5.0, 10.0):
+            expected = reference_alerts(series.close, threshold, lookback=lookback)
+            evaluation = PercentageDropTrigger(threshold).evaluate_series(series, lookback=lookback)
+            positions = alert_positions(evaluation.fired, cooldown=7)
+
+            assert [i for i, _, _ in expected] == positions.tolist()
+            assert [j for _, j, _ in expected] == evaluation.reference[positions].tolist()
+
+    print("✓ Long lookbacks match reference loop")
+
+
+def test_short_series():
+    """Series shorter than the lookback produce no alerts."""
+    grid = simulate_threshold_grid(as_series(np.array([100.0, 90.0, 80.0])), [1.0, 2.0])
+    assert [len(positions) for positions in grid] == [0, 0]
+    print("✓ Short series handled")
+
+
+def test_lookback_sweep_matches_reference():
+    """Each cell of the lookback x threshold sweep matches the original loop."""
+    lookbacks = [2, 5, 7, 20]
+
+    # Coarsely rounded closes repeat often, exercising the high/low tie-break
+    for closes in (random_walk(600, seed=11), np.round(random_walk(600, seed=13) / 200) * 200):
+        counts = sweep_lookback_threshold(as_series(closes), lookbacks, THRESHOLDS)
+
+        for row, lookback in enumerate(lookbacks):
+            for column, threshold in enumerate(THRESHOLDS):
+                assert counts[row, column] == len(reference_alerts(closes, threshold, lookback=lookback))
+
+    print("✓ Lookback sweep matches reference loop")
+
+
+def test_grid_speed():
+    """A 20-year sweep over the full threshold grid runs in well under a second."""
+    series = as_series(random_walk(252 * 20, seed=1))
+    start = time.perf_counter()
+    simulate_threshold_grid(series, THRESHOLDS)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.0
+    print(f"✓ 20-year grid in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_matches_reference_loop()
+    test_matches_live_trigger()
+    test_long_lookbacks()
+    test_short_series()
+    test_lookback_sweep_matches_reference()
+    test_grid_speed()
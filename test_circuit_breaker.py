@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Test script to verify circuit breaker state transitions."""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.data_fetchers.circuit_breaker import CircuitBreaker
+
+
+def test_opens_after_threshold():
+    """Circuit opens after consecutive failures and rejects requests."""
+    breaker = CircuitBreaker("Test", failure_threshold=3, cooldown=60)
+
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    print(f"✓ Circuit opened, health {breaker.health:.2f}")
+
+
+def test_half_open_probe():
+    """After the cool-down a single probe is allowed; success closes the circuit."""
+    breaker = CircuitBreaker("Test", failure_threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()  # Only one probe in flight
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    print("✓ Half-open probe closed the circuit")
+
+
+def test_failed_probe_reopens():
+    """A failed probe opens the circuit again."""
+    breaker = CircuitBreaker("Test", failure_threshold=5, cooldown=0.05)
+    for _ in range(5):
+        breaker.record_failure()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    print("✓ Failed probe reopened the circuit")
+
+
+if __name__ == "__main__":
+    test_opens_after_threshold()
+    test_half_open_probe()
+    test_failed_probe_reopens()
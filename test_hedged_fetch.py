@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Test script to verify hedged fetching races a slow batch download."""
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import PriceSeries
+from src.data_fetchers import DataFetcher, FallbackDataFetcher
+
+SYMBOLS = ['^A', '^B', '^C']
+
+
+def make_series(symbol, start_date, end_date, price):
+    days = (end_date.date() - start_date.date()).days + 1
+    dates = np.datetime64(start_date.date()) + np.arange(days).astype('timedelta64[D]')
+    return PriceSeries(symbol, dates, np.full(days, price))
+
+
+class SlowBatchSource(DataFetcher):
+    """Batch source that answers after delay seconds, leaving out the symbols in missing."""
+
+    def __init__(self, delay, missing=()):
+        self.delay = delay
+        self.missing = set(missing)
+
+    def fetch_historical_data(self, symbol, start_date, end_date):
+        return self.fetch_many([symbol], start_date, end_date)[symbol]
+
+    def fetch_many(self, symbols, start_date, end_date):
+        time.sleep(self.delay)
+        return {
+            symbol: make_series(symbol, start_date, end_date, 100.0)
+            for symbol in symbols if symbol not in self.missing
+        }
+
+
+class FastSource(DataFetcher):
+    def __init__(self):
+        self.requested = []
+
+    def fetch_historical_data(self, symbol, start_date, end_date):
+        self.requested.append(symbol)
+        return make_series(symbol, start_date, end_date, 200.0)
+
+
+def dates():
+    end = datetime(2025, 1, 10)
+    return end - timedelta(days=5), end
+
+
+def test_slow_batch_is_hedged():
+    """Per-symbol fetches start after hedge_delay and win over a slow batch."""
+    fast = FastSource()
+    fallback = FallbackDataFetcher(
+        hedge_delay=0.1,
+        sources=[('Batch', SlowBatchSource(delay=2.0)), ('Single', fast)]
+    )
+
+    start = time.perf_counter()
+    results = fallback.fetch_many(SYMBOLS, *dates())
+    elapsed = time.perf_counter() - start
+
+    assert sorted(results) == SYMBOLS
+    assert all(series.close[-1] == 200.0 for series in results.values())
+    assert sorted(fast.requested) == SYMBOLS
+    assert elapsed < 1.0
+    print(f"✓ Slow batch hedged per symbol in {elapsed:.2f}s")
+
+
+def test_fast_batch_wins():
+    """A batch answering within hedge_delay is used; only its gaps are fetched per symbol."""
+    fast = FastSource()
+    fallback = FallbackDataFetcher(
+        hedge_delay=0.5,
+        sources=[('Batch', SlowBatchSource(delay=0.0, missing=['^C'])), ('Single', fast)]
+    )
+
+    results = fallback.fetch_many(SYMBOLS, *dates())
+
+    assert sorted(results) == SYMBOLS
+    assert results['^A'].close[-1] == 100.0
+    assert results['^B'].close[-1] == 100.0
+    assert results['^C'].close[-1] == 200.0
+    assert fast.requested == ['^C']
+    print("✓ Fast batch used, missing symbol fetched per symbol")
+
+
+if __name__ == "__main__":
+    test_slow_batch_is_hedged()
+    test_fast_batch_wins()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Test script to verify concurrent index checks and the per-index timeout (offline)."""
+import sys
+import os
+import time
+from datetime import datetime
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import PriceSeries
+from src.alert_service import AlertService
+
+
+def make_configs(count):
+    return [
+        {
+            'symbol': f"^IDX{i}",
+            'name': f"INDEX {i}",
+            'lookback_days': 7,
+            'alert_triggers': [{'type': 'percentage_drop', 'threshold': 2.0}]
+        }
+        for i in range(count)
+    ]
+
+
+class SlowFetcher:
+    """Daily closes ending today; each symbol sleeps for its configured delay first."""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    def fetch_historical_data(self, symbol, start_date, end_date):
+        time.sleep(self.delays.get(symbol, 0.0))
+        days = (end_date.date() - start_date.date()).days + 1
+        dates = np.datetime64(start_date.date()) + np.arange(days).astype('timedelta64[D]')
+        return PriceSeries(symbol, dates, 100.0 + np.arange(days))
+
+
+def test_result_order():
+    """Results follow the config order even when later indices finish first."""
+    configs = make_configs(6)
+    delays = {config['symbol']: 0.05 * (6 - i) for i, config in enumerate(configs)}
+    service = AlertService(SlowFetcher(delays), notifier=None, max_workers=6)
+
+    results = service.check_indices(configs)
+
+    assert [result.symbol for result in results] == [config['symbol'] for config in configs]
+    assert all(result.error is None and result.has_data for result in results)
+    print("✓ Concurrent results returned in config order")
+
+
+def test_timeout_in_both_modes():
+    """A slow index becomes an error entry after index_timeout, sequentially and concurrently."""
+    configs = make_configs(3)
+    delays = {'^IDX1': 3.0}
+
+    for max_workers in (1, 3):
+        service = AlertService(SlowFetcher(delays), notifier=None, max_workers=max_workers, index_timeout=0.5)
+
+        start = time.perf_counter()
+        results = service.check_indices(configs)
+        elapsed = time.perf_counter() - start
+
+        assert [result.symbol for result in results] == ['^IDX0', '^IDX1', '^IDX2']
+        assert results[1].error == "Timed out checking INDEX 1 after 0.5s"
+        assert results[0].error is None and results[2].error is None
+        assert results[0].has_data and results[2].has_data
+        assert elapsed < 1.0  # Bounded by the timeout, not the 3s fetch
+        print(f"✓ max_workers={max_workers}: slow index timed out, run took {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    test_result_order()
+    test_timeout_in_both_modes()
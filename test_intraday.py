@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Test script to verify intraday polling against live prices."""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import PriceSeries
+from src.alert_service import AlertService
+from src.data_fetchers import NSEIndiaDataFetcher
+from src.data_fetchers.nse_india import NSE_TIMEZONE
+from src.alert_triggers import TriggerStateStore
+
+CONFIG = {
+    'indices': [
+        {
+            'symbol': '^CRSLDX',
+            'name': 'NIFTY 500',
+            'lookback_days': 7,
+            'alert_triggers': [{'type': 'percentage_drop', 'threshold': 2.0}]
+        },
+        {
+            'symbol': '^NSEBANK',
+            'name': 'NIFTY BANK',
+            'lookback_days': 7,
+            'alert_triggers': [{'type': 'percentage_drop', 'threshold': 3.0}]
+        },
+    ]
+}
+
+
+class FlatHistoryFetcher:
+    """Flat daily closes of 100 up to the requested end date; counts upstream calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_historical_data(self, symbol, start_date, end_date):
+        self.calls += 1
+        days = (end_date.date() - start_date.date()).days + 1
+        dates = np.datetime64(start_date.date()) + np.arange(days).astype('timedelta64[D]')
+        return PriceSeries(symbol, dates, np.full(days, 100.0))
+
+
+class LivePrices:
+    """Live price source returning whatever the test sets."""
+
+    def __init__(self):
+        self.prices = {}
+
+    def fetch_live_prices(self, symbols):
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+class FlakyNSE(NSEIndiaDataFetcher):
+    """NSE fetcher whose allIndices downloads return the queued payloads (None = failed refresh)."""
+
+    def __init__(self, snapshot_ttl):
+        super().__init__(snapshot_ttl=snapshot_ttl)
+        self.downloads = []
+
+    def _download_all_indices(self):
+        return self.downloads.pop(0) if self.downloads else None
+
+
+def nse_snapshot(prices, timestamp):
+    return {name: {'index': name, 'last': price} for name, price in prices.items()}, timestamp
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.alerts = []
+        self.digests = []
+
+    def send_alert(self, alert):
+        self.alerts.append(alert)
+        return True
+
+    def send_status(self, title, message):
+        return True
+
+    def send_error(self, title, message):
+        raise AssertionError(message)
+
+    def send_digest(self, alerts, errors):
+        self.digests.append((alerts, errors))
+        return True
+
+
+def test_threshold_alerts_sent_once_per_day():
+    """Only threshold crossings are sent, once per index and day; history loads once per day."""
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = FlatHistoryFetcher()
+        live = LivePrices()
+        notifier = RecordingNotifier()
+        service = AlertService(
+            fetcher,
+            notifier,
+            trigger_state=TriggerStateStore(os.path.join(tmp, "state.json")),
+            live_fetcher=live
+        )
+        now = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+
+        # Small moves: informational only, nothing sent
+        live.prices = {'^CRSLDX': 99.0, '^NSEBANK': 101.0}
+        assert service.run_intraday_poll(CONFIG, now) == []
+
+        # NIFTY 500 crosses its 2% threshold, NIFTY BANK (3%) does not
+        live.prices = {'^CRSLDX': 97.5, '^NSEBANK': 97.5}
+        sent = service.run_intraday_poll(CONFIG, now + timedelta(minutes=1))
+        assert [alert.index_name for alert in sent] == ['NIFTY 500']
+
+        # NIFTY 500 still past its threshold (not re-sent); NIFTY BANK now crosses 3%
+        live.prices = {'^CRSLDX': 97.0, '^NSEBANK': 96.5}
+        sent = service.run_intraday_poll(CONFIG, now + timedelta(minutes=2))
+        assert [alert.index_name for alert in sent] == ['NIFTY BANK']
+        assert len(notifier.alerts) == 2
+        assert fetcher.calls == 2  # history fetched once per index for the day
+
+        # Next day: history reloaded and alerts can be sent again
+        sent = service.run_intraday_poll(CONFIG, now + timedelta(days=1))
+        assert len(sent) == 2
+        assert fetcher.calls == 4
+        print(f"✓ Intraday threshold alerts: {len(notifier.alerts)} sent")
+
+
+def test_close_check_uses_prefetched_history():
+    """After a prefetch, the close check only reads today's bar from the live snapshot."""
+    fetcher = FlatHistoryFetcher()
+    live = LivePrices()
+    notifier = RecordingNotifier()
+    service = AlertService(fetcher, notifier, live_fetcher=live)
+    now = datetime.now().replace(hour=15, minute=50, second=0, microsecond=0)
+
+    service.prefetch_history(CONFIG, now)
+    assert fetcher.calls == 2
+
+    live.prices = {'^CRSLDX': 101.0, '^NSEBANK': 99.5}
+    service.run_check(CONFIG, now + timedelta(minutes=10))
+
+    assert fetcher.calls == 2
+    assert [alert.current_price for alert in notifier.alerts] == [101.0, 99.5]
+    assert notifier.alerts[0].message.startswith("NIFTY 500: Gained 1.00% (from 100.00 to 101.00)")
+
+    # Without a live price the index falls back to a full fetch
+    live.prices = {'^CRSLDX': 101.0}
+    service.run_check(CONFIG, now + timedelta(minutes=11))
+    assert fetcher.calls == 3
+    print("✓ Close check uses prefetched history and the live close")
+
+
+def test_stale_snapshot_falls_back_to_full_fetch():
+    """A snapshot kept after a failed refresh is ignored once past its TTL or from an earlier day."""
+    fetcher = FlatHistoryFetcher()
+    live = FlakyNSE(snapshot_ttl=0.1)
+    notifier = RecordingNotifier()
+    service = AlertService(fetcher, notifier, live_fetcher=live)
+    now = datetime.now().replace(hour=15, minute=50, second=0, microsecond=0)
+    nse_now = datetime.now(NSE_TIMEZONE).replace(tzinfo=None)
+
+    service.prefetch_history(CONFIG, now)
+    assert fetcher.calls == 2
+
+    live.downloads = [nse_snapshot({'NIFTY 500': 101.0, 'NIFTY BANK': 99.5}, nse_now)]
+    service.run_check(CONFIG, now + timedelta(minutes=10))
+    assert fetcher.calls == 2
+    assert [alert.current_price for alert in notifier.alerts] == [101.0, 99.5]
+
+    # The refresh fails: the old snapshot is past its TTL, so both indices are fetched in full
+    time.sleep(0.15)
+    assert live.fetch_live_prices(['^CRSLDX']) == {}
+    service.run_check(CONFIG, now + timedelta(minutes=11))
+    assert fetcher.calls == 4
+
+    # A fresh download still stamped with an earlier trading day is not used either
+    live.downloads = [nse_snapshot({'NIFTY 500': 101.0}, nse_now - timedelta(days=1))]
+    assert live.fetch_live_prices(['^CRSLDX']) == {}
+    print("✓ Stale NSE snapshot ignored after a failed refresh")
+
+
+def test_digest_mode():
+    """In digest mode the alerts of a poll and of a close check go out as one notification each."""
+    live = LivePrices()
+    notifier = RecordingNotifier()
+    service = AlertService(FlatHistoryFetcher(), notifier, live_fetcher=live, digest=True)
+    now = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+
+    live.prices = {'^CRSLDX': 97.0, '^NSEBANK': 96.5}
+    sent = service.run_intraday_poll(CONFIG, now)
+    assert len(sent) == 2
+    assert not service.run_intraday_poll(CONFIG, now + timedelta(minutes=1))
+
+    service.run_check(CONFIG, now.replace(hour=16))
+    assert notifier.alerts == []
+    assert [len(alerts) for alerts, _ in notifier.digests] == [2, 2]
+    print("✓ Digest mode sends one notification per run")
+
+
+def test_poll_speed():
+    """A poll for the whole watchlist takes well under a second once history is loaded."""
+    config = {'indices': [
+        dict(CONFIG['indices'][0], symbol=f"^IDX{i}", name=f"INDEX {i}") for i in range(50)
+    ]}
+    live = LivePrices()
+    live.prices = {f"^IDX{i}": 99.5 for i in range(50)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = AlertService(
+            FlatHistoryFetcher(),
+            RecordingNotifier(),
+            trigger_state=TriggerStateStore(os.path.join(tmp, "state.json")),
+            live_fetcher=live
+        )
+        now = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        service.run_intraday_poll(config, now)
+
+        start = time.perf_counter()
+        service.run_intraday_poll(config, now + timedelta(minutes=1))
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.5
+        print(f"✓ Poll of {len(config['indices'])} indices in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_threshold_alerts_sent_once_per_day()
+    test_close_check_uses_prefetched_history()
+    test_stale_snapshot_falls_back_to_full_fetch()
+    test_digest_mode()
+    test_poll_speed()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Test script to verify fan-out to ntfy, webhook and email channels."""
+import sys
+import os
+import email
+import json
+import socketserver
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mock_ntfy import MockNtfyHandler
+from src.models import Alert
+from src.notifiers import CompositeNotifier, EmailNotifier, NtfyNotifier, QueuedNotifier, WebhookNotifier
+
+
+class RecordingNtfyHandler(MockNtfyHandler):
+    """mock_ntfy handler that also records the topics posted to."""
+
+    def do_POST(self):
+        self.server.messages.append((self.path, self.headers.get('Title')))
+        super().do_POST()
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.messages.append(json.loads(body))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP server that accepts every message and records it."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 localhost SMTP stub")
+        data, lines = False, []
+        for raw in self.rfile:
+            line = raw.decode('utf-8').rstrip("\r\n")
+            if data:
+                if line == ".":
+                    self.server.messages.append(email.message_from_string("\n".join(lines)))
+                    data, lines = False, []
+                    self.reply("250 OK")
+                else:
+                    lines.append(line[1:] if line.startswith("..") else line)
+                continue
+
+            command = line[:4].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                data = True
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SlowChannel:
+    """Channel that takes longer than the channel timeout."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_alert(self, alert):
+        time.sleep(1.0)
+        self.sent.append(alert)
+        return True
+
+
+def serve(server):
+    server.messages = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_alert(change):
+    return Alert(
+        index_name="NIFTY 50",
+        symbol="^NSEI",
+        current_price=100.0 + change,
+        reference_price=100.0,
+        reference_date=datetime(2025, 1, 1),
+        percentage_change=change,
+        message=f"NIFTY 50: Dropped {abs(change):.2f}%",
+        timestamp=datetime.now(),
+        trigger_type="percentage_drop",
+        threshold=2.0
+    )
+
+
+def test_fan_out_to_all_channels():
+    """One alert reaches ntfy (both topics), the webhook and email; a slow channel times out alone."""
+    ntfy_server = serve(HTTPServer(('127.0.0.1', 0), RecordingNtfyHandler))
+    webhook_server = serve(HTTPServer(('127.0.0.1', 0), WebhookHandler))
+    smtp_server = serve(socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPStubHandler))
+
+    ntfy = NtfyNotifier(f"http://127.0.0.1:{ntfy_server.server_port}", "main", critical_topic="critical")
+    webhook = WebhookNotifier(f"http://127.0.0.1:{webhook_server.server_port}/alerts")
+    mail = EmailNotifier("127.0.0.1", smtp_server.server_address[1], "alerter@localhost", ["me@localhost"])
+    notifier = CompositeNotifier(
+        {'ntfy': ntfy, 'webhook': webhook, 'email': mail, 'slow': SlowChannel()},
+        channel_timeout=0.5
+    )
+
+    try:
+        start = time.perf_counter()
+        results = notifier.dispatch('send_alert', make_alert(-3.0))
+        elapsed = time.perf_counter() - start
+
+        assert results == {'ntfy': True, 'webhook': True, 'email': True, 'slow': False}
+        assert elapsed < 0.9  # Bounded by the channel timeout, not the slow channel
+
+        assert sorted(path for path, _ in ntfy_server.messages) == ["/critical", "/main"]
+        assert webhook_server.messages[0]['type'] == "alert"
+        assert webhook_server.messages[0]['alert']['percentage_change'] == -3.0
+        assert smtp_server.messages[0]['Subject'] == "BUYING OPPORTUNITY: NIFTY 50"
+        assert "Dropped 3.00%" in smtp_server.messages[0].get_payload()
+
+        # Channels without the slow one all succeed
+        del notifier.channels['slow']
+        assert notifier.send_status("NIFTY Alerter - All Clear", "No alerts")
+        assert webhook_server.messages[-1] == {
+            'type': "status", 'title': "NIFTY Alerter - All Clear", 'message': "No alerts"
+        }
+        assert smtp_server.messages[-1]['Subject'] == "NIFTY Alerter - All Clear"
+        print(f"✓ Alert fanned out to {len(results)} channels in {elapsed:.2f}s (slow channel timed out)")
+    finally:
+        notifier.close()
+        ntfy.close()
+        webhook.close()
+        for server in (ntfy_server, webhook_server, smtp_server):
+            server.shutdown()
+
+
+def test_queued_channels():
+    """With a queue per channel, dispatch returns at once and closing drains every queue."""
+    slow = SlowChannel()
+    webhook_server = serve(HTTPServer(('127.0.0.1', 0), WebhookHandler))
+    webhook = WebhookNotifier(f"http://127.0.0.1:{webhook_server.server_port}/alerts")
+    queues = {'slow': QueuedNotifier(slow), 'webhook': QueuedNotifier(webhook)}
+    notifier = CompositeNotifier(queues, channel_timeout=0.5)
+
+    try:
+        start = time.perf_counter()
+        assert notifier.send_alert(make_alert(-3.0))
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.2  # Only enqueued
+
+        for queue in queues.values():
+            assert queue.close(timeout=5)
+        assert len(slow.sent) == 1
+        assert webhook_server.messages[0]['type'] == "alert"
+        print(f"✓ Queued channels dispatched in {elapsed * 1000:.1f} ms and drained on close")
+    finally:
+        notifier.close()
+        webhook.close()
+        webhook_server.shutdown()
+
+
+if __name__ == "__main__":
+    test_fan_out_to_all_channels()
+    test_queued_channels()
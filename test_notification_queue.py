@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test script to verify background notification delivery with retries."""
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.notifiers import QueuedNotifier
+
+
+class StubNotifier:
+    """Notifier whose sends take delay seconds and fail while failures_left > 0."""
+
+    def __init__(self, delay=0.0, failures_left=0):
+        self.delay = delay
+        self.failures_left = failures_left
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_alert(self, alert):
+        return self.send_status("alert", alert)
+
+    def send_status(self, title, message):
+        time.sleep(self.delay)
+        with self.lock:
+            if self.failures_left:
+                self.failures_left -= 1
+                if self.failures_left % 2:
+                    raise ConnectionError("ntfy unreachable")
+                return False
+            self.sent.append(message)
+        return True
+
+    def send_error(self, title, message):
+        return self.send_status(title, message)
+
+
+def test_sends_do_not_block():
+    """Sends return immediately; workers deliver concurrently."""
+    stub = StubNotifier(delay=0.2)
+    notifier = QueuedNotifier(stub, workers=4)
+
+    start = time.perf_counter()
+    for i in range(4):
+        assert notifier.send_status("Status", f"message {i}")
+    enqueue_time = time.perf_counter() - start
+    assert enqueue_time < 0.05
+
+    assert notifier.flush(timeout=5)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.6  # Four 0.2s sends on four workers
+    assert sorted(stub.sent) == [f"message {i}" for i in range(4)]
+
+    stats = notifier.stats()
+    assert stats['delivered'] == 4 and stats['queued'] == 0
+    assert stats['max_latency'] >= 0.2
+    notifier.close()
+    print(f"✓ 4 messages queued in {enqueue_time * 1000:.1f} ms, delivered in {elapsed:.2f}s")
+
+
+def test_retries_with_backoff():
+    """Failed sends (False or raised) are retried until they succeed or attempts run out."""
+    stub = StubNotifier(failures_left=3)
+    notifier = QueuedNotifier(stub, workers=1, max_attempts=4, backoff_base=0.01, backoff_max=0.05)
+
+    assert notifier.send_error("Error", "retried")
+    assert notifier.flush(timeout=5)
+    assert stub.sent == ["retried"]
+
+    stub.failures_left = 10
+    assert notifier.send_error("Error", "given up")
+    assert notifier.flush(timeout=5)
+    assert stub.sent == ["retried"]
+
+    stats = notifier.stats()
+    assert (stats['delivered'], stats['failed'], stats['retried']) == (1, 1, 6)
+    notifier.close()
+    print("✓ Failed sends retried with backoff, then given up")
+
+
+def test_bounded_queue():
+    """Messages beyond max_size are dropped instead of queueing without limit."""
+    release = threading.Event()
+
+    class BlockedNotifier(StubNotifier):
+        def send_status(self, title, message):
+            release.wait()
+            return super().send_status(title, message)
+
+    notifier = QueuedNotifier(BlockedNotifier(), workers=1, max_size=2)
+    accepted = [notifier.send_status("Status", f"message {i}") for i in range(4)]
+    time.sleep(0.05)
+    # The first is being delivered, two wait, the rest are dropped
+    assert accepted.count(False) >= 1
+    assert notifier.stats()['dropped'] == accepted.count(False)
+
+    release.set()
+    assert notifier.close(timeout=5)
+    assert notifier.stats()['delivered'] == accepted.count(True)
+    assert not notifier.send_status("Status", "after close")
+    print(f"✓ Bounded queue dropped {accepted.count(False)} message(s)")
+
+
+if __name__ == "__main__":
+    test_sends_do_not_block()
+    test_retries_with_backoff()
+    test_bounded_queue()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Test script to verify lazy NSE session warm-up and cookie persistence (offline, session mocked)."""
+import sys
+import os
+import json
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from curl_cffi.requests import Cookies
+from src.data_fetchers import nse_india
+from src.data_fetchers import NSEIndiaDataFetcher
+
+HOMEPAGE = "https://www.nseindia.com"
+API = "https://www.nseindia.com/api/allIndices"
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Records every GET; API statuses are taken from api_statuses (default 200)."""
+
+    def __init__(self):
+        self.headers = {}
+        self.cookies = Cookies()
+        self.calls = []
+        self.api_statuses = []
+        self.homepage_error = None
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        if url == HOMEPAGE:
+            if self.homepage_error:
+                raise self.homepage_error
+            self.cookies.set("nsit", "fresh", domain=".nseindia.com", path="/")
+        if url == API:
+            return FakeResponse(self.api_statuses.pop(0) if self.api_statuses else 200)
+        return FakeResponse(200)
+
+
+def make_fetcher(**kwargs):
+    """Build a fetcher whose HTTP session is a FakeSession."""
+    original = nse_india.requests.Session
+    nse_india.requests.Session = FakeSession
+    try:
+        return NSEIndiaDataFetcher(**kwargs)
+    finally:
+        nse_india.requests.Session = original
+
+
+def test_no_request_on_init():
+    """Constructing the fetcher touches neither the network nor the cookie file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = make_fetcher(cookie_path=os.path.join(tmp, "cookies.json"))
+        assert fetcher.session.calls == []
+        assert not os.path.exists(os.path.join(tmp, "cookies.json"))
+    print("✓ No NSE request on construction")
+
+
+def test_cookies_reloaded():
+    """Persisted cookies are reused after a restart instead of warming up again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cookies.json")
+
+        first = make_fetcher(cookie_path=path)
+        first._get(API)
+        assert first.session.calls == [HOMEPAGE, f"{HOMEPAGE}/market-data/live-equity-market", API]
+        saved = json.loads(open(path).read())
+        assert [cookie["name"] for cookie in saved["cookies"]] == ["nsit"]
+
+        second = make_fetcher(cookie_path=path)
+        second._get(API)
+        second._get(API)
+        assert second.session.calls == [API, API]
+        assert second.session.cookies.get("nsit") == "fresh"
+
+        # Expired cookies are not reused
+        saved["expires_at"] = time.time() - 1
+        open(path, "w").write(json.dumps(saved))
+        third = make_fetcher(cookie_path=path)
+        third._get(API)
+        assert third.session.calls[0] == HOMEPAGE
+    print("✓ Cookies persisted and reloaded")
+
+
+def test_rewarm_on_rejection():
+    """A 401/403 re-warms the session once and retries; accepted sessions are not re-warmed."""
+    fetcher = make_fetcher()
+    fetcher.session.api_statuses = [200, 403, 200]
+
+    assert fetcher._get(API).status_code == 200
+    assert fetcher._get(API).status_code == 200
+    assert fetcher.session.calls.count(HOMEPAGE) == 2
+    assert fetcher.session.calls.count(API) == 3
+    assert fetcher._get(API).status_code == 200
+    assert fetcher.session.calls.count(HOMEPAGE) == 2
+    print("✓ Session re-warmed once after 403")
+
+
+def test_failed_warmup_backs_off():
+    """After a failed warm-up, requests go out without warming up again until the backoff ends."""
+    fetcher = make_fetcher(warmup_backoff=60)
+    fetcher.session.homepage_error = ConnectionError("NSE down")
+
+    for _ in range(3):
+        fetcher._get(API)
+    assert fetcher.session.calls == [HOMEPAGE, API, API, API]
+
+    # Rejections during the backoff don't trigger warm-ups either
+    fetcher.session.api_statuses = [401, 401]
+    fetcher._get(API)
+    assert fetcher.session.calls.count(HOMEPAGE) == 1
+
+    fetcher._warmup_retry_at = 0.0
+    fetcher.session.homepage_error = None
+    fetcher._get(API)
+    assert fetcher.session.calls.count(HOMEPAGE) == 2
+    print("✓ Failed warm-up backed off")
+
+
+if __name__ == "__main__":
+    test_no_request_on_init()
+    test_cookies_reloaded()
+    test_rewarm_on_rejection()
+    test_failed_warmup_backs_off()
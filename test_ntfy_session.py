@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""Test script to verify NtfyNotifier reuses pooled connections and retries."""
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import Alert
+from src.notifiers import NtfyNotifier, NotificationOutbox, QueuedNotifier
+from src.notifiers.outbox import idempotency_key
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """ntfy stand-in speaking HTTP/1.1; answers failure_status while server.failures_left > 0 (to failure_path only, if set)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        self.server.requests.append((self.client_address, self.path))
+        self.server.messages.append((self.path, self.headers.get('Title'), body))
+
+        status = 200
+        if self.server.failures_left and self.server.failure_path in (None, self.path):
+            self.server.failures_left -= 1
+            status = self.server.failure_status
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        body = b'{"id": "test123"}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.requests = []
+    server.messages = []
+    server.failures_left = 0
+    server.failure_status = 503
+    server.failure_path = None
+    server.delay = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_alert(change, index_name="NIFTY 50", timestamp=None):
+    return Alert(
+        index_name=index_name,
+        symbol="^NSEI",
+        current_price=100.0 + change,
+        reference_price=100.0,
+        reference_date=datetime(2025, 1, 1),
+        percentage_change=change,
+        message=f"{index_name}: {change:+.2f}%",
+        timestamp=timestamp or datetime.now(),
+        trigger_type="percentage_drop",
+        threshold=2.0
+    )
+
+
+def test_connection_reuse():
+    """Alerts to the main and critical topics and status messages reuse pooled connections."""
+    server = start_server()
+    notifier = NtfyNotifier(
+        f"http://127.0.0.1:{server.server_port}", "main", critical_topic="critical"
+    )
+    try:
+        assert notifier.send_alert(make_alert(-3.0))
+        assert notifier.send_alert(make_alert(1.0))
+        assert notifier.send_status("Status", "All clear")
+        assert notifier.send_error("Error", "Something failed")
+
+        paths = [path for _, path in server.requests]
+        assert sorted(paths[:2]) == ["/critical", "/main"]  # Posted concurrently
+        assert paths[2:] == ["/main", "/main", "/main"]
+        connections = len({client for client, _ in server.requests})
+        assert connections <= 2
+        print(f"✓ {len(paths)} messages over {connections} keep-alive connection(s)")
+    finally:
+        notifier.close()
+        server.shutdown()
+
+
+def test_retries():
+    """Retryable statuses are retried; failure is reported once retries run out."""
+    server = start_server()
+    notifier = NtfyNotifier(f"http://127.0.0.1:{server.server_port}", "main", retries=2)
+    try:
+        server.failures_left = 2
+        assert notifier.send_status("Status", "Retried")
+        assert len(server.requests) == 3
+
+        server.failures_left = 3
+        assert not notifier.send_status("Status", "Gives up")
+        assert len(server.requests) == 6
+
+        # A 500 may have published the message: not re-posted
+        server.failures_left, server.failure_status = 1, 500
+        assert not notifier.send_status("Status", "Server error")
+        assert len(server.requests) == 7
+        print("✓ 503 responses retried, then reported as failure; 500 not retried")
+    finally:
+        notifier.close()
+        server.shutdown()
+
+
+def test_read_timeout_not_retried():
+    """A POST that reached the server but timed out waiting for the reply counts as sent and is not sent again."""
+    server = start_server()
+    notifier = NtfyNotifier(f"http://127.0.0.1:{server.server_port}", "main", retries=2, timeout=0.2)
+    try:
+        server.delay = 0.5
+        assert notifier.send_status("Status", "Slow")
+        time.sleep(0.5)
+        assert len(server.requests) == 1
+        print("✓ Read timeout reported without re-posting")
+    finally:
+        notifier.close()
+        server.shutdown()
+
+
+def test_queue_retries_failed_topics_only():
+    """Queued retries never re-post a message: timed-out posts count as sent, and only failed topics are retried."""
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    # With the outbox: both topics time out waiting for the reply
+    with tempfile.TemporaryDirectory() as tmp:
+        ntfy = NtfyNotifier(
+            url, "main", critical_topic="critical", timeout=0.2, outbox=NotificationOutbox(os.path.join(tmp, "outbox.db"))
+        )
+        queue = QueuedNotifier(ntfy, workers=1, max_attempts=3, backoff_base=0.01)
+        try:
+            server.delay = 0.5
+            assert queue.send_alert(make_alert(-3.0))
+            assert queue.flush(timeout=5)
+            time.sleep(0.5)
+            assert sorted(path for path, _, _ in server.messages) == ["/critical", "/main"]
+            assert ntfy.outbox.pending() == []
+            assert queue.stats()['retried'] == 0
+        finally:
+            queue.close()
+            ntfy.close()
+
+    # Without the outbox: the critical topic fails twice, the main topic is posted once
+    server.delay = 0
+    server.messages.clear()
+    server.failures_left = 2
+    server.failure_status = 500
+    server.failure_path = "/critical"
+    ntfy = NtfyNotifier(url, "main", critical_topic="critical")
+    queue = QueuedNotifier(ntfy, workers=1, max_attempts=3, backoff_base=0.01)
+    try:
+        assert queue.send_alert(make_alert(-3.0))
+        assert queue.flush(timeout=5)
+        paths = [path for path, _, _ in server.messages]
+        assert paths.count("/main") == 1
+        assert paths.count("/critical") == 3
+        stats = queue.stats()
+        assert (stats['delivered'], stats['retried']) == (1, 2)
+        print("✓ Queued retries re-send only failed topics, never a delivered message")
+    finally:
+        queue.close()
+        ntfy.close()
+        server.shutdown()
+
+
+def test_digest():
+    """A digest is one message per topic, split into parts past the size cap."""
+    server = start_server()
+    notifier = NtfyNotifier(
+        f"http://127.0.0.1:{server.server_port}", "main", critical_topic="critical"
+    )
+    try:
+        alerts = [make_alert(-3.0, "NIFTY BANK"), make_alert(-1.0, "NIFTY IT"), make_alert(1.5)]
+        assert notifier.send_digest(alerts, [("Error: NIFTY AUTO", "source down")])
+
+        messages = {path: (title, body) for path, title, body in server.messages}
+        assert sorted(messages) == ["/critical", "/main"]
+        (main_title, main_body), (critical_title, critical_body) = messages["/main"], messages["/critical"]
+        assert main_title == "NIFTY Alerter - 3 alert(s), 1 error(s)"
+        assert main_body.splitlines() == [
+            "ERROR Error: NIFTY AUTO: source down",
+            "↓ NIFTY BANK: -3.00% [threshold 2.0%]",
+            "↓ NIFTY IT: -1.00%",
+            "↑ NIFTY 50: +1.50%",
+        ]
+        assert critical_title == "CRITICAL: 1 Buying Opportunity"
+        assert critical_body == "↓ NIFTY BANK: -3.00% [threshold 2.0%]"
+
+        # 60 lines of 21 bytes need three 500-byte messages
+        server.messages.clear()
+        notifier.max_message_bytes = 500
+        assert notifier.send_digest([make_alert(-0.5, f"INDEX {i:02d}") for i in range(60)], [])
+        assert [title for _, title, _ in server.messages] == [
+            "NIFTY Alerter - 60 alert(s) (1/3)",
+            "NIFTY Alerter - 60 alert(s) (2/3)",
+            "NIFTY Alerter - 60 alert(s) (3/3)",
+        ]
+        bodies = [body for _, _, body in server.messages]
+        assert all(len(body.encode('utf-8')) <= 500 for body in bodies)
+        assert "\n".join(bodies).count("↓ INDEX") == 60
+        print(f"✓ Digest sent as one message per topic, split into {len(bodies)} parts past the cap")
+    finally:
+        notifier.close()
+        server.shutdown()
+
+
+def test_outbox_replay():
+    """Messages undelivered before a restart are replayed once; delivered ones are not re-sent."""
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "outbox.db")
+        alert = make_alert(-3.0)
+
+        # ntfy answers 503 to everything: both topics stay pending
+        server.failures_left = 100
+        notifier = NtfyNotifier(url, "main", critical_topic="critical", retries=0, outbox=NotificationOutbox(path))
+        assert not notifier.send_alert(alert)
+        notifier.close()
+
+        # After a restart the pending messages are replayed
+        server.failures_left = 0
+        server.messages.clear()
+        notifier = NtfyNotifier(url, "main", critical_topic="critical", retries=0, outbox=NotificationOutbox(path))
+        assert notifier.replay_outbox() == 2
+        assert notifier.replay_outbox() == 0
+        assert sorted(topic for topic, _, _ in server.messages) == ["/critical", "/main"]
+
+        # Sending the same alert again does not push duplicates
+        assert notifier.send_alert(alert)
+        assert len(server.messages) == 2
+
+        # Only the topic that failed is retried
+        other = make_alert(-4.0, "NIFTY BANK")
+        server.failures_left = 0
+        notifier.critical_topic = "critical-down"
+        original_request = notifier._request
+
+        def fail_critical(topic, message, headers):
+            if topic == "critical-down":
+                raise ConnectionError("critical topic unreachable")
+            return original_request(topic, message, headers)
+
+        notifier._request = fail_critical
+        assert not notifier.send_alert(other)
+        notifier._request = original_request
+        assert notifier.send_alert(other)
+        assert [topic for topic, _, _ in server.messages[2:]] == ["/main", "/critical-down"]
+
+        # Keys use the alert's date, so a replay after midnight is still deduplicated
+        yesterday = make_alert(-2.5, timestamp=datetime.now() - timedelta(days=1))
+        assert notifier.send_alert(yesterday)
+        title, body = next((title, body) for path, title, body in server.messages[4:] if path == "/critical-down")
+        key = idempotency_key("critical-down", title, body, yesterday.timestamp.date())
+        assert not notifier.outbox.claim(key, "critical-down", body, {"Title": title})
+        notifier.close()
+        print("✓ Outbox replays undelivered messages without duplicates")
+
+    server.shutdown()
+
+
+def test_outbox_pruning():
+    """Delivered keys are pruned past retention; old undelivered messages expire instead of replaying."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "outbox.db")
+        half_second = 0.5 / 86400
+        outbox = NotificationOutbox(
+            path, retention_days=half_second, pending_max_age_days=half_second, prune_interval=0.1
+        )
+        try:
+            assert outbox.claim("delivered", "main", "body", {})
+            outbox.ack("delivered")
+            assert outbox.claim("undelivered", "main", "body", {})
+            outbox.release("undelivered")
+            assert not outbox.claim("delivered", "main", "body", {})
+            assert [key for key, _, _, _ in outbox.pending()] == ["undelivered"]
+
+            # Past both ages: nothing is replayed and a prune empties the table
+            time.sleep(0.7)
+            assert outbox.pending() == []
+            outbox.flush()
+            with sqlite3.connect(path) as conn:
+                assert conn.execute("SELECT COUNT(*) FROM outbox").fetchone() == (0,)
+            assert outbox.claim("delivered", "main", "body", {})
+        finally:
+            outbox.close()
+        print("✓ Outbox prunes delivered keys and expires stale pending messages")
+
+
+def test_outbox_write_failure():
+    """A claim whose record cannot be committed raises, and the message is not sent."""
+    server = start_server()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "outbox.db")
+        outbox = NotificationOutbox(path)
+        notifier = NtfyNotifier(f"http://127.0.0.1:{server.server_port}", "main", outbox=outbox)
+        try:
+            with sqlite3.connect(path) as conn:
+                conn.execute("DROP TABLE outbox")
+
+            try:
+                outbox.claim("key", "main", "body", {})
+                raise AssertionError("claim should have failed")
+            except sqlite3.Error:
+                pass
+
+            assert not notifier.send_status("Status", "Unrecorded")
+            assert server.requests == []
+            print("✓ Outbox write failure reported to the sender")
+        finally:
+            notifier.close()
+    server.shutdown()
+
+
+class Unbindable:
+    """Parameter sqlite3 cannot bind: raises a non-sqlite error from the writer's execute."""
+
+    def __conform__(self, protocol):
+        raise ValueError("cannot bind")
+
+
+class NoWriterOutbox(NotificationOutbox):
+    """Outbox whose writer thread fails to open its connection."""
+
+    def _connect(self):
+        if threading.current_thread().name == "outbox-writer":
+            raise sqlite3.OperationalError("unable to open database file")
+        return super()._connect()
+
+
+def test_outbox_writer_errors():
+    """Non-sqlite write errors reach the waiting writer; a dead writer thread fails claims instead of hanging."""
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = NotificationOutbox(os.path.join(tmp, "outbox.db"))
+        try:
+            try:
+                outbox._write("INSERT INTO outbox (key) VALUES (?)", (Unbindable(),), wait=True)
+                raise AssertionError("write should have failed")
+            except ValueError:
+                pass
+            assert outbox.claim("key", "main", "body", {})  # The writer survived
+        finally:
+            outbox.close()
+
+        outbox = NoWriterOutbox(os.path.join(tmp, "dead.db"))
+        start = time.perf_counter()
+        try:
+            outbox.claim("key", "main", "body", {})
+            raise AssertionError("claim should have failed")
+        except RuntimeError:
+            pass
+        assert time.perf_counter() - start < 2.0
+        assert "key" not in outbox._claimed  # Given up, so a later attempt is not skipped as in flight
+        outbox.close()
+    print("✓ Outbox writer failures reported instead of blocking")
+
+
+def test_parallel_topics():
+    """Topics of an alert are posted concurrently, with success reported per topic."""
+    server = start_server()
+    notifier = NtfyNotifier(
+        f"http://127.0.0.1:{server.server_port}", "main", critical_topic="critical"
+    )
+    original_request = notifier._request
+
+    def slow_request(topic, message, headers):
+        time.sleep(0.3)
+        if topic == "critical":
+            raise ConnectionError("critical topic unreachable")
+        return original_request(topic, message, headers)
+
+    notifier._request = slow_request
+    try:
+        start = time.perf_counter()
+        results = notifier.publish_alert(make_alert(-3.0))
+        elapsed = time.perf_counter() - start
+
+        assert results == {"main": True, "critical": False}
+        assert elapsed < 0.5  # Two 0.3s posts side by side
+        assert not notifier.send_alert(make_alert(-3.0))
+        assert notifier.publish_alert(make_alert(1.0)) == {"main": True}
+        print(f"✓ Main and critical topics posted in parallel in {elapsed:.2f}s")
+    finally:
+        notifier.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_connection_reuse()
+    test_retries()
+    test_read_timeout_not_retried()
+    test_queue_retries_failed_topics_only()
+    test_digest()
+    test_outbox_replay()
+    test_outbox_pruning()
+    test_outbox_write_failure()
+    test_outbox_writer_errors()
+    test_parallel_topics()
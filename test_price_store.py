@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Test script to verify the local price store and incremental fetching."""
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import IndexData, PriceSeries
+from src.data_fetchers import DataFetcher, CachedDataFetcher, PriceStore
+
+
+class RecordingFetcher(DataFetcher):
+    """Fake upstream fetcher that returns one bar per weekday and records requests."""
+
+    def __init__(self):
+        self.requests = []
+
+    def fetch_historical_data(self, symbol, start_date, end_date):
+        self.requests.append((start_date.date(), end_date.date()))
+        day = datetime.combine(start_date.date(), datetime.min.time())
+        data = []
+        while day.date() <= end_date.date():
+            if day.weekday() < 5:
+                data.append(IndexData(symbol=symbol, date=day, close=100.0 + day.day))
+            day += timedelta(days=1)
+        return PriceSeries.from_records(symbol, data)
+
+
+def test_incremental_fetch():
+    """Only bars after the last stored date are requested on a re-run."""
+    with tempfile.TemporaryDirectory() as tmp:
+        upstream = RecordingFetcher()
+        fetcher = CachedDataFetcher(upstream, PriceStore(os.path.join(tmp, "prices.db")))
+
+        end_date = datetime(2025, 11, 14)
+        start_date = end_date - timedelta(days=30)
+
+        first = fetcher.fetch_historical_data("^TEST", start_date, end_date)
+        assert upstream.requests == [(start_date.date(), end_date.date())]
+
+        later_end = end_date + timedelta(days=3)
+        second = fetcher.fetch_historical_data("^TEST", start_date, later_end)
+
+        # Second request starts from the last stored bar, not the original start
+        assert upstream.requests[-1] == (end_date.date(), later_end.date())
+        assert len(second) == len(first) + 1
+        assert [d.date for d in second[:len(first)]] == [d.date for d in first]
+        print(f"✓ Incremental fetch: {len(upstream.requests)} upstream requests")
+
+
+def test_backfill():
+    """History requested before the stored range is backfilled."""
+    with tempfile.TemporaryDirectory() as tmp:
+        upstream = RecordingFetcher()
+        fetcher = CachedDataFetcher(upstream, PriceStore(os.path.join(tmp, "prices.db")))
+
+        end_date = datetime(2025, 11, 14)
+        fetcher.fetch_historical_data("^TEST", end_date - timedelta(days=10), end_date)
+        data = fetcher.fetch_historical_data("^TEST", end_date - timedelta(days=40), end_date)
+
+        assert upstream.requests[1][0] == (end_date - timedelta(days=40)).date()
+        assert data[0].date.date() >= (end_date - timedelta(days=40)).date()
+        assert (data.dates[1:] > data.dates[:-1]).all()
+        print(f"✓ Backfill: {len(data)} bars served")
+
+
+def test_empty_range_serves_stored_history():
+    """A batch refresh that returns nothing for a symbol still serves its stored bars."""
+
+    class EmptyBatchFetcher(RecordingFetcher):
+        def fetch_many(self, symbols, start_date, end_date):
+            return {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        upstream = EmptyBatchFetcher()
+        store = PriceStore(os.path.join(tmp, "prices.db"))
+        end_date = datetime(2025, 11, 14)
+        start_date = end_date - timedelta(days=20)
+        stored = CachedDataFetcher(RecordingFetcher(), store).fetch_historical_data("^TEST", start_date, end_date)
+
+        # The refresh range after the last stored bar comes back empty
+        results = CachedDataFetcher(upstream, store).fetch_many(
+            ["^TEST", "^NEW"], start_date, end_date + timedelta(days=2)
+        )
+        assert list(results) == ["^TEST"]  # Nothing stored for ^NEW
+        assert len(results["^TEST"]) == len(stored)
+        assert not results["^TEST"].stale
+        print("✓ Empty refresh range served from the store")
+
+
+def test_empty_reply_not_recorded_as_covered():
+    """A transient empty reply for a range does not stop it from being fetched later."""
+
+    class OnceEmptyFetcher(RecordingFetcher):
+        def fetch_historical_data(self, symbol, start_date, end_date):
+            data = super().fetch_historical_data(symbol, start_date, end_date)
+            return data if len(self.requests) > 1 else data[:0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        upstream = OnceEmptyFetcher()
+        fetcher = CachedDataFetcher(upstream, PriceStore(os.path.join(tmp, "prices.db")))
+        end_date = datetime(2025, 11, 14)
+        start_date = end_date - timedelta(days=5 * 365)
+
+        assert len(fetcher.fetch_historical_data("^TEST", start_date, end_date)) == 0
+        data = fetcher.fetch_historical_data("^TEST", start_date, end_date)
+
+        assert upstream.requests[1] == (start_date.date(), end_date.date())
+        assert len(data) > 1000
+        print(f"✓ Empty reply re-requested: {len(data)} bars served")
+
+
+if __name__ == "__main__":
+    test_incremental_fetch()
+    test_backfill()
+    test_empty_range_serves_stored_history()
+    test_empty_reply_not_recorded_as_covered()
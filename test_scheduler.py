@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test script to verify the market calendar and event scheduler."""
+import sys
+import os
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.scheduler import EventScheduler, MarketCalendar
+
+IST = ZoneInfo("Asia/Kolkata")
+CALENDAR = MarketCalendar.from_yaml(os.path.join(os.path.dirname(__file__), "config", "nse_holidays.yaml"))
+
+
+class FakeClockScheduler(EventScheduler):
+    """Scheduler whose clock is set by the test."""
+
+    def __init__(self, now, **kwargs):
+        self.clock = now
+        super().__init__(**kwargs)
+
+    def now(self):
+        return self.clock
+
+
+def ist(*args):
+    return datetime(*args, tzinfo=IST)
+
+
+def test_calendar():
+    """Weekends and listed holidays are not trading days."""
+    assert CALENDAR.is_trading_day(date(2025, 10, 20))      # Monday
+    assert not CALENDAR.is_trading_day(date(2025, 10, 18))  # Saturday
+    assert not CALENDAR.is_trading_day(date(2025, 10, 21))  # Diwali
+    assert not CALENDAR.is_trading_day(date(2026, 1, 26))   # Republic Day
+    print("✓ Market calendar")
+
+
+def test_daily_job_skips_non_trading_days():
+    """The daily check moves past weekends and holidays."""
+    scheduler = FakeClockScheduler(ist(2025, 10, 17, 17, 0), calendar=CALENDAR)
+    job = scheduler.every_day_at("daily check", "16:00", lambda: None)
+
+    assert job.next_run == ist(2025, 10, 20, 16, 0)  # Friday evening -> Monday
+    assert job.next_after(ist(2025, 10, 20, 16, 0)) == ist(2025, 10, 23, 16, 0)  # Diwali holidays
+    assert job.next_after(ist(2025, 10, 23, 15, 59)) == ist(2025, 10, 23, 16, 0)
+    print("✓ Daily job skips weekends and holidays")
+
+
+def test_interval_job_stays_in_market_hours():
+    """Intraday polls run only between market open and close on trading days."""
+    scheduler = FakeClockScheduler(ist(2025, 10, 20, 8, 0), calendar=CALENDAR)
+    job = scheduler.every("intraday poll", 60, lambda: None, start="09:15", end="15:30")
+
+    assert job.next_run == ist(2025, 10, 20, 9, 15)
+    assert job.next_after(ist(2025, 10, 20, 9, 15)) == ist(2025, 10, 20, 9, 16)
+    assert job.next_after(ist(2025, 10, 20, 15, 30)) == ist(2025, 10, 23, 9, 15)
+    print("✓ Interval job stays within market hours")
+
+
+def test_run_pending():
+    """Due jobs run (failures are logged) and are rescheduled; others wait."""
+    scheduler = FakeClockScheduler(ist(2025, 10, 20, 9, 0), calendar=CALENDAR)
+    runs = []
+
+    def failing():
+        runs.append("poll")
+        raise RuntimeError("boom")
+
+    poll = scheduler.every("intraday poll", 60, failing, start="09:15", end="15:30")
+    daily = scheduler.every_day_at("daily check", "16:00", lambda: runs.append("daily"))
+
+    assert scheduler.next_job() is poll
+    scheduler.clock = ist(2025, 10, 20, 9, 15)
+    scheduler.run_pending()
+    assert runs == ["poll"]
+    assert poll.next_run == ist(2025, 10, 20, 9, 16)
+
+    # A late wake-up within market hours skips the missed polls instead of running them all
+    scheduler.clock = ist(2025, 10, 20, 12, 0, 5)
+    scheduler.run_pending()
+    assert runs == ["poll", "poll"]
+    assert poll.next_run == ist(2025, 10, 20, 12, 1, 5)
+
+    # After the close, the overdue poll is skipped; only the daily check runs
+    scheduler.clock = ist(2025, 10, 20, 16, 0, 5)
+    scheduler.run_pending()
+    assert runs == ["poll", "poll", "daily"]
+    assert poll.next_run == ist(2025, 10, 23, 9, 15)
+    assert daily.next_run == ist(2025, 10, 23, 16, 0)
+    assert scheduler.next_job().next_run - scheduler.clock > timedelta(days=2)
+    print("✓ run_pending runs due jobs and reschedules them")
+
+
+if __name__ == "__main__":
+    test_calendar()
+    test_daily_job_skips_non_trading_days()
+    test_interval_job_stays_in_market_hours()
+    test_run_pending()
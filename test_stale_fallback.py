@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Test script to verify stale cached history is served while all sources are down."""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import PriceSeries
+from src.data_fetchers import DataFetcher, CachedDataFetcher, FallbackDataFetcher, PriceStore
+from src.alert_service import AlertService
+
+INDEX = {
+    'symbol': '^TEST',
+    'name': 'TEST INDEX',
+    'lookback_days': 7,
+    'alert_triggers': [{'type': 'percentage_drop', 'threshold': 2.0}]
+}
+
+
+class FlakySource(DataFetcher):
+    """Daily closes falling by 1 per day; the next failures_left requests raise."""
+
+    def __init__(self):
+        self.failures_left = 0
+
+    def fetch_historical_data(self, symbol, start_date, end_date):
+        if self.failures_left:
+            self.failures_left -= 1
+            raise ConnectionError("source down")
+        days = (end_date.date() - start_date.date()).days + 1
+        dates = np.datetime64(start_date.date()) + np.arange(days).astype('timedelta64[D]')
+        return PriceSeries(symbol, dates, 1000.0 - np.arange(days))
+
+
+class RecordingNotifier:
+    def send_alert(self, alert):
+        return True
+
+
+def make_fetchers(tmp, stale_max_age_days=4):
+    source = FlakySource()
+    store = PriceStore(os.path.join(tmp, "prices.db"))
+    fallback = FallbackDataFetcher(
+        failure_threshold=100,
+        stale_store=store,
+        stale_max_age_days=stale_max_age_days,
+        sources=[('Flaky', source)]
+    )
+    return source, fallback, CachedDataFetcher(fallback, store)
+
+
+def wait_for_refresh(fallback):
+    deadline = time.monotonic() + 5
+    while fallback.refreshing() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not fallback.refreshing()
+
+
+def test_stale_history_during_outage():
+    """An outage serves the cached series marked stale and refreshes it in the background."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, fallback, cached = make_fetchers(tmp)
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=12)
+
+        fresh = cached.fetch_historical_data('^TEST', start_date, end_date)
+        assert not fresh.stale
+
+        # Only the foreground request fails; the background refresh succeeds
+        source.failures_left = 1
+        stale = cached.fetch_historical_data('^TEST', start_date, end_date)
+        assert stale.stale
+        assert np.array_equal(stale.close, fresh.close)
+
+        wait_for_refresh(fallback)
+        assert not cached.fetch_historical_data('^TEST', start_date, end_date).stale
+
+        # Alerts evaluated on stale data are flagged
+        source.failures_left = 100
+        service = AlertService(cached, RecordingNotifier())
+        result = service.check_indices([INDEX])[0]
+        assert result.error is None and result.alerts
+        assert all(alert.stale for alert in result.alerts)
+        print(f"✓ Stale history served during outage ({len(result.alerts)} stale alert(s))")
+
+
+def test_too_old_history_raises():
+    """Cached history older than stale_max_age_days is not served."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, fallback, cached = make_fetchers(tmp, stale_max_age_days=2)
+        end_date = datetime.now() - timedelta(days=5)
+        start_date = end_date - timedelta(days=12)
+        cached.fetch_historical_data('^TEST', start_date, end_date)
+
+        source.failures_left = 100
+        try:
+            fallback.fetch_historical_data('^TEST', start_date, datetime.now())
+        except Exception as e:
+            assert "All data sources failed" in str(e)
+        else:
+            raise AssertionError("expected the fetch to fail")
+        assert not fallback.refreshing()
+        print("✓ Old cached history is not served")
+
+
+if __name__ == "__main__":
+    test_stale_history_during_outage()
+    test_too_old_history_raises()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test script to verify incremental trigger state matches full-window evaluation."""
+import sys
+import os
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.models import PriceSeries
+from src.alert_triggers import TriggerEngine, TriggerStateStore
+
+LOOKBACK = 7
+TRIGGERS = [{'type': 'percentage_drop', 'threshold': 2.0}]
+
+
+def make_series(days, seed):
+    rng = np.random.default_rng(seed)
+    closes = np.round(10000 * np.cumprod(1 + rng.normal(0, 0.015, days)), 0)
+    dates = np.datetime64('2025-01-01') + np.arange(days).astype('timedelta64[D]')
+    return PriceSeries("^TEST", dates, closes)
+
+
+def alert_fields(alerts):
+    return [
+        (a.percentage_change, a.reference_price, a.reference_date, a.message)
+        for a in alerts
+    ]
+
+
+def test_daily_runs_match_stateless():
+    """Daily (and repeated same-day) runs with persisted state match a fresh full-window check."""
+    series = make_series(120, seed=2)
+    stateless = TriggerEngine()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.json")
+
+        for day in range(2, len(series) + 1):
+            # Same window the alert service fetches: lookback + 1 bars
+            window = series[max(0, day - LOOKBACK - 1):day]
+            expected = stateless.evaluate([("TEST", window, TRIGGERS, LOOKBACK)])
+
+            # A new engine per run, as after a restart, with state from disk
+            for _ in range(2):
+                engine = TriggerEngine(state_store=TriggerStateStore(path))
+                actual = engine.evaluate([("TEST", window, TRIGGERS, LOOKBACK)])
+                assert alert_fields(actual[0]) == alert_fields(expected[0]), day
+
+    print(f"✓ Incremental state matches full-window checks over {len(series)} days")
+
+
+def test_gap_rebuilds_window():
+    """Skipping runs for longer than the lookback rebuilds the window from fetched data."""
+    series = make_series(60, seed=4)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TriggerStateStore(os.path.join(tmp, "state.json"))
+        engine = TriggerEngine(state_store=store)
+
+        engine.evaluate([("TEST", series[10:18], TRIGGERS, LOOKBACK)])
+        actual = engine.evaluate([("TEST", series[40:48], TRIGGERS, LOOKBACK)])
+        expected = TriggerEngine().evaluate([("TEST", series[40:48], TRIGGERS, LOOKBACK)])
+
+        assert alert_fields(actual[0]) == alert_fields(expected[0])
+        print("✓ Gap between runs rebuilds the window")
+
+
+if __name__ == "__main__":
+    test_daily_runs_match_stateless()
+    test_gap_rebuilds_window()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Test script to verify batched Yahoo Finance downloads (offline, yf.download stubbed)."""
+import sys
+import os
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.data_fetchers import yahoo_finance
+from src.data_fetchers import YahooFinanceDataFetcher
+from src.alert_service import AlertService
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def ohlcv(close, days=10):
+    """Daily OHLCV frame ending today with closes rising from close."""
+    dates = pd.date_range(end=pd.Timestamp.now(tz='Asia/Kolkata').normalize(), periods=days, freq='D')
+    closes = close + np.arange(days, dtype=np.float64)
+    return pd.DataFrame(
+        {'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes, 'Volume': 1000.0},
+        index=dates
+    )
+
+
+def grouped(frames):
+    """Frame in yf.download's group_by='ticker' layout: (ticker, field) columns."""
+    return pd.concat(frames, axis=1)
+
+
+class StubYahoo:
+    """Stands in for yf.download and yf.Ticker, recording every call."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.downloads = []
+        self.tickers = []
+
+    def download(self, tickers, **kwargs):
+        self.downloads.append(list(tickers))
+        return self.reply
+
+    def Ticker(self, symbol):
+        self.tickers.append(symbol)
+        stub = self
+
+        class Ticker:
+            def history(self, start, end):
+                return stub.single[symbol]
+
+        return Ticker()
+
+
+def patched(stub):
+    """Swap yf in the fetcher module for the stub; returns a function restoring it."""
+    original = yahoo_finance.yf
+    yahoo_finance.yf = stub
+    return lambda: setattr(yahoo_finance, 'yf', original)
+
+
+def dates():
+    end = datetime.now()
+    return end - timedelta(days=12), end
+
+
+def test_multi_ticker_layout():
+    """Each ticker's columns are picked from the (ticker, field) MultiIndex."""
+    stub = StubYahoo(grouped({'^A': ohlcv(100.0), '^B': ohlcv(200.0)}))
+    restore = patched(stub)
+    try:
+        results = YahooFinanceDataFetcher().fetch_many(['^A', '^B'], *dates())
+    finally:
+        restore()
+
+    assert stub.downloads == [['^A', '^B']]
+    assert len(results['^A']) == len(results['^B']) == 10
+    assert results['^A'].close[0] == 100.0 and results['^B'].close[-1] == 209.0
+    assert results['^B'].high[0] == 201.0
+    print("✓ Multi-ticker download split per ticker")
+
+
+def test_single_ticker_layouts():
+    """A single-ticker download is read with flat columns as well as with either MultiIndex order."""
+    flat = ohlcv(100.0)
+    field_first = grouped({'^A': ohlcv(100.0)}).swaplevel(axis=1)
+    for reply in (flat, grouped({'^A': ohlcv(100.0)}), field_first):
+        restore = patched(StubYahoo(reply))
+        try:
+            results = YahooFinanceDataFetcher().fetch_many(['^A'], *dates())
+        finally:
+            restore()
+        assert list(results) == ['^A']
+        assert results['^A'].close.tolist() == flat['Close'].tolist()
+    print("✓ Single-ticker layouts parsed")
+
+
+def test_missing_ticker():
+    """A ticker absent from the reply (or all NaN) comes back empty."""
+    reply = grouped({'^A': ohlcv(100.0), '^B': ohlcv(200.0) * np.nan})
+    restore = patched(StubYahoo(reply))
+    try:
+        results = YahooFinanceDataFetcher().fetch_many(['^A', '^B', '^C'], *dates())
+    finally:
+        restore()
+
+    assert len(results['^A']) == 10
+    assert not results['^B'] and not results['^C']
+    print("✓ Missing tickers returned empty")
+
+
+class RecordingNotifier:
+    def __init__(self):
+        self.alerts = []
+
+    def send_alert(self, alert):
+        self.alerts.append(alert)
+        return True
+
+    def send_status(self, title, message):
+        return True
+
+    def send_error(self, title, message):
+        raise AssertionError(message)
+
+
+def test_run_check_single_download():
+    """run_check downloads all indices in one call; only a ticker missing from it is fetched on its own."""
+    symbols = ['^A', '^B', '^C', '^D']
+    config = {'indices': [
+        {
+            'symbol': symbol,
+            'name': f"INDEX {symbol[1:]}",
+            'lookback_days': 7,
+            'alert_triggers': [{'type': 'percentage_drop', 'threshold': 2.0}]
+        }
+        for symbol in symbols
+    ]}
+    stub = StubYahoo(grouped({symbol: ohlcv(100.0) for symbol in symbols[:3]}))
+    stub.single = {'^D': ohlcv(400.0)}
+    notifier = RecordingNotifier()
+
+    restore = patched(stub)
+    try:
+        AlertService(YahooFinanceDataFetcher(), notifier).run_check(config, datetime.now())
+    finally:
+        restore()
+
+    assert stub.downloads == [symbols]
+    assert stub.tickers == ['^D']  # Missing from the batch, fetched per index
+    assert [alert.symbol for alert in notifier.alerts] == symbols
+    print(f"✓ {len(symbols)} indices checked with one download and one fallback fetch")
+
+
+if __name__ == "__main__":
+    test_multi_ticker_layout()
+    test_single_ticker_layouts()
+    test_missing_ticker()
+    test_run_check_single_download()